@@ -0,0 +1,34 @@
+"""Operational commands, run from ``backend/``.
+
+    python -m app.cli ensure-indexes   # once per deploy, before starting workers
+"""
+import argparse
+import asyncio
+import sys
+from app.database import create_indexes, close_client
+
+
+async def _ensure_indexes() -> int:
+    try:
+        await create_indexes()
+    except Exception as e:
+        print(f"Could not create indexes: {e}", file=sys.stderr)
+        return 1
+    finally:
+        await close_client()
+    print("✓ MongoDB indexes ensured")
+    return 0
+
+
+COMMANDS = {"ensure-indexes": _ensure_indexes}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+    return asyncio.run(COMMANDS[args.command]())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
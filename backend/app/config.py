@@ -5,11 +5,124 @@ from functools import lru_cache
 class Settings(BaseSettings):
     SECRET_KEY: str = "dev-secret-key-change-in-production"
     GROQ_API_KEY: str = ""
+    GROQ_BASE_URL: str = "https://api.groq.com/openai/v1"
     GOOGLE_CLIENT_ID: str = ""
     MONGODB_URI: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "portfolifyai"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+    # Deployment (see gunicorn.conf.py)
+    WEB_CONCURRENCY: int = 1  # gunicorn workers per instance; per-process LLM quotas are divided by it
+    ENSURE_INDEXES_ON_STARTUP: bool = True  # off when indexes are created once per deploy
+
+    # MongoDB connection pool, per worker process
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: int = 0  # 0 keeps idle connections open
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 0  # 0 waits for a free connection as long as needed
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # changing this rehashes passwords transparently on next login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64  # beyond this, login/signup get 503 instead of queueing
+
+    # Authenticated-user cache used by get_current_user
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    # Public portfolio pages (/p/{subdomain})
+    PUBLIC_PORTFOLIO_CACHE_MAX_ENTRIES: int = 5000
+    PUBLIC_PORTFOLIO_CACHE_TTL_SECONDS: int = 60 * 10
+    PUBLIC_PORTFOLIO_NEGATIVE_TTL_SECONDS: int = 30
+    PUBLIC_PORTFOLIO_MAX_AGE_SECONDS: int = 60
+    PUBLIC_PORTFOLIO_STALE_SECONDS: int = 600
+
+    # Cross-worker cache tier (see app/services/shared_cache.py)
+    SHARED_CACHE_BACKEND: str = "mongo"
+
+    # Replay cache invalidations from other workers via MongoDB; gunicorn.conf.py
+    # turns this on when WEB_CONCURRENCY > 1. Set it yourself for several instances.
+    SHARED_CACHE_INVALIDATION: bool = False
+    CACHE_INVALIDATION_POLL_SECONDS: float = 2.0
+
+    # Shared LLM HTTP connection pool
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+    LLM_CONNECT_TIMEOUT: float = 5.0  # seconds
+    LLM_READ_TIMEOUT: float = 90.0  # seconds
+    LLM_MAX_RETRIES: int = 2  # on 429/5xx/timeouts, with jittered exponential backoff
+
+    # LLM backends and per-task model routing (see app/services/llm_backends.py)
+    LLM_DEFAULT_BACKEND: str = "groq"  # groq | openai | fake
+    LLM_MODEL_LARGE: str = "llama-3.3-70b-versatile"
+    LLM_MODEL_SMALL: str = "llama-3.1-8b-instant"
+    LLM_ROUTES: dict[str, dict] = {}  # per-task overrides: backend, model, temperature, max_tokens
+    LLM_OPENAI_BASE_URL: str = ""  # any OpenAI-compatible endpoint
+    LLM_OPENAI_API_KEY: str = ""
+    LLM_OPENAI_REQUESTS_PER_MINUTE: int = 0
+    LLM_OPENAI_TOKENS_PER_MINUTE: int = 0
+    LLM_JSON_MODE: bool = True  # send response_format=json_object for structured tasks
+    LLM_FAKE_REPLY: str = ""  # fixed reply for the fake backend; default echoes the prompt
+
+    # Groq rate limiting, per instance and split across WEB_CONCURRENCY workers (0 disables a bucket)
+    LLM_REQUESTS_PER_MINUTE: int = 30
+    LLM_TOKENS_PER_MINUTE: int = 12000
+    LLM_EXPECTED_COMPLETION_TOKENS: int = 500  # reserved up front, reconciled with reported usage
+    LLM_MAX_CONCURRENCY: int = 16  # adaptive cap starts here and halves on overload
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_SECONDS: float = 20.0  # longer Retry-After fails fast with 503
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 30.0  # interactive and batch calls; background waits
+
+    # LLM response cache (opt-in per llm_service function)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 2048
+    LLM_CACHE_TTL_SECONDS: int = 60 * 60 * 24  # 1 day
+    LLM_CACHE_SHARED: bool = False  # also store entries in the shared cache tier for all workers
+
+    # Batch endpoints
+    LLM_BATCH_CONCURRENCY: int = 8
+    LLM_BATCH_MAX_ITEMS: int = 100
+    JD_BATCH_MAX_ITEMS: int = 200
+    JD_BATCH_MAX_SUGGESTIONS: int = 10
+
+    # Prompt payloads (estimated tokens)
+    PROMPT_SECTION_TOKEN_BUDGET: int = 400  # per resume/portfolio section
+    PROMPT_JD_TOKEN_BUDGET: int = 1500
+    PROMPT_IMPORT_TOKEN_BUDGET: int = 3000  # extracted text of an imported resume
+
+    # Recommendations
+    RECOMMENDATIONS_REFRESH_DELAY_SECONDS: int = 30  # debounce after resume/portfolio edits
+
+    # Resume export (GET /api/resumes/{id}/export)
+    EXPORT_RENDER_WORKERS: int = 2  # render processes per worker; 0 renders in a thread instead
+    EXPORT_MAX_PENDING: int = 32  # beyond this, exports get 503 instead of queueing
+    EXPORT_CACHE_MAX_ENTRIES: int = 1000  # resumes with cached artifacts
+    EXPORT_CACHE_TTL_SECONDS: int = 60 * 60
+
+    # Resume import (POST /api/resumes/import)
+    IMPORT_MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024
+    IMPORT_MAX_PAGES: int = 10  # later pages are ignored
+    IMPORT_MAX_DECOMPRESSED_BYTES: int = 20 * 1024 * 1024  # per document part; guards against zip bombs
+    IMPORT_PARSE_WORKERS: int = 2  # parser processes per worker; 0 parses in a thread instead
+    IMPORT_MAX_PENDING: int = 8  # beyond this, imports get 503 instead of queueing
+
+    # Search (GET /api/search)
+    SEARCH_CACHE_MAX_USERS: int = 1000  # in-memory per-user indexes
+    SEARCH_CACHE_TTL_SECONDS: int = 10 * 60
+
+    # Observability
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""  # if set, GET /metrics requires "Authorization: Bearer <token>"
+
+    # Background jobs
+    JOB_WORKERS: int = 2  # asyncio consumers per process; 0 disables them
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: int = 300  # a running job is re-queued if its worker goes silent this long
+    JOB_MAX_ATTEMPTS: int = 2
+    JOB_RESULT_TTL_SECONDS: int = 24 * 60 * 60
+
     class Config:
         env_file = ".env"
 
@@ -1,31 +1,131 @@
-from pymongo import MongoClient
+import os
+from pymongo import AsyncMongoClient, monitoring
 from app.config import get_settings
+from app.utils import metrics
 
 settings = get_settings()
 
-client = MongoClient(
-    settings.MONGODB_URI,
-    serverSelectionTimeoutMS=10000,
-)
-db = client[settings.MONGODB_DB_NAME]
+
+class _CommandTimer(monitoring.CommandListener):
+    """Per-command latency histogram, also attributed to the request's Server-Timing."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, "ok")
+
+    def failed(self, event):
+        self._record(event, "error")
+
+    @staticmethod
+    def _record(event, outcome: str):
+        seconds = event.duration_micros / 1e6
+        metrics.observe("mongo_command_duration_seconds", seconds, command=event.command_name, outcome=outcome)
+        metrics.add_timing("db", seconds)
+
+
+_client: AsyncMongoClient | None = None
+_client_pid: int | None = None
+
+
+def get_client() -> AsyncMongoClient:
+    """This process's client, created on first use.
+
+    Nothing connects at import time, so the app can be imported before gunicorn
+    forks its workers; a child that inherits a parent's client opens its own.
+    """
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        _client = AsyncMongoClient(
+            settings.MONGODB_URI,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS or None,
+            waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS or None,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            event_listeners=[_CommandTimer()],
+        )
+        _client_pid = os.getpid()
+    return _client
+
+
+class LazyCollection:
+    """Module-level handle that resolves to the collection on this process's client."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._client = None
+        self._collection = None
+
+    def _resolve(self):
+        client = get_client()
+        if self._client is not client:
+            self._collection = client[settings.MONGODB_DB_NAME][self.name]
+            self._client = client
+        return self._collection
+
+    def __getattr__(self, attr: str):
+        return getattr(self._resolve(), attr)
+
 
 # Collections
-users_col = db["users"]
-resumes_col = db["resumes"]
-portfolios_col = db["portfolios"]
-case_studies_col = db["case_studies"]
+users_col = LazyCollection("users")
+resumes_col = LazyCollection("resumes")
+portfolios_col = LazyCollection("portfolios")
+case_studies_col = LazyCollection("case_studies")
+llm_cache_col = LazyCollection("llm_cache")
+cache_invalidations_col = LazyCollection("cache_invalidations")
+portfolio_snapshots_col = LazyCollection("portfolio_snapshots")
+jobs_col = LazyCollection("jobs")
+recommendations_col = LazyCollection("recommendations")
+search_index_col = LazyCollection("search_index")
 
 
-def ensure_indexes():
-    """Create indexes — call once on startup, not at import time."""
+async def create_indexes():
+    """Create every index the app relies on; idempotent, raises on failure."""
+    await users_col.create_index("email", unique=True)
+    await resumes_col.create_index("user_id")
+    await portfolios_col.create_index("user_id")
+    await case_studies_col.create_index("user_id")
+    for col in (resumes_col, portfolios_col, case_studies_col):
+        await col.create_index([("user_id", 1), ("updated_at", -1), ("_id", -1)])
+    if settings.LLM_CACHE_SHARED:
+        await llm_cache_col.create_index("expires_at", expireAfterSeconds=0)
+    if settings.SHARED_CACHE_INVALIDATION:
+        await cache_invalidations_col.create_index("at", expireAfterSeconds=60 * 60)
+    await jobs_col.create_index([("status", 1), ("run_at", 1)])
+    await jobs_col.create_index("finished_at", expireAfterSeconds=settings.JOB_RESULT_TTL_SECONDS)
+    await search_index_col.create_index("user_id")
+    # Last: fails if legacy data already has duplicate subdomains.
+    await portfolios_col.create_index(
+        "subdomain",
+        unique=True,
+        partialFilterExpression={"subdomain": {"$type": "string"}},
+    )
+
+
+async def ensure_indexes():
+    """Create indexes on startup, logging instead of failing the boot.
+
+    Skipped when ENSURE_INDEXES_ON_STARTUP is off; multi-worker deployments
+    create them once, from the gunicorn master or ``python -m app.cli ensure-indexes``.
+    """
+    if not settings.ENSURE_INDEXES_ON_STARTUP:
+        return
     try:
-        users_col.create_index("email", unique=True)
-        resumes_col.create_index("user_id")
-        portfolios_col.create_index("user_id")
-        case_studies_col.create_index("user_id")
+        await create_indexes()
+        print("✓ MongoDB indexes ensured")
     except Exception as e:
         print(f"Warning: Could not create indexes: {e}")
 
 
+async def close_client():
+    global _client
+    if _client is not None and _client_pid == os.getpid():
+        await _client.close()
+    _client = None
+
+
 def get_db():
-    return db
+    return get_client()[settings.MONGODB_DB_NAME]
@@ -3,15 +3,28 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from app.database import ensure_indexes
-from app.routers import auth, resumes, portfolios, case_studies, jd_analyzer, recommendations, cover_letter
+from app.database import ensure_indexes, close_client
+from app.services import llm_service, llm_limiter, cache_sync, jobs, resume_export, resume_import
+from app.utils.security import shutdown_hash_executor
+from app.utils.request_timing import TimingMiddleware
+from app.utils import metrics
+from app.routers import auth, resumes, portfolios, case_studies, jd_analyzer, recommendations, cover_letter, public, search, jobs as jobs_router, metrics as metrics_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    ensure_indexes()
-    print("✓ MongoDB indexes ensured")
+    await ensure_indexes()
+    llm_service.open_client()
+    cache_sync.start()
+    jobs.start()
     yield
+    await jobs.stop()
+    await cache_sync.stop()
+    await llm_service.close_client()
+    shutdown_hash_executor()
+    resume_export.pool.shutdown()
+    resume_import.pool.shutdown()
+    await close_client()
 
 
 app = FastAPI(
@@ -26,6 +39,7 @@ app = FastAPI(
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     print(f"❌ UNHANDLED ERROR on {request.method} {request.url.path}:")
+    metrics.incr("http_unhandled_errors_total", exception=type(exc).__name__)
     traceback.print_exception(exc)
     return JSONResponse(
         status_code=500,
@@ -33,6 +47,13 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# Upstream LLM still rate-limited after retries — ask the client to come back later
+@app.exception_handler(llm_limiter.LLMOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: llm_limiter.LLMOverloadedError):
+    headers = {"Retry-After": str(max(1, round(exc.retry_after)))} if exc.retry_after else {}
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers=headers)
+
+
 # CORS — allow frontend origins
 app.add_middleware(
     CORSMiddleware,
@@ -40,8 +61,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing", "ETag", "Content-Disposition"],
 )
 
+# Outermost, so CORS and routing are inside the measured time
+app.add_middleware(TimingMiddleware)
+
 # Register routers
 app.include_router(auth.router)
 app.include_router(resumes.router)
@@ -50,8 +75,12 @@ app.include_router(case_studies.router)
 app.include_router(jd_analyzer.router)
 app.include_router(recommendations.router)
 app.include_router(cover_letter.router)
+app.include_router(public.router)
+app.include_router(search.router)
+app.include_router(jobs_router.router)
+app.include_router(metrics_router.router)
 
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "PortfolifyAI API is running", "docs": "/docs"}
@@ -1,14 +1,21 @@
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from bson import ObjectId
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 from app.database import users_col
 from app.schemas.auth import UserCreate, UserLogin, UserResponse, TokenResponse
-from app.utils.security import hash_password, verify_password, create_access_token, get_current_user
+from app.utils.security import (
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
+    create_access_token,
+    get_current_user,
+    invalidate_user,
+)
 from app.config import get_settings
-import secrets
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 settings = get_settings()
@@ -28,18 +35,18 @@ def _user_doc_to_response(user: dict) -> UserResponse:
 
 
 @router.post("/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def signup(data: UserCreate):
-    existing = users_col.find_one({"email": data.email})
+async def signup(data: UserCreate):
+    existing = await users_col.find_one({"email": data.email})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     user_doc = {
         "email": data.email,
         "full_name": data.full_name,
-        "hashed_password": hash_password(data.password),
+        "hashed_password": await hash_password_async(data.password),
         "created_at": datetime.now(timezone.utc),
     }
-    result = users_col.insert_one(user_doc)
+    result = await users_col.insert_one(user_doc)
     user_doc["_id"] = result.inserted_id
 
     token = create_access_token({"sub": str(result.inserted_id)})
@@ -50,11 +57,19 @@ def signup(data: UserCreate):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(data: UserLogin):
-    user = users_col.find_one({"email": data.email})
-    if not user or not verify_password(data.password, user["hashed_password"]):
+async def login(data: UserLogin):
+    user = await users_col.find_one({"email": data.email})
+    # Google-only accounts have no password hash and cannot log in with a password.
+    hashed = user.get("hashed_password") if user else None
+    if not hashed or not await verify_password_async(data.password, hashed):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
+    if needs_rehash(hashed):
+        await users_col.update_one(
+            {"_id": user["_id"]},
+            {"$set": {"hashed_password": await hash_password_async(data.password)}},
+        )
+
     token = create_access_token({"sub": str(user["_id"])})
     return TokenResponse(
         access_token=token,
@@ -63,9 +78,10 @@ def login(data: UserLogin):
 
 
 @router.post("/google", response_model=TokenResponse)
-def google_login(data: GoogleTokenRequest):
+async def google_login(data: GoogleTokenRequest):
     try:
-        idinfo = id_token.verify_oauth2_token(
+        idinfo = await run_in_threadpool(
+            id_token.verify_oauth2_token,
             data.token,
             google_requests.Request(),
             settings.GOOGLE_CLIENT_ID,
@@ -81,15 +97,14 @@ def google_login(data: GoogleTokenRequest):
     if not email:
         raise HTTPException(status_code=400, detail="Google account has no email")
 
-    user = users_col.find_one({"email": email})
+    user = await users_col.find_one({"email": email})
     if not user:
         user_doc = {
             "email": email,
             "full_name": name,
-            "hashed_password": hash_password(secrets.token_hex(32)),
             "created_at": datetime.now(timezone.utc),
         }
-        result = users_col.insert_one(user_doc)
+        result = await users_col.insert_one(user_doc)
         user_doc["_id"] = result.inserted_id
         user = user_doc
 
@@ -101,7 +116,7 @@ def google_login(data: GoogleTokenRequest):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: dict = Depends(get_current_user)):
+async def get_me(current_user: dict = Depends(get_current_user)):
     return _user_doc_to_response(current_user)
 
 
@@ -111,12 +126,12 @@ class ProfileUpdate(BaseModel):
 
 
 @router.patch("/me", response_model=UserResponse)
-def update_me(data: ProfileUpdate, current_user: dict = Depends(get_current_user)):
+async def update_me(data: ProfileUpdate, current_user: dict = Depends(get_current_user)):
     update_fields = {}
     if data.full_name is not None:
         update_fields["full_name"] = data.full_name
     if data.email is not None:
-        existing = users_col.find_one({"email": data.email, "_id": {"$ne": current_user["_id"]}})
+        existing = await users_col.find_one({"email": data.email, "_id": {"$ne": current_user["_id"]}})
         if existing:
             raise HTTPException(status_code=400, detail="Email already in use")
         update_fields["email"] = data.email
@@ -124,9 +139,10 @@ def update_me(data: ProfileUpdate, current_user: dict = Depends(get_current_user
     if not update_fields:
         return _user_doc_to_response(current_user)
 
-    result = users_col.find_one_and_update(
+    result = await users_col.find_one_and_update(
         {"_id": current_user["_id"]},
         {"$set": update_fields},
         return_document=True,
     )
+    await invalidate_user(current_user["id"])
     return _user_doc_to_response(result)
@@ -1,9 +1,13 @@
+import time
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from bson import ObjectId
 from app.database import case_studies_col
 from app.utils.security import get_current_user
-from app.services import llm_service
+from app.utils.pagination import find_page
+from app.services import llm_service, jobs, search_index
+from app.utils.sse import stream_tokens
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/case-studies", tags=["Case Studies"])
@@ -14,6 +18,10 @@ class CaseStudyCreate(BaseModel):
     inputs: dict = {}
 
 
+# Heavy fields left out of list responses with view=summary
+_SUMMARY_EXCLUDE = ("inputs", "generated_content")
+
+
 def _doc_to_response(doc: dict) -> dict:
     return {
         "id": str(doc["_id"]),
@@ -27,13 +35,20 @@ def _doc_to_response(doc: dict) -> dict:
 
 
 @router.get("")
-def list_case_studies(current_user: dict = Depends(get_current_user)):
-    docs = case_studies_col.find({"user_id": current_user["id"]})
-    return [_doc_to_response(cs) for cs in docs]
+async def list_case_studies(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    current_user: dict = Depends(get_current_user),
+):
+    exclude = _SUMMARY_EXCLUDE if view == "summary" else ()
+    docs = await find_page(case_studies_col, {"user_id": current_user["id"]}, response, limit, cursor, exclude)
+    return [{k: v for k, v in _doc_to_response(d).items() if k not in exclude} for d in docs]
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
-def create_case_study(data: CaseStudyCreate, current_user: dict = Depends(get_current_user)):
+async def create_case_study(data: CaseStudyCreate, current_user: dict = Depends(get_current_user)):
     now = datetime.now(timezone.utc)
     doc = {
         "user_id": current_user["id"],
@@ -43,24 +58,72 @@ def create_case_study(data: CaseStudyCreate, current_user: dict = Depends(get_cu
         "created_at": now,
         "updated_at": now,
     }
-    result = case_studies_col.insert_one(doc)
+    result = await case_studies_col.insert_one(doc)
     doc["_id"] = result.inserted_id
+    await search_index.index("case_study", doc)
     return _doc_to_response(doc)
 
 
+async def _save_generated(doc: dict, generated: dict):
+    now = datetime.now(timezone.utc)
+    await case_studies_col.update_one({"_id": doc["_id"]}, {"$set": {"generated_content": generated, "updated_at": now}})
+    doc["generated_content"], doc["updated_at"] = generated, now
+    await search_index.index("case_study", doc)
+
+
 @router.post("/{case_study_id}/generate")
-def generate_case_study(case_study_id: str, current_user: dict = Depends(get_current_user)):
-    doc = case_studies_col.find_one({"_id": ObjectId(case_study_id), "user_id": current_user["id"]})
+async def generate_case_study(case_study_id: str, current_user: dict = Depends(get_current_user)):
+    doc = await case_studies_col.find_one({"_id": ObjectId(case_study_id), "user_id": current_user["id"]})
     if not doc:
         raise HTTPException(status_code=404, detail="Case study not found")
 
     try:
-        generated = llm_service.generate_case_study(doc.get("inputs", {}))
-        case_studies_col.update_one(
-            {"_id": doc["_id"]},
-            {"$set": {"generated_content": generated, "updated_at": datetime.now(timezone.utc)}},
-        )
-        doc["generated_content"] = generated
+        generated = await llm_service.generate_case_study(doc.get("inputs", {}))
+        await _save_generated(doc, generated)
         return _doc_to_response(doc)
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
+
+
+async def _generate_job(job: dict) -> dict:
+    doc = await case_studies_col.find_one({"_id": ObjectId(job["payload"]["case_study_id"]), "user_id": job["user_id"]})
+    if not doc:
+        raise ValueError("Case study not found")
+    generated = await llm_service.generate_case_study(doc.get("inputs", {}))
+    await _save_generated(doc, generated)
+    return _doc_to_response(doc)
+
+
+jobs.register("case_study.generate", _generate_job)
+
+
+@router.post("/{case_study_id}/generate/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_case_study(case_study_id: str, current_user: dict = Depends(get_current_user)):
+    """Queue generation and return the job at once; poll /api/jobs/{id} for the result."""
+    doc = await case_studies_col.find_one(
+        {"_id": ObjectId(case_study_id), "user_id": current_user["id"]}, projection={"_id": 1}
+    )
+    if not doc:
+        raise HTTPException(status_code=404, detail="Case study not found")
+    job = await jobs.enqueue("case_study.generate", current_user["id"], {"case_study_id": case_study_id})
+    return jobs.to_response(job)
+
+
+@router.post("/{case_study_id}/generate/stream")
+async def stream_case_study(case_study_id: str, current_user: dict = Depends(get_current_user)):
+    started = time.perf_counter()
+    doc = await case_studies_col.find_one({"_id": ObjectId(case_study_id), "user_id": current_user["id"]})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Case study not found")
+
+    try:
+        chunks = await llm_service.stream_case_study(doc.get("inputs", {}))
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def on_complete(text: str) -> dict:
+        generated = await llm_service.parse_case_study(text)
+        await _save_generated(doc, generated)
+        return _doc_to_response(doc)
+
+    return stream_tokens(chunks, started, on_complete)
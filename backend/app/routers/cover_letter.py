@@ -1,8 +1,10 @@
+import time
 from fastapi import APIRouter, Depends, HTTPException
 from bson import ObjectId
 from app.database import resumes_col
 from app.utils.security import get_current_user
 from app.services import llm_service
+from app.utils.sse import stream_tokens
 from pydantic import BaseModel
 
 
@@ -16,13 +18,13 @@ class CoverLetterRequest(BaseModel):
 
 
 @router.post("/generate")
-def generate_cover_letter(data: CoverLetterRequest, current_user: dict = Depends(get_current_user)):
-    resume = resumes_col.find_one({"_id": ObjectId(data.resume_id), "user_id": current_user["id"]})
+async def generate_cover_letter(data: CoverLetterRequest, current_user: dict = Depends(get_current_user)):
+    resume = await resumes_col.find_one({"_id": ObjectId(data.resume_id), "user_id": current_user["id"]})
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
     try:
-        letter = llm_service.generate_cover_letter(
+        letter = await llm_service.generate_cover_letter(
             resume.get("content", {}),
             data.job_description,
             data.company_name,
@@ -30,3 +32,25 @@ def generate_cover_letter(data: CoverLetterRequest, current_user: dict = Depends
         return {"cover_letter": letter}
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/generate/stream")
+async def stream_cover_letter(data: CoverLetterRequest, current_user: dict = Depends(get_current_user)):
+    started = time.perf_counter()
+    resume = await resumes_col.find_one({"_id": ObjectId(data.resume_id), "user_id": current_user["id"]})
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    try:
+        chunks = await llm_service.stream_cover_letter(
+            resume.get("content", {}),
+            data.job_description,
+            data.company_name,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def on_complete(text: str) -> dict:
+        return {"cover_letter": text}
+
+    return stream_tokens(chunks, started, on_complete)
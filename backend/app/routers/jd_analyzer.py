@@ -1,31 +1,120 @@
+import asyncio
+from typing import List, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from bson import ObjectId
 from app.database import resumes_col
 from app.utils.security import get_current_user
-from app.services import llm_service
-from pydantic import BaseModel
+from app.services import llm_service, llm_limiter, ats_matcher
+from app.config import get_settings
+from pydantic import BaseModel, Field
 
 router = APIRouter(prefix="/api/jd-analyzer", tags=["JD Analyzer"])
+settings = get_settings()
 
 
 class JDAnalyzeRequest(BaseModel):
     job_description: str
     resume_id: str
+    # fast: local matcher only; hybrid: local scores + LLM suggestions; llm: full LLM analysis
+    mode: Literal["fast", "hybrid", "llm"] = "hybrid"
 
 
 @router.post("/analyze")
-def analyze_jd(data: JDAnalyzeRequest, current_user: dict = Depends(get_current_user)):
-    resume = resumes_col.find_one({"_id": ObjectId(data.resume_id), "user_id": current_user["id"]})
+async def analyze_jd(data: JDAnalyzeRequest, current_user: dict = Depends(get_current_user)):
+    resume = await resumes_col.find_one({"_id": ObjectId(data.resume_id), "user_id": current_user["id"]})
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
+    content = resume.get("content", {})
 
     try:
-        result = llm_service.analyze_jd_match(data.job_description, resume.get("content", {}))
+        if data.mode == "llm":
+            result = await llm_service.analyze_jd_match(data.job_description, content)
+        else:
+            result = ats_matcher.analyze(data.job_description, content)
+            if data.mode == "fast":
+                result["suggestions"] = ats_matcher.local_suggestions(result["missing_skills"])
+            else:
+                result["suggestions"] = await llm_service.suggest_jd_improvements(
+                    data.job_description, content, result["matched_skills"], result["missing_skills"]
+                )
         return {
             "match_score": result.get("match_score", 0),
             "matched_skills": result.get("matched_skills", []),
             "missing_skills": result.get("missing_skills", []),
             "suggestions": result.get("suggestions", []),
+            "mode": data.mode,
         }
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
+
+
+class JDBatchRequest(BaseModel):
+    # Either one resume against many JDs ...
+    resume_id: Optional[str] = None
+    job_descriptions: List[str] = []
+    # ... or one JD against many resumes.
+    job_description: Optional[str] = None
+    resume_ids: List[str] = []
+    # LLM suggestions are only generated for the best k results.
+    top_k_suggestions: int = Field(0, ge=0)
+
+
+def _jd_title(job_description: str) -> str:
+    first_line = job_description.strip().split("\n", 1)[0]
+    return first_line[:80]
+
+
+@router.post("/analyze-batch")
+async def analyze_jd_batch(data: JDBatchRequest, current_user: dict = Depends(get_current_user)):
+    many_jds = bool(data.resume_id and data.job_descriptions)
+    many_resumes = bool(data.job_description and data.resume_ids)
+    if many_jds == many_resumes:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide either resume_id with job_descriptions, or job_description with resume_ids",
+        )
+    count = len(data.job_descriptions) if many_jds else len(data.resume_ids)
+    if count > settings.JD_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.JD_BATCH_MAX_ITEMS} items per request")
+
+    if many_jds:
+        resume = await resumes_col.find_one({"_id": ObjectId(data.resume_id), "user_id": current_user["id"]})
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        results = await run_in_threadpool(
+            ats_matcher.rank_job_descriptions, resume.get("content", {}), data.job_descriptions
+        )
+        for r in results:
+            r["title"] = _jd_title(data.job_descriptions[r["index"]])
+        pairs = [(data.job_descriptions[r["index"]], resume.get("content", {})) for r in results]
+    else:
+        ids = [ObjectId(rid) for rid in data.resume_ids]
+        docs = {
+            str(d["_id"]): d
+            async for d in resumes_col.find({"_id": {"$in": ids}, "user_id": current_user["id"]})
+        }
+        missing = [rid for rid in data.resume_ids if rid not in docs]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Resume not found: {missing[0]}")
+        contents = [docs[rid].get("content", {}) for rid in data.resume_ids]
+        results = await run_in_threadpool(ats_matcher.rank_resumes, data.job_description, contents)
+        for r in results:
+            r["resume_id"] = data.resume_ids[r["index"]]
+            r["title"] = docs[r["resume_id"]]["title"]
+        pairs = [(data.job_description, contents[r["index"]]) for r in results]
+
+    top_k = min(data.top_k_suggestions, settings.JD_BATCH_MAX_SUGGESTIONS, len(results))
+    try:
+        with llm_limiter.priority("batch"):
+            suggestions = await asyncio.gather(*(
+                llm_service.suggest_jd_improvements(jd, content, r["matched_skills"], r["missing_skills"])
+                for (jd, content), r in zip(pairs[:top_k], results[:top_k])
+            ))
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    for rank, r in enumerate(results):
+        r["rank"] = rank + 1
+        r["suggestions"] = suggestions[rank] if rank < top_k else []
+    return {"results": results}
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from bson import ObjectId
+from app.utils.security import get_current_user
+from app.services import jobs
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the job to finish"),
+    current_user: dict = Depends(get_current_user),
+):
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    if wait:
+        job = await jobs.wait(job_id, current_user["id"], wait)
+    else:
+        job = await jobs.get(job_id, current_user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jobs.to_response(job)
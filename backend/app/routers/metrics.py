@@ -0,0 +1,31 @@
+import secrets
+from anyio import to_thread
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.config import get_settings
+from app.utils import metrics
+
+settings = get_settings()
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _collect_default_threadpool():
+    """Saturation of the threadpool behind run_in_threadpool and sync endpoints."""
+    limiter = to_thread.current_default_thread_limiter()
+    stats = limiter.statistics()
+    metrics.set_gauge("threadpool_size", limiter.total_tokens, pool="default")
+    metrics.set_gauge("threadpool_busy", stats.borrowed_tokens, pool="default")
+    metrics.set_gauge("threadpool_waiting", stats.tasks_waiting, pool="default")
+
+
+metrics.register_collector(_collect_default_threadpool)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics(authorization: str = Header("")):
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN and not secrets.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -1,9 +1,15 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from app.database import portfolios_col
 from app.utils.security import get_current_user
-from app.services import llm_service
+from app.utils.pagination import find_page
+from app.utils.patching import DocumentPatch, build_update, version_filter
+from app.services import llm_service, public_portfolios
+from app.services import recommendations as recommendations_service
 from pydantic import BaseModel
 from typing import Optional
 
@@ -30,6 +36,16 @@ class GenerateBioRequest(BaseModel):
     experience: str = ""
 
 
+def _normalize_subdomain(subdomain: Optional[str]) -> Optional[str]:
+    if subdomain is None:
+        return None
+    return subdomain.strip().lower() or None
+
+
+# Heavy fields left out of list responses with view=summary
+_SUMMARY_EXCLUDE = ("config",)
+
+
 def _doc_to_response(doc: dict) -> dict:
     return {
         "id": str(doc["_id"]),
@@ -38,75 +54,123 @@ def _doc_to_response(doc: dict) -> dict:
         "config": doc.get("config", {}),
         "subdomain": doc.get("subdomain"),
         "is_published": doc.get("is_published", False),
+        "version": doc.get("version", 0),
         "created_at": doc.get("created_at", ""),
         "updated_at": doc.get("updated_at", ""),
     }
 
 
 @router.get("")
-def list_portfolios(current_user: dict = Depends(get_current_user)):
-    docs = portfolios_col.find({"user_id": current_user["id"]})
-    return [_doc_to_response(p) for p in docs]
+async def list_portfolios(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    current_user: dict = Depends(get_current_user),
+):
+    exclude = _SUMMARY_EXCLUDE if view == "summary" else ()
+    docs = await find_page(portfolios_col, {"user_id": current_user["id"]}, response, limit, cursor, exclude)
+    return [{k: v for k, v in _doc_to_response(d).items() if k not in exclude} for d in docs]
 
 
 @router.post("/generate-bio")
-def generate_bio_endpoint(data: GenerateBioRequest, current_user: dict = Depends(get_current_user)):
+async def generate_bio_endpoint(data: GenerateBioRequest, current_user: dict = Depends(get_current_user)):
     try:
-        result = llm_service.generate_portfolio_bio(data.name, data.title, data.skills, data.experience)
+        result = await llm_service.generate_portfolio_bio(data.name, data.title, data.skills, data.experience)
         return result
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
-def create_portfolio(data: PortfolioCreate, current_user: dict = Depends(get_current_user)):
+async def create_portfolio(data: PortfolioCreate, current_user: dict = Depends(get_current_user)):
     now = datetime.now(timezone.utc)
     doc = {
         "user_id": current_user["id"],
         "title": data.title,
         "config": data.config,
-        "subdomain": data.subdomain,
+        "subdomain": _normalize_subdomain(data.subdomain),
         "is_published": False,
+        "version": 1,
         "created_at": now,
         "updated_at": now,
     }
-    result = portfolios_col.insert_one(doc)
+    try:
+        result = await portfolios_col.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Subdomain is already taken")
     doc["_id"] = result.inserted_id
+    await recommendations_service.schedule_refresh(current_user["id"])
     return _doc_to_response(doc)
 
 
 @router.get("/{portfolio_id}")
-def get_portfolio(portfolio_id: str, current_user: dict = Depends(get_current_user)):
-    doc = portfolios_col.find_one({"_id": ObjectId(portfolio_id), "user_id": current_user["id"]})
+async def get_portfolio(portfolio_id: str, current_user: dict = Depends(get_current_user)):
+    doc = await portfolios_col.find_one({"_id": ObjectId(portfolio_id), "user_id": current_user["id"]})
     if not doc:
         raise HTTPException(status_code=404, detail="Portfolio not found")
     return _doc_to_response(doc)
 
 
 @router.put("/{portfolio_id}")
-def update_portfolio(portfolio_id: str, data: PortfolioUpdate, current_user: dict = Depends(get_current_user)):
+async def update_portfolio(portfolio_id: str, data: PortfolioUpdate, current_user: dict = Depends(get_current_user)):
     update_fields = {"updated_at": datetime.now(timezone.utc)}
     if data.title is not None:
         update_fields["title"] = data.title
     if data.config is not None:
         update_fields["config"] = data.config
     if data.subdomain is not None:
-        update_fields["subdomain"] = data.subdomain
+        update_fields["subdomain"] = _normalize_subdomain(data.subdomain)
     if data.is_published is not None:
         update_fields["is_published"] = data.is_published
 
-    result = portfolios_col.find_one_and_update(
-        {"_id": ObjectId(portfolio_id), "user_id": current_user["id"]},
-        {"$set": update_fields},
-        return_document=True,
-    )
-    if not result:
+    try:
+        before = await portfolios_col.find_one_and_update(
+            {"_id": ObjectId(portfolio_id), "user_id": current_user["id"]},
+            {"$set": update_fields, "$inc": {"version": 1}},
+            return_document=ReturnDocument.BEFORE,
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Subdomain is already taken")
+    if not before:
         raise HTTPException(status_code=404, detail="Portfolio not found")
+
+    result = {**before, **update_fields, "version": before.get("version", 0) + 1}
+    if before.get("is_published") or result.get("is_published"):
+        await public_portfolios.sync_snapshot(result, previous_subdomain=before.get("subdomain"))
+    await recommendations_service.schedule_refresh(current_user["id"])
     return _doc_to_response(result)
 
 
+@router.patch("/{portfolio_id}")
+async def patch_portfolio(portfolio_id: str, data: DocumentPatch, current_user: dict = Depends(get_current_user)):
+    """Autosave: apply only the changed fields and return the new version."""
+    update = build_update(data, allowed_roots={"title": str, "config": dict})
+    now = datetime.now(timezone.utc)
+    update.setdefault("$set", {})["updated_at"] = now
+
+    owner = {"_id": ObjectId(portfolio_id), "user_id": current_user["id"]}
+    result = await portfolios_col.find_one_and_update(
+        {**owner, **version_filter(data.version)},
+        update,
+        return_document=ReturnDocument.AFTER,
+    )
+    if not result:
+        current = await portfolios_col.find_one(owner, projection={"version": 1})
+        if not current:
+            raise HTTPException(status_code=404, detail="Portfolio not found")
+        raise HTTPException(status_code=409, detail={"message": "Portfolio was modified", "version": current.get("version", 0)})
+    if result.get("is_published"):
+        await public_portfolios.sync_snapshot(result)
+    await recommendations_service.schedule_refresh(current_user["id"])
+    return {"id": portfolio_id, "version": result["version"], "updated_at": result["updated_at"]}
+
+
 @router.delete("/{portfolio_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_portfolio(portfolio_id: str, current_user: dict = Depends(get_current_user)):
-    result = portfolios_col.delete_one({"_id": ObjectId(portfolio_id), "user_id": current_user["id"]})
-    if result.deleted_count == 0:
+async def delete_portfolio(portfolio_id: str, current_user: dict = Depends(get_current_user)):
+    doc = await portfolios_col.find_one_and_delete({"_id": ObjectId(portfolio_id), "user_id": current_user["id"]})
+    if not doc:
         raise HTTPException(status_code=404, detail="Portfolio not found")
+    if doc.get("subdomain"):
+        await public_portfolios.remove_snapshot(doc["subdomain"])
+    await recommendations_service.schedule_refresh(current_user["id"])
@@ -0,0 +1,29 @@
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Request, Response
+from app.config import get_settings
+from app.services import public_portfolios
+
+router = APIRouter(prefix="/p", tags=["Public Portfolios"])
+settings = get_settings()
+
+
+@router.get("/{subdomain}")
+async def get_public_portfolio(subdomain: str, request: Request, format: Literal["html", "json"] = "html"):
+    snapshot = await public_portfolios.get_snapshot(subdomain.lower())
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+
+    headers = {
+        "ETag": snapshot["etag"],
+        "Cache-Control": (
+            f"public, max-age={settings.PUBLIC_PORTFOLIO_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={settings.PUBLIC_PORTFOLIO_STALE_SECONDS}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == snapshot["etag"]:
+        return Response(status_code=304, headers=headers)
+
+    if format == "json":
+        return Response(content=snapshot["json"], media_type="application/json", headers=headers)
+    return Response(content=snapshot["html"], media_type="text/html; charset=utf-8", headers=headers)
@@ -1,20 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from app.database import resumes_col, portfolios_col
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.utils.security import get_current_user
-from app.services import llm_service
+from app.services import jobs
+from app.services import recommendations as recommendations_service
 
 router = APIRouter(prefix="/api/recommendations", tags=["Recommendations"])
 
 
-@router.get("")
-def get_recommendations(current_user: dict = Depends(get_current_user)):
-    resumes = list(resumes_col.find({"user_id": current_user["id"]}))
-    portfolios = list(portfolios_col.find({"user_id": current_user["id"]}))
+async def _recommend_job(job: dict) -> dict:
+    # An explicitly queued run is already off the request path, so it waits for fresh results.
+    return await recommendations_service.get(job["user_id"], stale_ok=False)
+
+
+jobs.register("recommendations", _recommend_job)
 
-    resume_data = [{"title": r["title"], "content": r.get("content", {})} for r in resumes]
-    portfolio_data = [{"title": p["title"], "config": p.get("config", {})} for p in portfolios]
 
+@router.get("")
+async def get_recommendations(current_user: dict = Depends(get_current_user)):
     try:
-        return llm_service.get_recommendations(resume_data, portfolio_data)
+        return await recommendations_service.get(current_user["id"])
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_recommendations(current_user: dict = Depends(get_current_user)):
+    """Queue a recommendations run; poll /api/jobs/{id} for the result."""
+    job = await jobs.enqueue("recommendations", current_user["id"], {})
+    return jobs.to_response(job)
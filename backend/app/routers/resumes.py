@@ -1,10 +1,21 @@
+import re
+import time
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from starlette.datastructures import UploadFile
 from bson import ObjectId
 from typing import List
 from app.database import resumes_col
 from app.utils.security import get_current_user
+from app.utils.pagination import find_page
+from app.utils.patching import DocumentPatch, build_update, version_filter
 from app.services import llm_service
+from app.services import recommendations as recommendations_service
+from app.services import resume_export, resume_import, resume_render, search_index
+from app.services.document_text import DocumentError, UnsupportedDocument
+from app.utils.sse import stream_tokens
+from app.config import get_settings
 from pydantic import BaseModel
 from typing import Optional
 
@@ -25,6 +36,11 @@ class AISummaryRequest(BaseModel):
 
 
 router = APIRouter(prefix="/api/resumes", tags=["Resumes"])
+settings = get_settings()
+
+
+# Heavy fields left out of list responses with view=summary
+_SUMMARY_EXCLUDE = ("content",)
 
 
 def _doc_to_response(doc: dict) -> dict:
@@ -33,15 +49,23 @@ def _doc_to_response(doc: dict) -> dict:
         "user_id": doc["user_id"],
         "title": doc["title"],
         "content": doc.get("content", {}),
+        "version": doc.get("version", 0),
         "created_at": doc.get("created_at", ""),
         "updated_at": doc.get("updated_at", ""),
     }
 
 
 @router.get("")
-def list_resumes(current_user: dict = Depends(get_current_user)):
-    resumes = resumes_col.find({"user_id": current_user["id"]})
-    return [_doc_to_response(r) for r in resumes]
+async def list_resumes(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    current_user: dict = Depends(get_current_user),
+):
+    exclude = _SUMMARY_EXCLUDE if view == "summary" else ()
+    docs = await find_page(resumes_col, {"user_id": current_user["id"]}, response, limit, cursor, exclude)
+    return [{k: v for k, v in _doc_to_response(d).items() if k not in exclude} for d in docs]
 
 
 class EnhanceBulletRequest(BaseModel):
@@ -51,14 +75,55 @@ class EnhanceBulletRequest(BaseModel):
 
 
 @router.post("/enhance-bullet")
-def enhance_bullet_endpoint(data: EnhanceBulletRequest, current_user: dict = Depends(get_current_user)):
+async def enhance_bullet_endpoint(data: EnhanceBulletRequest, current_user: dict = Depends(get_current_user)):
     try:
-        enhanced = llm_service.enhance_bullet(data.bullet, data.job_title, data.company)
+        enhanced = await llm_service.enhance_bullet(data.bullet, data.job_title, data.company)
         return {"enhanced": enhanced}
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
 
 
+class EnhanceBulletsRequest(BaseModel):
+    bullets: List[EnhanceBulletRequest] = []
+    resume_id: Optional[str] = None
+
+
+def _resume_bullets(content: dict) -> list:
+    """Non-empty experience bullets of a resume, tagged with their position."""
+    items = []
+    for exp_idx, exp in enumerate(content.get("experience") or []):
+        for bullet_idx, bullet in enumerate(exp.get("bullets") or []):
+            if bullet and bullet.strip():
+                items.append({
+                    "bullet": bullet,
+                    "job_title": exp.get("title", ""),
+                    "company": exp.get("company", ""),
+                    "experience_index": exp_idx,
+                    "bullet_index": bullet_idx,
+                })
+    return items
+
+
+@router.post("/enhance-bullets")
+async def enhance_bullets_endpoint(data: EnhanceBulletsRequest, current_user: dict = Depends(get_current_user)):
+    items = [b.model_dump() for b in data.bullets]
+    if data.resume_id:
+        doc = await resumes_col.find_one({"_id": ObjectId(data.resume_id), "user_id": current_user["id"]})
+        if not doc:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        items.extend(_resume_bullets(doc.get("content", {})))
+
+    if len(items) > settings.LLM_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.LLM_BATCH_MAX_ITEMS} bullets per request")
+    if not items:
+        return {"results": []}
+
+    try:
+        return {"results": await llm_service.enhance_bullets(items)}
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
 class SuggestSkillsRequest(BaseModel):
     job_title: str
     current_skills: list = []
@@ -66,69 +131,220 @@ class SuggestSkillsRequest(BaseModel):
 
 
 @router.post("/suggest-skills")
-def suggest_skills_endpoint(data: SuggestSkillsRequest, current_user: dict = Depends(get_current_user)):
+async def suggest_skills_endpoint(data: SuggestSkillsRequest, current_user: dict = Depends(get_current_user)):
     try:
-        skills = llm_service.suggest_skills(data.job_title, data.current_skills, data.experience_summary)
+        skills = await llm_service.suggest_skills(data.job_title, data.current_skills, data.experience_summary)
         return {"skills": skills}
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
-def create_resume(data: ResumeCreate, current_user: dict = Depends(get_current_user)):
+async def create_resume(data: ResumeCreate, current_user: dict = Depends(get_current_user)):
     now = datetime.now(timezone.utc)
     doc = {
         "user_id": current_user["id"],
         "title": data.title,
         "content": data.content,
+        "version": 1,
         "created_at": now,
         "updated_at": now,
     }
-    result = resumes_col.insert_one(doc)
+    result = await resumes_col.insert_one(doc)
     doc["_id"] = result.inserted_id
+    await search_index.index("resume", doc)
+    await recommendations_service.schedule_refresh(current_user["id"])
     return _doc_to_response(doc)
 
 
+# Room for the multipart boundaries and headers around the file itself
+_MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+@router.post("/import", status_code=status.HTTP_201_CREATED)
+async def import_resume(
+    request: Request,
+    cleanup: bool = False,
+    title: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """Create a resume from an uploaded PDF or DOCX (multipart field ``file``).
+
+    Text is extracted and split into sections locally; ``cleanup=true`` adds an
+    LLM pass over the result. The body is parsed only after its declared size
+    is checked, so oversized uploads are refused before anything is read.
+    """
+    length = request.headers.get("content-length")
+    if length is None or not length.isdigit():
+        raise HTTPException(status_code=411, detail="Content-Length is required")
+    if int(length) > settings.IMPORT_MAX_UPLOAD_BYTES + _MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File is larger than {settings.IMPORT_MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+
+    async with request.form(max_files=1, max_fields=1) as form:
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=400, detail="Send the resume as a multipart 'file' field")
+        try:
+            parsed = await resume_import.parse_upload(upload.file, cleanup)
+        except resume_import.UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except UnsupportedDocument as e:
+            raise HTTPException(status_code=415, detail=str(e))
+        except DocumentError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        filename = upload.filename or ""
+
+    content = parsed["content"]
+    name = f"{content.get('firstName', '')} {content.get('lastName', '')}".strip()
+    now = datetime.now(timezone.utc)
+    doc = {
+        "user_id": current_user["id"],
+        "title": title or (f"{name} (imported)" if name else filename.rsplit(".", 1)[0]) or "Imported resume",
+        "content": content,
+        "version": 1,
+        "created_at": now,
+        "updated_at": now,
+    }
+    result = await resumes_col.insert_one(doc)
+    doc["_id"] = result.inserted_id
+    await search_index.index("resume", doc)
+    await recommendations_service.schedule_refresh(current_user["id"])
+    return {
+        **_doc_to_response(doc),
+        "import": {"format": parsed["kind"], "cleaned_up": parsed["cleaned_up"], "warnings": parsed["warnings"]},
+    }
+
+
 @router.get("/{resume_id}")
-def get_resume(resume_id: str, current_user: dict = Depends(get_current_user)):
-    doc = resumes_col.find_one({"_id": ObjectId(resume_id), "user_id": current_user["id"]})
+async def get_resume(resume_id: str, current_user: dict = Depends(get_current_user)):
+    doc = await resumes_col.find_one({"_id": ObjectId(resume_id), "user_id": current_user["id"]})
     if not doc:
         raise HTTPException(status_code=404, detail="Resume not found")
     return _doc_to_response(doc)
 
 
 @router.put("/{resume_id}")
-def update_resume(resume_id: str, data: ResumeUpdate, current_user: dict = Depends(get_current_user)):
+async def update_resume(resume_id: str, data: ResumeUpdate, current_user: dict = Depends(get_current_user)):
     update_fields = {"updated_at": datetime.now(timezone.utc)}
     if data.title is not None:
         update_fields["title"] = data.title
     if data.content is not None:
         update_fields["content"] = data.content
 
-    result = resumes_col.find_one_and_update(
+    result = await resumes_col.find_one_and_update(
         {"_id": ObjectId(resume_id), "user_id": current_user["id"]},
-        {"$set": update_fields},
+        {"$set": update_fields, "$inc": {"version": 1}},
         return_document=True,
     )
     if not result:
         raise HTTPException(status_code=404, detail="Resume not found")
+    await resume_export.invalidate(resume_id)
+    await search_index.index("resume", result)
+    await recommendations_service.schedule_refresh(current_user["id"])
     return _doc_to_response(result)
 
 
+@router.patch("/{resume_id}")
+async def patch_resume(resume_id: str, data: DocumentPatch, current_user: dict = Depends(get_current_user)):
+    """Autosave: apply only the changed fields and return the new version."""
+    update = build_update(data, allowed_roots={"title": str, "content": dict})
+    now = datetime.now(timezone.utc)
+    update.setdefault("$set", {})["updated_at"] = now
+
+    owner = {"_id": ObjectId(resume_id), "user_id": current_user["id"]}
+    result = await resumes_col.find_one_and_update(
+        {**owner, **version_filter(data.version)},
+        update,
+        projection={"version": 1, "updated_at": 1},
+        return_document=True,
+    )
+    if not result:
+        current = await resumes_col.find_one(owner, projection={"version": 1})
+        if not current:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        raise HTTPException(status_code=409, detail={"message": "Resume was modified", "version": current.get("version", 0)})
+    await resume_export.invalidate(resume_id)
+    # Autosave fires often and returns no content; search reindexes from updated_at when next used.
+    await search_index.invalidate(current_user["id"])
+    await recommendations_service.schedule_refresh(current_user["id"])
+    return {"id": resume_id, "version": result["version"], "updated_at": result["updated_at"]}
+
+
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_resume(resume_id: str, current_user: dict = Depends(get_current_user)):
-    result = resumes_col.delete_one({"_id": ObjectId(resume_id), "user_id": current_user["id"]})
+async def delete_resume(resume_id: str, current_user: dict = Depends(get_current_user)):
+    result = await resumes_col.delete_one({"_id": ObjectId(resume_id), "user_id": current_user["id"]})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Resume not found")
+    await resume_export.invalidate(resume_id)
+    await search_index.remove("resume", resume_id, current_user["id"])
+    await recommendations_service.schedule_refresh(current_user["id"])
+
+
+@router.get("/{resume_id}/export")
+async def export_resume(
+    resume_id: str,
+    request: Request,
+    format: Literal["pdf", "docx", "md"] = "pdf",
+    template: str = "classic",
+    current_user: dict = Depends(get_current_user),
+):
+    if template not in resume_render.TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unknown template. Available: {', '.join(resume_render.TEMPLATES)}")
+    doc = await resumes_col.find_one(
+        {"_id": ObjectId(resume_id), "user_id": current_user["id"]}, projection={"title": 1, "content": 1}
+    )
+    if not doc:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    content = doc.get("content", {})
+
+    etag = f'"{resume_export.digest(content, template, format)}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    try:
+        data, _ = await resume_export.export(resume_id, content, template, format)
+    except resume_render.UnsupportedCharacters as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    filename = re.sub(r"[^A-Za-z0-9._-]+", "-", doc.get("title", "")).strip("-") or "resume"
+    return Response(
+        data,
+        media_type=resume_export.FORMATS[format],
+        headers={
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+            "Content-Disposition": f'attachment; filename="{filename}.{format}"',
+        },
+    )
 
 
 @router.post("/{resume_id}/ai-summary")
-def generate_ai_summary(resume_id: str, data: AISummaryRequest, current_user: dict = Depends(get_current_user)):
-    doc = resumes_col.find_one({"_id": ObjectId(resume_id), "user_id": current_user["id"]})
+async def generate_ai_summary(resume_id: str, data: AISummaryRequest, current_user: dict = Depends(get_current_user)):
+    doc = await resumes_col.find_one({"_id": ObjectId(resume_id), "user_id": current_user["id"]})
     if not doc:
         raise HTTPException(status_code=404, detail="Resume not found")
     try:
-        summary = llm_service.generate_resume_summary(data.job_title, data.experience_summary)
+        summary = await llm_service.generate_resume_summary(data.job_title, data.experience_summary)
         return {"summary": summary}
     except ValueError as e:
         raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/{resume_id}/ai-summary/stream")
+async def stream_ai_summary(resume_id: str, data: AISummaryRequest, current_user: dict = Depends(get_current_user)):
+    started = time.perf_counter()
+    doc = await resumes_col.find_one({"_id": ObjectId(resume_id), "user_id": current_user["id"]})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    try:
+        chunks = await llm_service.stream_resume_summary(data.job_title, data.experience_summary)
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def on_complete(text: str) -> dict:
+        return {"summary": text}
+
+    return stream_tokens(chunks, started, on_complete)
@@ -0,0 +1,17 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from app.utils.security import get_current_user
+from app.services import search_index
+
+router = APIRouter(prefix="/api/search", tags=["Search"])
+
+
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[Literal["resume", "case_study"]] = None,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: dict = Depends(get_current_user),
+):
+    """Best-matching passages (bullets, summaries, case study sections) across the user's documents."""
+    return {"query": q, "results": await search_index.search(current_user["id"], q, limit, kind)}
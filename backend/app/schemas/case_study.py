@@ -19,3 +19,10 @@ class CaseStudyResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class GeneratedCaseStudy(BaseModel):
+    executive_summary: str
+    challenge: str
+    solution: str
+    results: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 
@@ -12,8 +12,17 @@ class MatchedSkill(BaseModel):
     found_in: str = ""
 
 
+class Suggestion(BaseModel):
+    title: str
+    description: str = ""
+
+
 class JDAnalyzeResponse(BaseModel):
-    match_score: int
-    matched_skills: List[str]
-    missing_skills: List[str]
-    suggestions: List[dict]
+    match_score: int = Field(ge=0, le=100)
+    matched_skills: List[str] = []
+    missing_skills: List[str] = []
+    suggestions: List[Suggestion] = []
+
+
+class JDSuggestions(BaseModel):
+    suggestions: List[Suggestion]
@@ -28,3 +28,8 @@ class PortfolioResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PortfolioBio(BaseModel):
+    tagline: str
+    bio: str
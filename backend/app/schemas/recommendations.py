@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+
+class ActionItem(BaseModel):
+    title: str
+    description: str = ""
+    priority: Literal["high", "medium", "low"] = "medium"
+
+
+class RecommendationsResponse(BaseModel):
+    competitiveness_score: int = Field(ge=0, le=100)
+    action_items: List[ActionItem] = []
+    interview_probability_boost: str = "+0%"
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class ResumeCreate(BaseModel):
@@ -28,3 +28,34 @@ class ResumeResponse(BaseModel):
 class AISummaryRequest(BaseModel):
     job_title: str = ""
     experience_summary: str = ""
+
+
+class SkillSuggestions(BaseModel):
+    skills: List[str]
+
+
+class ImportedExperience(BaseModel):
+    title: str = ""
+    company: str = ""
+    location: str = ""
+    dates: str = ""
+    bullets: List[str] = []
+
+
+class ImportedEducation(BaseModel):
+    degree: str = ""
+    school: str = ""
+    year: str = ""
+
+
+class ImportedResume(BaseModel):
+    firstName: str = ""
+    lastName: str = ""
+    title: str = ""
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+    summary: str = ""
+    experience: List[ImportedExperience] = []
+    education: List[ImportedEducation] = []
+    skills: List[str] = []
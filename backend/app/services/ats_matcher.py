@@ -0,0 +1,312 @@
+"""Local, deterministic resume ↔ job-description matcher.
+
+Extracts known skills from both texts with a normalized n-gram lexicon lookup,
+weights the JD's skills with a BM25-style saturated term frequency, and blends
+weighted skill coverage with a term-frequency cosine over the remaining
+keywords (stopwords removed, no IDF weighting). Runs in well under a
+millisecond per pair and never touches the network.
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+# canonical display name -> extra aliases (the lowercased display name is always an alias)
+SKILL_LEXICON: dict[str, list[str]] = {
+    # Languages
+    "Python": ["py"],
+    "JavaScript": ["js", "ecmascript", "es6"],
+    "TypeScript": ["ts"],
+    "Java": [],
+    "Kotlin": [],
+    "Scala": [],
+    "Go": ["golang"],
+    "Rust": [],
+    "C": [],
+    "C++": ["cpp"],
+    "C#": ["csharp"],
+    "Ruby": [],
+    "PHP": [],
+    "Swift": [],
+    "Objective-C": ["objective c"],
+    "R": [],
+    "MATLAB": [],
+    "SQL": [],
+    "Bash": ["shell scripting"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Dart": [],
+    "Elixir": [],
+    # Frontend
+    "React": ["react.js", "reactjs"],
+    "React Native": [],
+    "Next.js": ["nextjs"],
+    "Vue": ["vue.js", "vuejs"],
+    "Angular": ["angularjs", "angular.js"],
+    "Svelte": [],
+    "Redux": [],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "Sass": ["scss"],
+    "Webpack": [],
+    "Vite": [],
+    "jQuery": [],
+    "Flutter": [],
+    # Backend
+    "Node.js": ["node", "nodejs"],
+    "Express": ["express.js", "expressjs"],
+    "NestJS": ["nest.js"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring": ["spring boot", "springboot"],
+    "Ruby on Rails": ["rails", "ror"],
+    ".NET": ["dotnet", "asp.net", ".net core"],
+    "Laravel": [],
+    "GraphQL": [],
+    "REST APIs": ["restful", "rest api", "restful apis", "rest apis"],
+    "gRPC": [],
+    "Microservices": ["microservice", "micro-services"],
+    "WebSockets": ["websocket"],
+    # Data stores
+    "PostgreSQL": ["postgres", "psql"],
+    "MySQL": [],
+    "SQLite": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search", "opensearch"],
+    "Cassandra": [],
+    "DynamoDB": [],
+    "Oracle": [],
+    "SQL Server": ["mssql", "ms sql"],
+    "Snowflake": [],
+    "BigQuery": ["big query"],
+    # Data / ML
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl"],
+    "NLP": ["natural language processing"],
+    "Computer Vision": [],
+    "LLMs": ["llm", "large language models", "large language model"],
+    "TensorFlow": [],
+    "PyTorch": ["torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": [],
+    "Airflow": ["apache airflow"],
+    "dbt": [],
+    "ETL": ["elt"],
+    "Data Analysis": ["data analytics"],
+    "Data Visualization": ["data viz"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Statistics": ["statistical analysis"],
+    "A/B Testing": ["ab testing", "a/b tests", "experimentation"],
+    # Cloud / infra
+    "AWS": ["amazon web services"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Azure": ["microsoft azure"],
+    "Docker": ["containers", "containerization"],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "Helm": [],
+    "CI/CD": ["ci", "cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Jenkins": [],
+    "GitHub Actions": [],
+    "GitLab CI": [],
+    "Linux": ["unix"],
+    "Nginx": [],
+    "Kafka": ["apache kafka"],
+    "RabbitMQ": [],
+    "Serverless": ["lambda", "aws lambda"],
+    "Prometheus": [],
+    "Grafana": [],
+    "Observability": ["monitoring"],
+    "Git": ["github", "gitlab", "version control"],
+    # Practices
+    "Agile": ["scrum", "kanban"],
+    "TDD": ["test driven development", "test-driven development"],
+    "Unit Testing": ["unit tests", "pytest", "jest", "junit"],
+    "System Design": ["distributed systems", "scalability"],
+    "Security": ["cybersecurity", "application security", "appsec"],
+    "OAuth": ["oauth2", "oauth 2.0", "openid connect", "oidc"],
+    "Performance Optimization": ["performance tuning"],
+    "Accessibility": ["a11y", "wcag"],
+    "UI/UX": ["ui", "ux", "user experience", "user interface"],
+    "Figma": [],
+    "SEO": [],
+    # Soft skills
+    "Leadership": ["led", "lead", "team lead", "tech lead"],
+    "Mentoring": ["mentor", "mentored", "mentorship", "coaching"],
+    "Communication": ["communicator"],
+    "Collaboration": ["cross-functional", "cross functional", "teamwork"],
+    "Project Management": ["program management"],
+    "Product Management": [],
+    "Stakeholder Management": ["stakeholders"],
+    "Problem Solving": ["problem-solving"],
+}
+
+STOPWORDS = frozenset(
+    """a about above after again all also am an and any are as at be because been before being below between
+    both but by can could did do does doing down during each etc few for from further had has have having he
+    her here hers him his how i if in into is it its itself just me more most my no nor not now of off on once
+    only or other our ours out over own per same she should so some such than that the their them then there
+    these they this those through to too under until up very was we were what when where which while who whom
+    why will with would you your yours years year experience work working team teams role company strong
+    ability including using use used new well within across plus preferred required requirements responsibilities
+    looking join must nice have ideal candidate we're you'll will be""".split()
+)
+
+# Single-word skills that are also everyday English; only matched when capitalized.
+_CASE_SENSITIVE = frozenset({"go", "c", "r", "express", "spring", "swift", "rust", "dart", "oracle", "elixir"})
+
+_TOKEN_RE = re.compile(r"\.?[A-Za-z0-9][A-Za-z0-9+#.\-]*")
+_MAX_NGRAM = 3
+_BM25_K1 = 1.2
+_SKILL_WEIGHT = 0.8  # share of the score from weighted skill coverage; the rest is keyword similarity
+
+
+def _raw_tokens(text: str) -> list[str]:
+    text = text.replace("/", " ").replace(",", " ")
+    return [t.rstrip(".-") for t in _TOKEN_RE.findall(text) if t.rstrip(".-")]
+
+
+def tokenize(text: str) -> list[str]:
+    return [t.lower() for t in _raw_tokens(text)]
+
+
+def _build_alias_index() -> dict[tuple[str, ...], str]:
+    index = {}
+    for canonical, aliases in SKILL_LEXICON.items():
+        for alias in [canonical, *aliases]:
+            tokens = tuple(tokenize(alias))
+            if tokens:
+                index.setdefault(tokens, canonical)
+    return index
+
+
+_ALIAS_INDEX = _build_alias_index()
+
+
+def extract_skills(raw_tokens: list[str]) -> Counter:
+    """Count canonical skills in a case-preserving token stream, preferring the longest n-gram match."""
+    tokens = [t.lower() for t in raw_tokens]
+    found: Counter = Counter()
+    i = 0
+    while i < len(tokens):
+        for n in range(min(_MAX_NGRAM, len(tokens) - i), 0, -1):
+            canonical = _ALIAS_INDEX.get(tuple(tokens[i:i + n]))
+            if canonical and n == 1 and tokens[i] in _CASE_SENSITIVE and not raw_tokens[i][0].isupper():
+                canonical = None
+            if canonical:
+                found[canonical] += 1
+                i += n
+                break
+        else:
+            i += 1
+    return found
+
+
+def _keywords(tokens: list[str]) -> Counter:
+    return Counter(t for t in tokens if t not in STOPWORDS and len(t) > 2 and not t.isdigit())
+
+
+@dataclass
+class TextProfile:
+    """Tokenized view of a document, reusable across many comparisons."""
+
+    skills: Counter = field(default_factory=Counter)
+    keywords: Counter = field(default_factory=Counter)
+    norm: float = 0.0
+
+    @classmethod
+    def from_text(cls, text: str) -> "TextProfile":
+        raw = _raw_tokens(text)
+        keywords = _keywords([t.lower() for t in raw])
+        return cls(
+            skills=extract_skills(raw),
+            keywords=keywords,
+            norm=math.sqrt(sum(v * v for v in keywords.values())),
+        )
+
+
+def resume_text(content) -> str:
+    """Flatten a resume ``content`` dict into plain text (keys are dropped)."""
+    if isinstance(content, dict):
+        return "\n".join(resume_text(v) for v in content.values())
+    if isinstance(content, (list, tuple)):
+        return "\n".join(resume_text(v) for v in content)
+    return str(content) if content not in (None, "") else ""
+
+
+def profile_resume(content: dict) -> TextProfile:
+    return TextProfile.from_text(resume_text(content))
+
+
+def _skill_weight(tf: int) -> float:
+    # BM25 term-frequency saturation: repeated mentions matter, with diminishing returns.
+    return tf * (_BM25_K1 + 1) / (tf + _BM25_K1)
+
+
+def _cosine(a: TextProfile, b: TextProfile) -> float:
+    if not a.norm or not b.norm:
+        return 0.0
+    small, large = (a.keywords, b.keywords) if len(a.keywords) < len(b.keywords) else (b.keywords, a.keywords)
+    dot = sum(v * large.get(k, 0) for k, v in small.items())
+    return dot / (a.norm * b.norm)
+
+
+def match(jd: TextProfile, resume: TextProfile) -> dict:
+    """Score a resume profile against a JD profile.
+
+    Returns ``match_score`` (0-100), ``matched_skills`` and ``missing_skills``,
+    both ordered by how prominent the skill is in the job description.
+    """
+    ranked = sorted(jd.skills.items(), key=lambda kv: (-kv[1], kv[0]))
+    matched = [s for s, _ in ranked if s in resume.skills]
+    missing = [s for s, _ in ranked if s not in resume.skills]
+
+    similarity = _cosine(jd, resume)
+    if ranked:
+        total = sum(_skill_weight(tf) for _, tf in ranked)
+        covered = sum(_skill_weight(jd.skills[s]) for s in matched)
+        score = _SKILL_WEIGHT * covered / total + (1 - _SKILL_WEIGHT) * min(1.0, similarity * 2)
+    else:
+        score = min(1.0, similarity * 2)
+
+    return {
+        "match_score": int(round(score * 100)),
+        "matched_skills": matched,
+        "missing_skills": missing,
+    }
+
+
+def analyze(job_description: str, resume_content: dict) -> dict:
+    return match(TextProfile.from_text(job_description), profile_resume(resume_content))
+
+
+def rank_job_descriptions(resume_content: dict, job_descriptions: list[str]) -> list[dict]:
+    """Score one resume against many JDs, tokenizing the resume once. Best match first."""
+    resume = profile_resume(resume_content)
+    results = [{"index": i, **match(TextProfile.from_text(jd), resume)} for i, jd in enumerate(job_descriptions)]
+    return sorted(results, key=lambda r: -r["match_score"])
+
+
+def rank_resumes(job_description: str, resume_contents: list[dict]) -> list[dict]:
+    """Score many resumes against one JD, tokenizing the JD once. Best match first."""
+    jd = TextProfile.from_text(job_description)
+    results = [{"index": i, **match(jd, profile_resume(c))} for i, c in enumerate(resume_contents)]
+    return sorted(results, key=lambda r: -r["match_score"])
+
+
+def local_suggestions(missing_skills: list[str], limit: int = 3) -> list[dict]:
+    """Template suggestions for the fast path, one per top missing skill."""
+    return [
+        {
+            "title": f"Highlight {skill}",
+            "description": f"The job description asks for {skill}, but your resume doesn't mention it. "
+                           f"If you have this experience, add it to your skills and back it up with a bullet point.",
+        }
+        for skill in missing_skills[:limit]
+    ]
@@ -0,0 +1,85 @@
+"""Propagate in-process cache invalidations to every worker.
+
+Each worker keeps its own caches. ``publish`` evicts locally right away and,
+when SHARED_CACHE_INVALIDATION is on, records the event in MongoDB; a
+background poller in every worker replays events published by the others.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from app.config import get_settings
+from app.database import cache_invalidations_col
+
+settings = get_settings()
+
+WORKER_ID = uuid.uuid4().hex
+_handlers: dict[str, list[Callable[[str], None]]] = {}
+_poller: asyncio.Task | None = None
+
+
+def _new_worker_id():
+    # A worker forked from a preloaded app must not share its parent's id,
+    # or it would skip the invalidations its siblings publish.
+    global WORKER_ID
+    WORKER_ID = uuid.uuid4().hex
+
+
+os.register_at_fork(after_in_child=_new_worker_id)
+
+
+def register(namespace: str, handler: Callable[[str], None]):
+    """Call ``handler(key)`` whenever ``key`` is invalidated in ``namespace``."""
+    _handlers.setdefault(namespace, []).append(handler)
+
+
+def _dispatch(namespace: str, key: str):
+    for handler in _handlers.get(namespace, []):
+        handler(key)
+
+
+async def publish(namespace: str, key: str):
+    _dispatch(namespace, key)
+    if settings.SHARED_CACHE_INVALIDATION:
+        try:
+            await cache_invalidations_col.insert_one({
+                "namespace": namespace,
+                "key": key,
+                "worker": WORKER_ID,
+                "at": datetime.now(timezone.utc),
+            })
+        except Exception as e:
+            print(f"Warning: Could not publish cache invalidation: {e}")
+
+
+async def _poll():
+    interval = settings.CACHE_INVALIDATION_POLL_SECONDS
+    since = datetime.now(timezone.utc)
+    while True:
+        await asyncio.sleep(interval)
+        # Overlap windows slightly to tolerate clock skew between workers; eviction is idempotent.
+        query_from = since - timedelta(seconds=interval)
+        since = datetime.now(timezone.utc)
+        try:
+            async for event in cache_invalidations_col.find({"at": {"$gte": query_from}, "worker": {"$ne": WORKER_ID}}):
+                _dispatch(event["namespace"], event["key"])
+        except Exception as e:
+            print(f"Warning: Cache invalidation poll failed: {e}")
+
+
+def start():
+    global _poller
+    if settings.SHARED_CACHE_INVALIDATION and _poller is None:
+        _poller = asyncio.create_task(_poll())
+
+
+async def stop():
+    global _poller
+    if _poller is not None:
+        _poller.cancel()
+        try:
+            await _poller
+        except asyncio.CancelledError:
+            pass
+        _poller = None
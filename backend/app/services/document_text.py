@@ -0,0 +1,108 @@
+"""Plain-text extraction from uploaded PDF and DOCX files.
+
+Runs in the import process pool, so it imports nothing from the app. PDFs are
+read with pypdf, with its decompression limits lowered to ``max_bytes``; DOCX
+needs only the standard library. Scanned PDFs without a text layer come back
+empty. Encrypted files are rejected.
+"""
+import zipfile
+from xml.etree import ElementTree
+import pypdf
+from pypdf.errors import LimitReachedError, PyPdfError
+
+
+class DocumentError(ValueError):
+    """The upload is not a readable PDF or DOCX file."""
+
+
+class UnsupportedDocument(DocumentError):
+    pass
+
+
+def sniff(head: bytes) -> str | None:
+    """``"pdf"``, ``"docx"`` or None from the first bytes of a file."""
+    if head.lstrip()[:5] == b"%PDF-":
+        return "pdf"
+    if head[:4] == b"PK\x03\x04":
+        return "docx"
+    return None
+
+
+def extract_text(path: str, max_pages: int, max_bytes: int) -> tuple[str, str]:
+    """``(kind, text)`` for the file at ``path``; ``max_bytes`` caps any decompressed part."""
+    with open(path, "rb") as f:
+        head = f.read(1024)
+    kind = sniff(head)
+    if kind is None:
+        raise UnsupportedDocument("Unsupported file type. Upload a PDF or DOCX file.")
+    try:
+        if kind == "pdf":
+            return kind, pdf_text(path, max_pages, max_bytes)
+        return kind, docx_text(path, max_bytes)
+    except DocumentError:
+        raise
+    except (ValueError, LookupError, TypeError, AttributeError, ArithmeticError, RecursionError):
+        # Malformed structure the lenient readers didn't anticipate
+        raise DocumentError(f"Could not read the {kind.upper()} file")
+
+
+# --- DOCX ----------------------------------------------------------------------
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def docx_text(path: str, max_bytes: int) -> str:
+    try:
+        with zipfile.ZipFile(path) as package:
+            info = package.getinfo("word/document.xml")
+            if info.file_size > max_bytes:
+                raise DocumentError("Document is too large to import")
+            root = ElementTree.fromstring(package.read(info))
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+        raise DocumentError("Could not read the Word document")
+
+    lines = []
+    for paragraph in root.iter(f"{_W}p"):
+        parts = []
+        for el in paragraph.iter():
+            if el.tag == f"{_W}t":
+                parts.append(el.text or "")
+            elif el.tag == f"{_W}tab":
+                parts.append("\t")
+            elif el.tag in (f"{_W}br", f"{_W}cr"):
+                parts.append("\n")
+        text = "".join(parts)
+        if text.strip() and paragraph.find(f"{_W}pPr/{_W}numPr") is not None:
+            text = "• " + text  # list paragraph; Word keeps the bullet glyph in numbering.xml
+        lines.append(text)
+    return "\n".join(lines)
+
+
+# --- PDF -------------------------------------------------------------------------
+
+# pypdf limits that bound how much a single stream may inflate to.
+_OUTPUT_LIMITS = (
+    "maximum_declared_stream_length", "array_based_stream_maximum_output_length", "zlib_maximum_output_length",
+    "lzw_maximum_output_length", "run_length_maximum_output_length", "brotli_maximum_output_length",
+    "jbig2_maximum_output_length", "image_maximum_buffer_size",
+)
+
+
+def pdf_text(path: str, max_pages: int, max_bytes: int) -> str:
+    try:
+        with pypdf.apply_configuration(**{name: max_bytes for name in _OUTPUT_LIMITS}):
+            reader = pypdf.PdfReader(path)
+            if reader.is_encrypted:
+                raise DocumentError("Encrypted PDFs cannot be imported")
+            texts, budget = [], max_bytes
+            for page in reader.pages[:max_pages]:
+                contents = page.get_contents()
+                budget -= len(contents.get_data()) if contents is not None else 0
+                if budget < 0:
+                    raise DocumentError("Document is too large to import")
+                texts.append(page.extract_text())
+    except LimitReachedError:
+        raise DocumentError("Document is too large to import")
+    except PyPdfError:
+        raise DocumentError("Could not read the PDF")
+    return "\n".join(texts)
@@ -0,0 +1,221 @@
+"""Background jobs for long-running LLM generations.
+
+Jobs are stored in MongoDB so any worker can run them and any worker can
+answer a poll. Each process runs JOB_WORKERS asyncio consumers that claim the
+oldest due job with an atomic find_one_and_update. A claimed job holds a
+lease; if its worker dies, another consumer picks it up once the lease expires.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.config import get_settings
+from app.database import jobs_col
+from app.services import cache_sync, llm_limiter, llm_service
+from app.utils import metrics
+
+settings = get_settings()
+
+Handler = Callable[[dict], Awaitable[dict]]
+
+_handlers: dict[str, Handler] = {}
+_consumers: list[asyncio.Task] = []
+_wakeup = asyncio.Event()
+
+
+def register(kind: str, handler: Handler):
+    """Run ``handler(job)`` for jobs of ``kind``; its return value becomes the job result."""
+    _handlers[kind] = handler
+
+
+def to_response(job: dict) -> dict:
+    return {
+        "id": str(job["_id"]),
+        "kind": job["kind"],
+        "status": job["status"],
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job.get("created_at", ""),
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at"),
+    }
+
+
+async def enqueue(kind: str, user_id: str, payload: dict, delay: float = 0, dedupe: bool = False) -> dict:
+    """Queue a job to run no sooner than ``delay`` seconds from now.
+
+    With ``dedupe=True`` a job of the same kind still queued for the user is
+    reused and its start pushed back instead, debouncing bursts of triggers.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+    now = datetime.now(timezone.utc)
+    run_at = now + timedelta(seconds=delay)
+    if dedupe:
+        job = await jobs_col.find_one_and_update(
+            {"kind": kind, "user_id": user_id, "status": "queued"},
+            {
+                "$set": {"payload": payload, "run_at": run_at},
+                "$setOnInsert": {"attempts": 0, "created_at": now},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    else:
+        job = {
+            "kind": kind,
+            "user_id": user_id,
+            "payload": payload,
+            "status": "queued",
+            "attempts": 0,
+            "created_at": now,
+            "run_at": run_at,
+        }
+        result = await jobs_col.insert_one(job)
+        job["_id"] = result.inserted_id
+    metrics.incr("jobs_enqueued_total", kind=kind)
+    if not delay:
+        _wakeup.set()
+    return job
+
+
+async def pending(kind: str, user_id: str) -> bool:
+    """Whether a job of ``kind`` is queued or running for the user."""
+    job = await jobs_col.find_one(
+        {"kind": kind, "user_id": user_id, "status": {"$in": ["queued", "running"]}}, projection={"_id": 1}
+    )
+    return job is not None
+
+
+async def get(job_id: str, user_id: str) -> Optional[dict]:
+    return await jobs_col.find_one({"_id": ObjectId(job_id), "user_id": user_id})
+
+
+async def wait(job_id: str, user_id: str, timeout: float) -> Optional[dict]:
+    """Long-poll: return the job once it finishes or ``timeout`` seconds pass."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = await get(job_id, user_id)
+        if job is None or job["status"] in ("done", "failed") or time.monotonic() >= deadline:
+            return job
+        await asyncio.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+
+
+async def _claim() -> Optional[dict]:
+    now = datetime.now(timezone.utc)
+    return await jobs_col.find_one_and_update(
+        {
+            "kind": {"$in": list(_handlers)},
+            "attempts": {"$lt": settings.JOB_MAX_ATTEMPTS},
+            "run_at": {"$not": {"$gt": now}},
+            "$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_until": {"$lt": now}},
+            ],
+        },
+        {
+            "$set": {
+                "status": "running",
+                "started_at": now,
+                "lease_until": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                "worker": cache_sync.WORKER_ID,
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _finish(job: dict, **fields):
+    await jobs_col.update_one(
+        {"_id": job["_id"], "worker": cache_sync.WORKER_ID},
+        {"$set": {**fields, "finished_at": datetime.now(timezone.utc)}, "$unset": {"lease_until": ""}},
+    )
+
+
+async def _reap_abandoned():
+    """Fail jobs whose worker died on the final attempt; nothing else will claim them."""
+    await jobs_col.update_many(
+        {
+            "status": "running",
+            "lease_until": {"$lt": datetime.now(timezone.utc)},
+            "attempts": {"$gte": settings.JOB_MAX_ATTEMPTS},
+        },
+        {
+            "$set": {"status": "failed", "error": "Job was abandoned by its worker", "finished_at": datetime.now(timezone.utc)},
+            "$unset": {"lease_until": ""},
+        },
+    )
+
+
+async def _update_queue_depth():
+    depth = await jobs_col.count_documents({"status": "queued", "run_at": {"$not": {"$gt": datetime.now(timezone.utc)}}})
+    metrics.set_gauge("jobs_queue_depth", depth)
+
+
+async def _run(job: dict):
+    kind = job["kind"]
+    # MongoDB hands datetimes back naive, so compare both sides without tzinfo.
+    waited = job["started_at"].replace(tzinfo=None) - job.get("run_at", job["created_at"]).replace(tzinfo=None)
+    metrics.observe("job_wait_seconds", waited.total_seconds(), kind=kind)
+
+    started = time.perf_counter()
+    try:
+        with llm_limiter.priority("background"):
+            result = await _handlers[kind](job)
+    except Exception as e:
+        metrics.observe("job_run_seconds", time.perf_counter() - started, kind=kind)
+        # ValueError means misconfiguration (e.g. no API key) and won't succeed on retry;
+        # a malformed model reply is the exception, the next sample may well be valid.
+        permanent = isinstance(e, ValueError) and not isinstance(e, llm_service.LLMOutputError)
+        if permanent or job["attempts"] >= settings.JOB_MAX_ATTEMPTS:
+            metrics.incr("jobs_completed_total", kind=kind, status="failed")
+            await _finish(job, status="failed", error=str(e))
+        else:
+            metrics.incr("jobs_retried_total", kind=kind)
+            await jobs_col.update_one(
+                {"_id": job["_id"], "worker": cache_sync.WORKER_ID},
+                {"$set": {"status": "queued", "error": str(e)}, "$unset": {"lease_until": ""}},
+            )
+        return
+
+    metrics.observe("job_run_seconds", time.perf_counter() - started, kind=kind)
+    metrics.incr("jobs_completed_total", kind=kind, status="done")
+    await _finish(job, status="done", result=result, error=None)
+
+
+async def _consume():
+    while True:
+        try:
+            _wakeup.clear()
+            job = await _claim()
+            await _update_queue_depth()
+            if job is None:
+                await _reap_abandoned()
+                try:
+                    await asyncio.wait_for(_wakeup.wait(), settings.JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await _run(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Warning: Job consumer error: {e}")
+            await asyncio.sleep(settings.JOB_POLL_SECONDS)
+
+
+def start():
+    if not _consumers:
+        _consumers.extend(asyncio.create_task(_consume()) for _ in range(settings.JOB_WORKERS))
+
+
+async def stop():
+    """Cancel consumers; jobs they were running are re-claimed after their lease expires."""
+    for task in _consumers:
+        task.cancel()
+    await asyncio.gather(*_consumers, return_exceptions=True)
+    _consumers.clear()
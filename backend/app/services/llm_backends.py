@@ -0,0 +1,188 @@
+"""LLM backends and the per-task routing table.
+
+A backend is an OpenAI-compatible chat completions client plus the limiter
+that guards it. Built in: ``groq``, ``openai`` (any OpenAI-compatible endpoint:
+OpenAI, vLLM, Ollama, ...) and ``fake``, which answers locally for tests and
+benchmarks. Each llm_service task is routed to a backend, model and limits.
+Short rewrites go to the small model with tight ``max_tokens``. Long-form
+writing and whole-document analysis go to the large one. Override any task
+with ``LLM_ROUTES``, e.g. ``{"cover_letter": {"backend": "openai", "model": "gpt-4o-mini"}}``.
+"""
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DEFAULT_CONNECTION_LIMITS, Timeout
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from app.config import get_settings
+from app.services import llm_limiter
+
+settings = get_settings()
+
+# Limits class of whichever HTTP library the installed openai SDK is built on.
+Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+# "small"/"large" resolve to LLM_MODEL_SMALL/LLM_MODEL_LARGE; anything else is a model name.
+DEFAULT_ROUTES: dict[str, dict] = {
+    "enhance_bullet": {"model": "small", "max_tokens": 150},
+    "suggest_skills": {"model": "small", "max_tokens": 200},
+    "portfolio_bio": {"model": "small", "max_tokens": 400},
+    "resume_summary": {"model": "small", "max_tokens": 300},
+    "jd_suggestions": {"model": "small", "max_tokens": 600},
+    "jd_match": {"model": "large", "max_tokens": 1000},
+    "recommendations": {"model": "large", "max_tokens": 1200},
+    "cover_letter": {"model": "large", "max_tokens": 1200},
+    "case_study": {"model": "large", "max_tokens": 2000},
+    "json_repair": {"model": "small", "max_tokens": 2000, "temperature": 0.0},
+    "resume_import": {"model": "large", "max_tokens": 2000, "temperature": 0.0},
+}
+
+
+@dataclass(frozen=True)
+class Route:
+    task: str
+    backend: str
+    model: str
+    temperature: float
+    max_tokens: int
+
+
+def route(task: str) -> Route:
+    spec = {
+        "backend": settings.LLM_DEFAULT_BACKEND,
+        "model": "large",
+        "temperature": 0.7,
+        "max_tokens": 2000,
+        **DEFAULT_ROUTES.get(task, {}),
+        **settings.LLM_ROUTES.get(task, {}),
+    }
+    model = {"small": settings.LLM_MODEL_SMALL, "large": settings.LLM_MODEL_LARGE}.get(spec["model"], spec["model"])
+    return Route(task, spec["backend"], model, float(spec["temperature"]), int(spec["max_tokens"]))
+
+
+class Backend:
+    """A lazily created, process-wide client and the limiter its calls go through."""
+
+    def __init__(self, name: str, factory: Callable[[], Optional[object]],
+                 limiter: Optional[llm_limiter.Limiter], missing_config: str = ""):
+        self.name = name
+        self.limiter = limiter
+        self._factory = factory
+        self._missing_config = missing_config
+        self._client = None
+
+    def open(self):
+        """Create the client; no-op when the backend is not configured."""
+        if self._client is None:
+            self._client = self._factory()
+        return self._client
+
+    @property
+    def client(self):
+        client = self.open()
+        if client is None:
+            raise ValueError(self._missing_config or f"LLM backend '{self.name}' is not configured.")
+        return client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+_backends: dict[str, Backend] = {}
+
+
+def register(backend: Backend):
+    _backends[backend.name] = backend
+
+
+def get(name: str) -> Backend:
+    try:
+        return _backends[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def open_all():
+    for backend in _backends.values():
+        backend.open()
+
+
+async def close_all():
+    for backend in _backends.values():
+        await backend.close()
+
+
+def _openai_compatible(api_key: str, base_url: str) -> AsyncOpenAI:
+    """Pooled client; shared so every call reuses the same keep-alive connections."""
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=0,  # llm_limiter retries, so backoff is shared across requests
+        timeout=Timeout(settings.LLM_READ_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+        http_client=DefaultAsyncHttpxClient(
+            limits=Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+            ),
+        ),
+    )
+
+
+class _FakeCompletions:
+    """Answers ``chat.completions.create`` locally with a deterministic reply."""
+
+    async def create(self, model: str, messages: list[dict], stream: bool = False, **kwargs):
+        prompt = messages[-1]["content"]
+        json_mode = kwargs.get("response_format", {}).get("type") == "json_object"
+        reply = settings.LLM_FAKE_REPLY or ("{}" if json_mode else f"[{model}] {prompt[:80]}")
+        created = int(time.time())
+        if stream:
+            return self._stream(model, reply, created)
+        words = len(reply.split())
+        return ChatCompletion.model_validate({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": words,
+                      "total_tokens": len(prompt.split()) + words},
+        })
+
+    async def _stream(self, model: str, reply: str, created: int):
+        for i, word in enumerate(reply.split(" ")):
+            yield ChatCompletionChunk.model_validate({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+            })
+
+
+class FakeClient:
+    def __init__(self):
+        self.chat = type("Chat", (), {"completions": _FakeCompletions()})()
+
+    async def close(self):
+        pass
+
+
+register(Backend(
+    "groq",
+    lambda: _openai_compatible(settings.GROQ_API_KEY, settings.GROQ_BASE_URL) if settings.GROQ_API_KEY else None,
+    llm_limiter.default_limiter,
+    "GROQ_API_KEY is not set. Please add it to your .env file.",
+))
+register(Backend(
+    "openai",
+    lambda: (_openai_compatible(settings.LLM_OPENAI_API_KEY or "none", settings.LLM_OPENAI_BASE_URL)
+             if settings.LLM_OPENAI_BASE_URL else None),
+    llm_limiter.Limiter(llm_limiter.per_worker(settings.LLM_OPENAI_REQUESTS_PER_MINUTE),
+                        llm_limiter.per_worker(settings.LLM_OPENAI_TOKENS_PER_MINUTE),
+                        llm_limiter.per_worker(settings.LLM_MAX_CONCURRENCY)),
+    "LLM_OPENAI_BASE_URL is not set. Please add it to your .env file.",
+))
+register(Backend("fake", FakeClient, limiter=None))
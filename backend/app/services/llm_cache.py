@@ -0,0 +1,61 @@
+import hashlib
+import json
+from app.config import get_settings
+from app.services import shared_cache
+from app.utils import metrics
+from app.utils.cache import TTLCache
+
+settings = get_settings()
+
+_memory = TTLCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS)
+_shared = shared_cache.store("llm") if settings.LLM_CACHE_SHARED else None
+
+
+def make_key(model: str, system_instruction: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """Content address of a completion request."""
+    payload = json.dumps([model, system_instruction, prompt, temperature, max_tokens], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get(key: str) -> str | None:
+    """Look up a cached completion, memory tier first, then the shared tier."""
+    value = _memory.get(key)
+    if value is not None:
+        metrics.incr("llm_cache_hits_total", tier="memory")
+        return value
+
+    if _shared is not None:
+        try:
+            value = await _shared.get(key)
+        except Exception as e:
+            print(f"Warning: LLM cache lookup failed: {e}")
+            value = None
+        if value is not None:
+            metrics.incr("llm_cache_hits_total", tier="shared")
+            _memory.set(key, value)
+            return value
+
+    metrics.incr("llm_cache_misses_total")
+    return None
+
+
+async def set(key: str, value: str):
+    _memory.set(key, value)
+    if _shared is not None:
+        try:
+            await _shared.set(key, value, settings.LLM_CACHE_TTL_SECONDS)
+        except Exception as e:
+            print(f"Warning: LLM cache write failed: {e}")
+
+
+def clear():
+    _memory.clear()
+
+
+def stats() -> dict:
+    return {
+        "entries": len(_memory),
+        "memory_hits": metrics.get("llm_cache_hits_total", tier="memory"),
+        "shared_hits": metrics.get("llm_cache_hits_total", tier="shared"),
+        "misses": metrics.get("llm_cache_misses_total"),
+    }
@@ -0,0 +1,256 @@
+"""Client-side admission control and retries for upstream LLM calls.
+
+Every completion request passes through its backend's ``Limiter``:
+
+- token buckets sized in requests/min and tokens/min, matching the provider quota;
+- an adaptive concurrency cap (AIMD) that grows with successes and halves on
+  429/5xx/timeouts;
+- a pause for everyone when the provider sends Retry-After;
+- a priority queue, so interactive calls are admitted ahead of batch and
+  background work.
+
+Limits are per process: the configured quotas are split evenly between the
+WEB_CONCURRENCY workers of an instance.
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+import openai
+from app.config import get_settings
+from app.utils import metrics
+
+settings = get_settings()
+
+PRIORITIES = {"interactive": 0, "batch": 1, "background": 2}
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default="interactive")
+
+
+@contextmanager
+def priority(name: str):
+    """Run LLM calls made inside the block (and tasks it spawns) at ``name`` priority."""
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class LLMOverloadedError(Exception):
+    """The provider stayed rate-limited or unavailable after retries."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units per minute up to a minute's worth. 0 means unlimited."""
+
+    def __init__(self, per_minute: int):
+        self.rate = per_minute / 60
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        if not self.rate:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)  # oversized requests wait for a full bucket, not forever
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        """Consume ``amount``; a negative amount refunds. The level may go below zero (debt)."""
+        if self.rate:
+            self._refill()
+            self.level = min(self.capacity, self.level - amount)
+
+
+class Permit:
+    __slots__ = ("limiter", "tokens", "priority", "released")
+
+    def __init__(self, limiter: "Limiter", tokens: int, priority: str):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.priority = priority
+        self.released = False
+
+
+class Limiter:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_concurrency: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, tokens: int, priority: str, timeout: Optional[float] = None) -> Permit:
+        future = asyncio.get_running_loop().create_future()
+        permit = Permit(self, tokens, priority)
+        heapq.heappush(self._waiters, (PRIORITIES[priority], next(self._seq), permit, future))
+        metrics.set_gauge("llm_limiter_waiting", len(self._waiters))
+        self._pump()
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                self.release(permit)  # granted just as we gave up
+            else:
+                future.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                metrics.incr("llm_limiter_timeouts_total", priority=priority)
+                raise LLMOverloadedError("LLM request queue is full, try again shortly", retry_after=timeout)
+            raise
+        metrics.observe("llm_limiter_wait_seconds", time.monotonic() - started, priority=priority)
+        return permit
+
+    def release(self, permit: Permit, outcome: str = "cancelled", used_tokens: Optional[int] = None,
+                retry_after: Optional[float] = None):
+        """Return a permit. ``outcome`` is "ok", "overloaded" or anything else for neutral."""
+        if permit.released:
+            return
+        permit.released = True
+        self.in_flight -= 1
+        if used_tokens is not None:
+            self.tokens.take(used_tokens - permit.tokens)
+        if outcome == "ok":
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        elif outcome == "overloaded":
+            self.limit = max(1.0, self.limit / 2)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        metrics.set_gauge("llm_concurrency_limit", int(self.limit))
+        self._pump()
+
+    def _pump(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters:
+            _, _, permit, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_flight >= int(self.limit):
+                break  # release() pumps again
+            delay = max(
+                self.paused_until - time.monotonic(),
+                self.requests.wait_time(1),
+                self.tokens.wait_time(permit.tokens),
+            )
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._pump)
+                break
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(permit.tokens)
+            self.in_flight += 1
+            future.set_result(None)
+        metrics.set_gauge("llm_limiter_waiting", len(self._waiters))
+
+
+def per_worker(quota: int) -> int:
+    """This process's share of an instance-wide quota; 0 (unlimited) stays 0."""
+    return max(1, quota // max(1, settings.WEB_CONCURRENCY)) if quota else 0
+
+
+# Guards the Groq backend; other backends bring their own.
+default_limiter = Limiter(
+    per_worker(settings.LLM_REQUESTS_PER_MINUTE),
+    per_worker(settings.LLM_TOKENS_PER_MINUTE),
+    per_worker(settings.LLM_MAX_CONCURRENCY),
+)
+
+
+def _retry_after(error: openai.APIStatusError) -> Optional[float]:
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def _classify(error: Exception) -> tuple[Optional[str], Optional[float]]:
+    """``(reason, retry_after)`` for retryable errors, ``(None, None)`` otherwise."""
+    if isinstance(error, openai.RateLimitError):
+        return "rate_limited", _retry_after(error)
+    if isinstance(error, openai.APIStatusError) and error.status_code >= 500:
+        return "server_error", _retry_after(error)
+    if isinstance(error, openai.APITimeoutError):
+        return "timeout", None
+    if isinstance(error, openai.APIConnectionError):
+        return "connection", None
+    return None, None
+
+
+def _backoff(attempt: int, retry_after: Optional[float]) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    jitter = random.uniform(0, min(settings.LLM_RETRY_MAX_SECONDS, settings.LLM_RETRY_BASE_SECONDS * 2 ** attempt))
+    return max(retry_after or 0.0, jitter)
+
+
+async def admit(request: Callable[[], Awaitable[Any]], tokens: int,
+                limiter: Optional[Limiter] = default_limiter) -> tuple[Any, Optional[Permit]]:
+    """Admit and send ``request()``, retrying overloads; the caller must ``finish`` the permit.
+
+    Use this for streams, which hold their slot until the last chunk. With
+    ``limiter=None`` the request is sent straight away, once.
+    """
+    if limiter is None:
+        return await request(), None
+    priority_name = _priority.get()
+    timeout = None if priority_name == "background" else settings.LLM_QUEUE_TIMEOUT_SECONDS
+    attempt = 0
+    while True:
+        permit = await limiter.acquire(tokens, priority_name, timeout)
+        try:
+            return await request(), permit
+        except Exception as e:
+            reason, retry_after = _classify(e)
+            if reason is None:
+                limiter.release(permit)
+                raise
+            limiter.release(permit, "overloaded", retry_after=retry_after)
+            if attempt >= settings.LLM_MAX_RETRIES or (retry_after or 0) > settings.LLM_RETRY_MAX_SECONDS:
+                metrics.incr("llm_overloaded_total", reason=reason)
+                raise LLMOverloadedError("The AI provider is busy, try again shortly", retry_after=retry_after) from e
+            metrics.incr("llm_retries_total", reason=reason)
+            await asyncio.sleep(_backoff(attempt, retry_after))
+            attempt += 1
+        except BaseException:
+            limiter.release(permit)
+            raise
+
+
+def finish(permit: Optional[Permit], used_tokens: Optional[int] = None):
+    if permit is not None:
+        permit.limiter.release(permit, "ok", used_tokens=used_tokens)
+
+
+async def run(request: Callable[[], Awaitable[Any]], tokens: int,
+              limiter: Optional[Limiter] = default_limiter) -> Any:
+    """Admit, send and settle a non-streaming request, reconciling reported token usage."""
+    response, permit = await admit(request, tokens, limiter)
+    usage = getattr(response, "usage", None)
+    finish(permit, getattr(usage, "total_tokens", None))
+    return response
@@ -1,46 +1,251 @@
+import asyncio
 import json
-from openai import OpenAI
+import time
+from typing import AsyncIterator, TypeVar
+from pydantic import BaseModel, ValidationError
 from app.config import get_settings
+from app.services import llm_backends, llm_cache, llm_limiter, prompt_format
+from app.utils import metrics
+from app.utils.single_flight import SingleFlight
+from app.schemas.case_study import GeneratedCaseStudy
+from app.schemas.jd_analyzer import JDAnalyzeResponse, JDSuggestions
+from app.schemas.portfolio import PortfolioBio
+from app.schemas.recommendations import RecommendationsResponse
+from app.schemas.resume import ImportedResume, SkillSuggestions
 
 settings = get_settings()
 
+# Identical completions already in flight are awaited rather than re-sent.
+_single_flight = SingleFlight()
 
-def _get_client():
-    """Return an OpenAI-compatible client pointed at Groq API."""
-    if not settings.GROQ_API_KEY:
-        raise ValueError("GROQ_API_KEY is not set. Please add it to your .env file.")
-    return OpenAI(
-        api_key=settings.GROQ_API_KEY,
-        base_url="https://api.groq.com/openai/v1",
-    )
+Schema = TypeVar("Schema", bound=BaseModel)
+
+
+class LLMOutputError(ValueError):
+    """The model's reply did not match the expected schema, even after a repair attempt."""
+
+
+def open_client():
+    """Create the shared backend clients. Unconfigured backends are skipped."""
+    llm_backends.open_all()
 
 
-def generate_text(prompt: str, system_instruction: str = "") -> str:
-    """Generic text generation via Groq API."""
-    client = _get_client()
+async def close_client():
+    await llm_backends.close_all()
+
+
+def _resolve(task: str) -> tuple[llm_backends.Route, llm_backends.Backend]:
+    """Route for ``task`` and its backend; raises ValueError if that backend is not configured."""
+    route = llm_backends.route(task)
+    backend = llm_backends.get(route.backend)
+    backend.client  # fail fast on missing configuration
+    return route, backend
+
+
+def _messages(prompt: str, system_instruction: str) -> list[dict]:
     messages = []
     if system_instruction:
         messages.append({"role": "system", "content": system_instruction})
     messages.append({"role": "user", "content": prompt})
+    return messages
+
 
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=messages,
-        temperature=0.7,
-        max_tokens=2000,
+def _reserve_tokens(messages: list[dict], max_tokens: int) -> int:
+    prompt_tokens = sum(prompt_format.estimate_tokens(m["content"]) for m in messages)
+    return prompt_tokens + min(max_tokens, settings.LLM_EXPECTED_COMPLETION_TOKENS)
+
+
+def _json_mode_kwargs(json_mode: bool) -> dict:
+    return {"response_format": {"type": "json_object"}} if json_mode and settings.LLM_JSON_MODE else {}
+
+
+async def generate_text(prompt: str, system_instruction: str = "", cache: bool = False, task: str = "default",
+                        json_mode: bool = False) -> str:
+    """Generic text generation on the backend and model routed for ``task``.
+
+    With ``cache=True`` identical requests are answered from the LLM response cache.
+    Concurrent identical requests always share a single upstream call. ``json_mode``
+    asks the provider to constrain the reply to a JSON object.
+    """
+    route = llm_backends.route(task)
+    key = llm_cache.make_key(
+        f"{route.backend}/{route.model}" + ("+json" if json_mode else ""),
+        system_instruction, prompt, route.temperature, route.max_tokens,
     )
-    return response.choices[0].message.content or ""
+    use_cache = cache and settings.LLM_CACHE_ENABLED
+    if use_cache:
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return cached
+
+    route, backend = _resolve(task)
+    client = backend.client
+    messages = _messages(prompt, system_instruction)
+
+    async def call() -> str:
+        metrics.incr("llm_upstream_calls_total")
+        started = time.perf_counter()
+        response = await llm_limiter.run(
+            lambda: client.chat.completions.create(
+                model=route.model,
+                messages=messages,
+                temperature=route.temperature,
+                max_tokens=route.max_tokens,
+                **_json_mode_kwargs(json_mode),
+            ),
+            _reserve_tokens(messages, route.max_tokens),
+            backend.limiter,
+        )
+        metrics.observe("llm_task_latency_seconds", time.perf_counter() - started, task=task, model=route.model)
+        metrics.add_timing("llm", time.perf_counter() - started)
+        if response.usage is not None:
+            metrics.incr("llm_task_tokens_total", response.usage.prompt_tokens, task=task, model=route.model, kind="prompt")
+            metrics.incr("llm_task_tokens_total", response.usage.completion_tokens, task=task, model=route.model, kind="completion")
+        text = response.choices[0].message.content or ""
+        if use_cache and text:
+            await llm_cache.set(key, text)
+        return text
+
+    text, shared = await _single_flight.do(key, call)
+    if shared:
+        metrics.incr("llm_singleflight_deduplicated_total")
+    return text
+
+
+async def stream_text(prompt: str, system_instruction: str = "", task: str = "default",
+                      json_mode: bool = False) -> AsyncIterator[str]:
+    """Start a streaming completion and return an iterator over its text deltas.
+
+    The request is sent before this returns, so configuration and connection
+    errors surface to the caller instead of mid-stream.
+    """
+    route, backend = _resolve(task)
+    client = backend.client
+    messages = _messages(prompt, system_instruction)
+
+    started = time.perf_counter()
+    stream, permit = await llm_limiter.admit(
+        lambda: client.chat.completions.create(
+            model=route.model,
+            messages=messages,
+            temperature=route.temperature,
+            max_tokens=route.max_tokens,
+            stream=True,
+            **_json_mode_kwargs(json_mode),
+        ),
+        _reserve_tokens(messages, route.max_tokens),
+        backend.limiter,
+    )
+    return _iter_deltas(stream, started, permit, route)
 
 
-def generate_resume_summary(job_title: str, experience_summary: str) -> str:
-    """Generate a professional resume summary."""
+async def _iter_deltas(stream, started: float, permit: llm_limiter.Permit | None,
+                       route: llm_backends.Route) -> AsyncIterator[str]:
+    """Yield text deltas; the limiter slot is held until the stream ends or is abandoned."""
+    first = True
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first:
+                metrics.observe("llm_time_to_first_token_seconds", time.perf_counter() - started,
+                                task=route.task, model=route.model)
+                first = False
+            yield delta
+        metrics.observe("llm_task_latency_seconds", time.perf_counter() - started, task=route.task, model=route.model)
+    finally:
+        llm_limiter.finish(permit)
+
+
+def _parse_json(raw: str, schema: type[Schema]) -> Schema:
+    """Validate a reply against ``schema``, tolerating a Markdown code fence around it."""
+    cleaned = raw.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("\n", 1)[-1].rsplit("```", 1)[0]
+    return schema.model_validate_json(cleaned)
+
+
+async def _repair_json(raw: str, schema: type[Schema], error: Exception) -> Schema:
+    """One cheap pass on the repair route to turn a malformed reply into valid JSON."""
+    system = (
+        "You fix malformed JSON. Return ONLY a JSON object that matches the given JSON Schema, "
+        "keeping the original content. Do not add commentary."
+    )
+    prompt = f"""JSON Schema:
+{json.dumps(schema.model_json_schema(), separators=(",", ":"))}
+
+Validation error:
+{str(error)[:500]}
+
+Text to fix:
+{raw}"""
+    return _parse_json(await generate_text(prompt, system, task="json_repair", json_mode=True), schema)
+
+
+async def parse_json(raw: str, schema: type[Schema], task: str) -> Schema:
+    """Validate ``raw`` against ``schema``, with at most one repair call; raises LLMOutputError."""
+    try:
+        result = _parse_json(raw, schema)
+        metrics.incr("llm_json_results_total", task=task, outcome="ok")
+        return result
+    except ValidationError as e:
+        metrics.incr("llm_json_parse_failures_total", task=task)
+        first_error = e
+    try:
+        result = await _repair_json(raw, schema, first_error)
+        metrics.incr("llm_json_results_total", task=task, outcome="repaired")
+        return result
+    except ValidationError:
+        metrics.incr("llm_json_results_total", task=task, outcome="failed")
+        raise LLMOutputError("Could not understand the AI response. Please try again.")
+
+
+async def generate_json(prompt: str, system_instruction: str, schema: type[Schema], task: str,
+                        cache: bool = False) -> Schema:
+    """Structured generation: JSON mode, schema validation, one repair retry.
+
+    Only validated results are cached, so a malformed reply is never replayed.
+    """
+    route = llm_backends.route(task)
+    key = llm_cache.make_key(
+        f"{route.backend}/{route.model}+{schema.__name__}", system_instruction, prompt,
+        route.temperature, route.max_tokens,
+    )
+    use_cache = cache and settings.LLM_CACHE_ENABLED
+    if use_cache:
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return schema.model_validate_json(cached)
+
+    raw = await generate_text(prompt, system_instruction, task=task, json_mode=True)
+    result = await parse_json(raw, schema, task)
+    if use_cache:
+        await llm_cache.set(key, result.model_dump_json())
+    return result
+
+
+def _resume_summary_prompt(job_title: str, experience_summary: str) -> tuple[str, str]:
     system = "You are an expert resume writer. Write a concise, impactful professional summary (3-4 sentences) for a resume. Use strong action words and quantifiable achievements where possible. Do not use first person pronouns."
     prompt = f"Job Title: {job_title}\nExperience Overview: {experience_summary}\n\nWrite the professional summary:"
-    return generate_text(prompt, system)
+    return system, prompt
 
 
-def generate_case_study(inputs: dict) -> dict:
-    """Generate a full case study from user inputs."""
+async def generate_resume_summary(job_title: str, experience_summary: str) -> str:
+    """Generate a professional resume summary."""
+    system, prompt = _resume_summary_prompt(job_title, experience_summary)
+    return await generate_text(prompt, system, cache=True, task="resume_summary")
+
+
+async def stream_resume_summary(job_title: str, experience_summary: str) -> AsyncIterator[str]:
+    """Streaming variant of generate_resume_summary."""
+    system, prompt = _resume_summary_prompt(job_title, experience_summary)
+    return await stream_text(prompt, system, task="resume_summary")
+
+
+def _case_study_prompt(inputs: dict) -> tuple[str, str]:
     system = "You are a professional technical writer. Generate a detailed case study from the following project details. Return valid JSON with keys: executive_summary, challenge, solution, results."
     prompt = f"""Project Name: {inputs.get('project_name', '')}
 Role: {inputs.get('role', '')}
@@ -50,19 +255,39 @@ Solution: {inputs.get('solution', '')}
 Results: {inputs.get('results', '')}
 
 Generate the case study as JSON:"""
+    return system, prompt
+
+
+async def generate_case_study(inputs: dict) -> dict:
+    """Generate a full case study from user inputs."""
+    system, prompt = _case_study_prompt(inputs)
+    raw = await generate_text(prompt, system, task="case_study", json_mode=True)
+    return await parse_case_study(raw)
+
 
-    raw = generate_text(prompt, system)
+async def stream_case_study(inputs: dict) -> AsyncIterator[str]:
+    """Streaming variant of generate_case_study; feed the joined text to parse_case_study."""
+    system, prompt = _case_study_prompt(inputs)
+    return await stream_text(prompt, system, task="case_study", json_mode=True)
+
+
+async def parse_case_study(raw: str) -> dict:
+    """Validated case study sections, or the raw text if the reply can't be repaired."""
     try:
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("\n", 1)[1]
-            cleaned = cleaned.rsplit("```", 1)[0]
-        return json.loads(cleaned)
-    except (json.JSONDecodeError, IndexError):
+        return (await parse_json(raw, GeneratedCaseStudy, "case_study")).model_dump()
+    except LLMOutputError:
         return {"raw_text": raw}
 
 
-def analyze_jd_match(job_description: str, resume_content: dict) -> dict:
+def _resume_payload(prompt: str, resume_content: dict) -> str:
+    return prompt_format.record_savings(prompt, resume_content, prompt_format.render_resume(resume_content))
+
+
+def _job_description(text: str) -> str:
+    return prompt_format.truncate(text.strip(), settings.PROMPT_JD_TOKEN_BUDGET)
+
+
+async def analyze_jd_match(job_description: str, resume_content: dict) -> dict:
     """Analyze how well a resume matches a job description."""
     system = """You are an ATS (Applicant Tracking System) expert. Analyze the match between a job description and a resume.
 Return valid JSON with:
@@ -72,30 +297,44 @@ Return valid JSON with:
 - suggestions: list of objects with 'title' and 'description' keys for improvement tips"""
 
     prompt = f"""Job Description:
-{job_description}
+{_job_description(job_description)}
 
 Resume Content:
-{json.dumps(resume_content, indent=2)}
+{_resume_payload("jd_match", resume_content)}
 
 Analyze and return JSON:"""
 
-    raw = generate_text(prompt, system)
+    result = await generate_json(prompt, system, JDAnalyzeResponse, task="jd_match")
+    return result.model_dump()
+
+
+async def suggest_jd_improvements(
+    job_description: str, resume_content: dict, matched_skills: list, missing_skills: list
+) -> list:
+    """Improvement tips for a resume whose skill match was already scored locally."""
+    system = """You are an ATS (Applicant Tracking System) expert. The skill match between a job description and a resume has already been computed.
+Give 3-5 concrete suggestions to improve the resume for this job.
+Return valid JSON: an object with a 'suggestions' key holding a list of objects with 'title' and 'description' keys. Return ONLY the JSON."""
+
+    prompt = f"""Job Description:
+{_job_description(job_description)}
+
+Resume Content:
+{_resume_payload("jd_suggestions", resume_content)}
+
+Matched Skills: {", ".join(matched_skills)}
+Missing Skills: {", ".join(missing_skills)}
+
+Suggestions as JSON:"""
+
     try:
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("\n", 1)[1]
-            cleaned = cleaned.rsplit("```", 1)[0]
-        return json.loads(cleaned)
-    except (json.JSONDecodeError, IndexError):
-        return {
-            "match_score": 0,
-            "matched_skills": [],
-            "missing_skills": [],
-            "suggestions": [{"title": "Error", "description": "Could not parse AI response."}]
-        }
-
-
-def get_recommendations(resumes: list, portfolios: list) -> dict:
+        result = await generate_json(prompt, system, JDSuggestions, task="jd_suggestions", cache=True)
+    except LLMOutputError:
+        return []  # tips are an extra on top of the local score; don't fail the analysis
+    return [suggestion.model_dump() for suggestion in result.suggestions]
+
+
+async def get_recommendations(resumes: list, portfolios: list) -> dict:
     """Generate career recommendations based on user's assets."""
     system = """You are an AI career coach. Based on the user's resumes and portfolios, provide actionable career improvement recommendations.
 Return valid JSON with:
@@ -103,27 +342,23 @@ Return valid JSON with:
 - action_items: list of objects with 'title', 'description', and 'priority' (high/medium/low) keys
 - interview_probability_boost: string like '+12%'"""
 
-    prompt = f"""User's Resumes: {json.dumps(resumes, indent=2)}
-User's Portfolios: {json.dumps(portfolios, indent=2)}
+    rendered = "\n\n".join(
+        [f"## Resume: {r['title']}\n{prompt_format.render_resume(r.get('content', {}))}" for r in resumes]
+        + [prompt_format.render_portfolio(p["title"], p.get("config", {})) for p in portfolios]
+    )
+    prompt_format.record_savings("recommendations", {"resumes": resumes, "portfolios": portfolios}, rendered)
+    prompt = f"""User's Resumes and Portfolios:
+{rendered or "(none yet)"}
 
 Generate recommendations as JSON:"""
 
-    raw = generate_text(prompt, system)
-    try:
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("\n", 1)[1]
-            cleaned = cleaned.rsplit("```", 1)[0]
-        return json.loads(cleaned)
-    except (json.JSONDecodeError, IndexError):
-        return {
-            "competitiveness_score": 0,
-            "action_items": [],
-            "interview_probability_boost": "+0%"
-        }
-
-
-def enhance_bullet(bullet: str, job_title: str = "", company: str = "") -> str:
+    # Queued refreshes already run at background priority (see jobs._run); an inline
+    # recompute has a user waiting, so it keeps the caller's priority and queue timeout.
+    result = await generate_json(prompt, system, RecommendationsResponse, task="recommendations")
+    return result.model_dump()
+
+
+async def enhance_bullet(bullet: str, job_title: str = "", company: str = "") -> str:
     """Rewrite a resume bullet point to be stronger and more impactful."""
     system = (
         "You are an expert resume writer. Rewrite the given resume bullet point to be more impactful. "
@@ -137,36 +372,70 @@ def enhance_bullet(bullet: str, job_title: str = "", company: str = "") -> str:
     if company:
         context += f"Company: {company}\n"
     prompt = f"{context}Original bullet point: {bullet}\n\nRewrite this bullet point:"
-    return generate_text(prompt, system).strip().strip('"').strip("'")
+    return (await generate_text(prompt, system, cache=True, task="enhance_bullet")).strip().strip('"').strip("'")
+
+
+async def enhance_bullets(items: list[dict], concurrency: int | None = None) -> list[dict]:
+    """Enhance many bullets concurrently, at most ``concurrency`` in flight.
+
+    Each item has ``bullet`` and optional ``job_title``/``company``. Results keep
+    input order; a failed item gets ``error`` instead of aborting the batch.
+    """
+    _resolve("enhance_bullet")  # fail fast on missing configuration
+    semaphore = asyncio.Semaphore(concurrency or settings.LLM_BATCH_CONCURRENCY)
+
+    async def enhance(item: dict) -> dict:
+        async with semaphore:
+            try:
+                enhanced = await enhance_bullet(item["bullet"], item.get("job_title", ""), item.get("company", ""))
+                return {**item, "enhanced": enhanced, "error": None}
+            except Exception as e:
+                return {**item, "enhanced": None, "error": str(e)}
 
+    with llm_limiter.priority("batch"):
+        return await asyncio.gather(*(enhance(item) for item in items))
 
-def suggest_skills(job_title: str, current_skills: list, experience_summary: str = "") -> list:
+
+async def suggest_skills(job_title: str, current_skills: list, experience_summary: str = "") -> list:
     """Suggest relevant skills the user is missing based on their profile."""
     system = (
         "You are a career coach and ATS expert. Based on the job title and current skills, "
         "suggest 8-12 additional relevant skills (technical and soft) that the candidate should add "
-        "to strengthen their resume. Return valid JSON: a flat array of skill strings. "
-        "Do NOT include skills already listed. Return ONLY the JSON array."
+        "to strengthen their resume. Return valid JSON: an object with a 'skills' key holding a flat array "
+        "of skill strings. Do NOT include skills already listed. Return ONLY the JSON."
     )
     prompt = f"""Job Title: {job_title}
 Current Skills: {json.dumps(current_skills)}
 Experience: {experience_summary}
 
-Suggest missing skills as a JSON array:"""
+Suggest missing skills as JSON:"""
 
-    raw = generate_text(prompt, system)
-    try:
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("\n", 1)[1]
-            cleaned = cleaned.rsplit("```", 1)[0]
-        result = json.loads(cleaned)
-        return result if isinstance(result, list) else []
-    except (json.JSONDecodeError, IndexError):
-        return []
+    result = await generate_json(prompt, system, SkillSuggestions, task="suggest_skills", cache=True)
+    return result.skills
+
+
+async def clean_up_imported_resume(text: str, draft: dict) -> dict:
+    """Fix the heuristic split of an uploaded resume, using its extracted text."""
+    system = (
+        "You are an expert resume parser. You are given the plain text extracted from a resume file and a draft "
+        "JSON produced by simple rules, which may put lines in the wrong fields or miss entries. Return corrected "
+        "JSON with keys: firstName, lastName, title, email, phone, location, summary, experience (array of objects "
+        "with title, company, location, dates, bullets), education (array of objects with degree, school, year), "
+        "skills (array of strings). Copy wording from the text; do not invent or embellish anything. "
+        "Use empty strings for missing values. Return ONLY the JSON."
+    )
+    prompt = f"""Resume text:
+{prompt_format.truncate(text, settings.PROMPT_IMPORT_TOKEN_BUDGET)}
+
+Draft: {prompt_format.compact_json(draft)}
+
+Corrected resume as JSON:"""
 
+    result = await generate_json(prompt, system, ImportedResume, task="resume_import")
+    return result.model_dump()
 
-def generate_portfolio_bio(name: str, title: str, skills: list, experience: str = "") -> dict:
+
+async def generate_portfolio_bio(name: str, title: str, skills: list, experience: str = "") -> dict:
     """Generate a portfolio hero tagline and about section."""
     system = (
         "You are a creative copywriter specializing in personal branding. "
@@ -181,19 +450,11 @@ Experience: {experience}
 
 Generate tagline and bio as JSON:"""
 
-    raw = generate_text(prompt, system)
-    try:
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("\n", 1)[1]
-            cleaned = cleaned.rsplit("```", 1)[0]
-        return json.loads(cleaned)
-    except (json.JSONDecodeError, IndexError):
-        return {"tagline": "", "bio": ""}
+    result = await generate_json(prompt, system, PortfolioBio, task="portfolio_bio", cache=True)
+    return result.model_dump()
 
 
-def generate_cover_letter(resume_content: dict, job_description: str, company_name: str = "") -> str:
-    """Generate a tailored cover letter from resume + JD."""
+def _cover_letter_prompt(resume_content: dict, job_description: str, company_name: str) -> tuple[str, str]:
     system = (
         "You are an expert career counselor. Write a professional, tailored cover letter (3-4 paragraphs) "
         "that highlights the candidate's relevant experience and skills from their resume, matched to the "
@@ -202,13 +463,24 @@ def generate_cover_letter(resume_content: dict, job_description: str, company_na
         "Return ONLY the cover letter text."
     )
     prompt = f"""Resume:
-{json.dumps(resume_content, indent=2)}
+{_resume_payload("cover_letter", resume_content)}
 
 Job Description:
-{job_description}
+{_job_description(job_description)}
 
 Company: {company_name or 'the company'}
 
 Write the cover letter:"""
+    return system, prompt
+
+
+async def generate_cover_letter(resume_content: dict, job_description: str, company_name: str = "") -> str:
+    """Generate a tailored cover letter from resume + JD."""
+    system, prompt = _cover_letter_prompt(resume_content, job_description, company_name)
+    return await generate_text(prompt, system, task="cover_letter")
+
 
-    return generate_text(prompt, system)
+async def stream_cover_letter(resume_content: dict, job_description: str, company_name: str = "") -> AsyncIterator[str]:
+    """Streaming variant of generate_cover_letter."""
+    system, prompt = _cover_letter_prompt(resume_content, job_description, company_name)
+    return await stream_text(prompt, system, task="cover_letter")
@@ -0,0 +1,113 @@
+"""Server-side rendering of published portfolios.
+
+Mirrors the "full preview" page built by the frontend's PortfolioBuilder so
+public visitors get the same page without running the builder.
+"""
+import hashlib
+import json
+import re
+from html import escape
+
+_HEX_COLOR = re.compile(r"^#[0-9a-fA-F]{3,8}$")
+_FONT_NAME = re.compile(r"^[A-Za-z0-9 ]{1,40}$")
+
+
+def public_data(doc: dict) -> dict:
+    """The subset of a portfolio that is safe to expose publicly."""
+    config = doc.get("config", {}) or {}
+    return {
+        "title": doc.get("title", ""),
+        "subdomain": doc.get("subdomain"),
+        "headline": config.get("headline", ""),
+        "subheadline": config.get("subheadline", ""),
+        "projects": [
+            {"name": p.get("name", ""), "tech": p.get("tech", "")}
+            for p in config.get("projects", []) or []
+            if isinstance(p, dict) and p.get("selected", True)
+        ],
+        "accentColor": config.get("accentColor", "#6366f1"),
+        "fontFamily": config.get("fontFamily", "Inter"),
+        "darkMode": bool(config.get("darkMode", True)),
+        "updated_at": doc.get("updated_at"),
+    }
+
+
+def render_html(data: dict) -> str:
+    accent = data["accentColor"] if _HEX_COLOR.match(str(data["accentColor"])) else "#6366f1"
+    font = data["fontFamily"] if _FONT_NAME.match(str(data["fontFamily"])) else "Inter"
+    dark = data["darkMode"]
+    bg, text = ("#0f172a", "#ffffff") if dark else ("#ffffff", "#0f172a")
+    sub_text = "#94a3b8" if dark else "#64748b"
+    card_bg = "rgba(30,41,59,0.5)" if dark else "#ffffff"
+    card_border = "#334155" if dark else "#e2e8f0"
+    section_bg = "#1e293b" if dark else "#f1f5f9"
+    thumb_bg = "#0f172a" if dark else "#f1f5f9"
+    hover_border = "#94a3b8" if dark else "#1e293b"
+    title = escape(data["title"] or "Portfolio")
+
+    projects = ""
+    if data["projects"]:
+        cards = "".join(
+            f'<div class="project-card"><div class="thumb"><div class="gradient"></div></div>'
+            f'<h3>{escape(p["name"] or "Project Name")}</h3><p>{escape(p["tech"] or "Technologies")}</p></div>'
+            for p in data["projects"]
+        )
+        projects = (
+            f'<div class="projects-section" id="work"><div class="section-title">'
+            f'<svg viewBox="0 0 24 24" fill="none" stroke="{accent}" stroke-width="2" stroke-linecap="round" '
+            f'stroke-linejoin="round"><path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"/>'
+            f'<polyline points="22 4 12 14.01 9 11.01"/></svg>Featured Work</div>'
+            f'<div class="projects-grid">{cards}</div></div>'
+        )
+
+    return f"""<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1"><title>{title}</title>
+<link href="https://fonts.googleapis.com/css2?family={font.replace(' ', '+')}:wght@400;500;600;700;800;900&display=swap" rel="stylesheet">
+<style>
+* {{ margin: 0; padding: 0; box-sizing: border-box; }}
+body {{ font-family: '{font}', sans-serif; background: {bg}; color: {text}; -webkit-font-smoothing: antialiased; }}
+nav {{ padding: 2rem 3rem; display: flex; justify-content: space-between; align-items: center; font-size: 0.875rem; font-weight: 500; }}
+nav .logo {{ font-weight: 800; font-size: 1.35rem; letter-spacing: -0.06em; }}
+nav .links {{ display: flex; gap: 2rem; color: {sub_text}; }}
+nav .links a {{ color: inherit; text-decoration: none; opacity: 0.7; }}
+.hero {{ padding: 6rem 4rem 8rem; max-width: 720px; }}
+.hero h1 {{ font-size: clamp(2.5rem, 5vw, 4rem); font-weight: 800; line-height: 1.08; letter-spacing: -0.03em; margin-bottom: 1.5rem; }}
+.hero p {{ font-size: 1.25rem; color: {sub_text}; line-height: 1.65; margin-bottom: 2.5rem; opacity: 0.6; }}
+.hero .cta {{ display: inline-block; background: {accent}; color: white; padding: 0.85rem 2rem; border-radius: 9999px; font-weight: 700; font-size: 0.875rem; text-decoration: none; }}
+.projects-section {{ padding: 3.5rem 3rem 4rem; background: {section_bg}; border-radius: 3rem 3rem 0 0; }}
+.projects-section .section-title {{ font-size: 1.5rem; font-weight: 700; margin-bottom: 2rem; display: flex; align-items: center; gap: 0.5rem; }}
+.projects-section .section-title svg {{ width: 24px; height: 24px; }}
+.projects-grid {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 1.5rem; }}
+.project-card {{ background: {card_bg}; border: 1px solid {card_border}; border-radius: 1.5rem; padding: 1.5rem; height: 280px; transition: border-color 0.3s, transform 0.3s; }}
+.project-card:hover {{ border-color: {hover_border}; transform: translateY(-2px); }}
+.project-card .thumb {{ width: 100%; height: 140px; background: {thumb_bg}; border-radius: 0.75rem; margin-bottom: 1rem; overflow: hidden; position: relative; }}
+.project-card .thumb .gradient {{ position: absolute; inset: 0; background: linear-gradient(135deg, rgba(99,102,241,0.15), rgba(168,85,247,0.15)); }}
+.project-card h3 {{ font-weight: 700; font-size: 1.15rem; margin-bottom: 0.35rem; }}
+.project-card p {{ font-size: 0.875rem; color: {sub_text}; opacity: 0.6; }}
+.footer {{ padding: 3rem; text-align: center; font-size: 0.8rem; color: {sub_text}; opacity: 0.5; }}
+@media (max-width: 640px) {{
+  nav {{ padding: 1.5rem; }} .hero {{ padding: 2rem 1.5rem 3rem; }} .hero h1 {{ font-size: 2rem; }} .hero p {{ font-size: 1rem; }}
+  .projects-section {{ padding: 2rem 1.5rem; border-radius: 2rem 2rem 0 0; }} .projects-grid {{ grid-template-columns: 1fr; }} .project-card {{ height: auto; }}
+}}
+</style></head><body>
+<nav><div class="logo">{title}.</div><div class="links"><a href="#work">Work</a><a href="#about">About</a><a href="#contact">Contact</a></div></nav>
+<div class="hero"><h1>{escape(data["headline"] or "Your Headline Here")}</h1>
+<p>{escape(data["subheadline"] or "Add a sub-headline describing what you do.")}</p><a class="cta" href="#">View Resume</a></div>
+{projects}
+<div class="footer">Built with PortfolifyAI</div>
+</body></html>"""
+
+
+def build_snapshot(doc: dict) -> dict:
+    """Pre-rendered HTML + JSON for a published portfolio, with a content ETag."""
+    data = public_data(doc)
+    data_json = json.dumps(data, default=str, separators=(",", ":"))
+    html = render_html(data)
+    etag = '"' + hashlib.sha256((html + data_json).encode("utf-8")).hexdigest()[:32] + '"'
+    return {
+        "_id": doc["subdomain"],
+        "portfolio_id": str(doc["_id"]),
+        "html": html,
+        "json": data_json,
+        "etag": etag,
+    }
@@ -0,0 +1,176 @@
+"""Compact, token-budgeted renderings of user documents for LLM prompts.
+
+Resumes and portfolios used to be embedded as indented JSON, IDs, empty
+template rows and theme settings included. The helpers here drop what the
+model doesn't need, render the rest as terse text and cap each section at a
+token budget. Token counts are a local estimate (no tokenizer download); they
+only have to be consistent, not exact, to size budgets and report savings.
+"""
+import json
+import math
+import re
+from app.config import get_settings
+from app.utils import metrics
+
+settings = get_settings()
+
+# Keys that carry no meaning for the model: identifiers, bookkeeping, styling.
+IRRELEVANT_KEYS = frozenset({
+    "_id", "id", "user_id", "version", "created_at", "updated_at",
+    "subdomain", "is_published", "selected",
+    "accentColor", "fontFamily", "darkMode", "theme", "layout", "template",
+})
+
+_TOKEN_PIECE = re.compile(r"[A-Za-z]+|\d+|\s{2,}|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: ~6 letters or 3 digits per token, one per symbol."""
+    total = 0
+    for piece in _TOKEN_PIECE.findall(text):
+        if piece[0].isalpha():
+            total += math.ceil(len(piece) / 6)
+        elif piece[0].isdigit():
+            total += math.ceil(len(piece) / 3)
+        else:
+            total += 1
+    return total
+
+
+def prune(value, drop: frozenset = IRRELEVANT_KEYS):
+    """Recursively remove irrelevant keys and empty values ("", None, [], {})."""
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            if k in drop:
+                continue
+            v = prune(v, drop)
+            if v not in ("", None, [], {}):
+                out[k] = v
+        return out
+    if isinstance(value, list):
+        return [v for v in (prune(v, drop) for v in value) if v not in ("", None, [], {})]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def compact_json(value) -> str:
+    return json.dumps(prune(value), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def truncate(text: str, budget: int) -> str:
+    """Cut ``text`` to roughly ``budget`` tokens, ending on a word boundary."""
+    if estimate_tokens(text) <= budget:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    cut = text[:lo].rsplit(" ", 1)[0] if " " in text[:lo] else text[:lo]
+    return cut.rstrip() + " …"
+
+
+def _fit(lines: list[str], budget: int) -> list[str]:
+    """Keep whole lines while they fit the budget; truncate the first that doesn't."""
+    out, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            remaining = budget - used
+            if remaining > 8:
+                out.append(truncate(line, remaining))
+            elif out:
+                out.append("…")
+            break
+        out.append(line)
+        used += cost
+    return out
+
+
+def _join(*parts) -> str:
+    return ", ".join(str(p) for p in parts if p)
+
+
+def _section(name: str, lines: list[str], budget: int) -> str:
+    lines = _fit(lines, budget)
+    return f"{name}:\n" + "\n".join(lines) if lines else ""
+
+
+def render_resume(content: dict, section_budget: int | None = None) -> str:
+    """Resume content as terse text, each section capped at ``section_budget`` tokens."""
+    budget = section_budget or settings.PROMPT_SECTION_TOKEN_BUDGET
+    content = prune(content or {})
+    sections = []
+
+    name = _join(" ".join(filter(None, [content.pop("firstName", ""), content.pop("lastName", "")])))
+    header = _join(name, content.pop("title", ""), content.pop("location", ""))
+    contact = _join(content.pop("email", ""), content.pop("phone", ""))
+    if header:
+        sections.append(header)
+    if contact:
+        sections.append(f"Contact: {contact}")
+    if summary := content.pop("summary", ""):
+        sections.append("Summary: " + truncate(str(summary), budget))
+
+    experience = []
+    for job in content.pop("experience", []):
+        if not isinstance(job, dict):
+            experience.append(f"- {job}")
+            continue
+        role = " @ ".join(filter(None, [job.get("title", ""), job.get("company", "")]))
+        meta = _join(job.get("dates", ""), job.get("location", ""))
+        experience.append(f"- {role}" + (f" ({meta})" if meta else ""))
+        experience.extend(f"  • {b}" for b in job.get("bullets", []))
+    if experience:
+        sections.append(_section("Experience", experience, budget))
+
+    education = [
+        "- " + (_join(e.get("degree", ""), e.get("school", ""), e.get("year", "")) if isinstance(e, dict) else str(e))
+        for e in content.pop("education", [])
+    ]
+    if education:
+        sections.append(_section("Education", education, budget))
+
+    if skills := content.pop("skills", []):
+        sections.append("Skills: " + truncate(", ".join(map(str, skills)), budget))
+
+    # Anything the builder adds later still reaches the model, just compactly.
+    for key, value in content.items():
+        text = value if isinstance(value, str) else compact_json(value)
+        sections.append(f"{key}: {truncate(text, budget)}")
+
+    return "\n".join(s for s in sections if s)
+
+
+def render_portfolio(title: str, config: dict, section_budget: int | None = None) -> str:
+    """Portfolio title and content (not styling) as terse text."""
+    budget = section_budget or settings.PROMPT_SECTION_TOKEN_BUDGET
+    config = prune(config or {})
+    lines = [f"Portfolio: {title}"] if title else []
+    for key in ("headline", "subheadline"):
+        if value := config.pop(key, ""):
+            lines.append(f"{key.capitalize()}: {truncate(str(value), budget)}")
+    projects = [
+        "- " + (" | ".join(filter(None, [p.pop("name", ""), p.pop("tech", ""), compact_json(p) if p else ""]))
+                if isinstance(p, dict) else str(p))
+        for p in config.pop("projects", [])
+    ]
+    if projects:
+        lines.append(_section("Projects", projects, budget))
+    for key, value in config.items():
+        text = value if isinstance(value, str) else compact_json(value)
+        lines.append(f"{key}: {truncate(text, budget)}")
+    return "\n".join(lines)
+
+
+def record_savings(prompt: str, original, rendered: str) -> str:
+    """Count tokens saved versus the old ``json.dumps(indent=2)`` embedding."""
+    before = estimate_tokens(json.dumps(original, indent=2, default=str))
+    after = estimate_tokens(rendered)
+    metrics.incr("prompt_payload_tokens_total", after, prompt=prompt)
+    metrics.incr("prompt_payload_tokens_saved_total", max(0, before - after), prompt=prompt)
+    return rendered
@@ -0,0 +1,69 @@
+import re
+from datetime import datetime, timezone
+from app.config import get_settings
+from app.database import portfolio_snapshots_col, portfolios_col
+from app.services import cache_sync
+from app.services.portfolio_renderer import build_snapshot
+from app.utils.cache import TTLCache
+
+settings = get_settings()
+
+_MISSING = object()
+_snapshots = TTLCache(settings.PUBLIC_PORTFOLIO_CACHE_MAX_ENTRIES, settings.PUBLIC_PORTFOLIO_CACHE_TTL_SECONDS)
+cache_sync.register("portfolio_snapshot", _snapshots.delete)
+
+
+async def get_snapshot(subdomain: str) -> dict | None:
+    """Published snapshot for a subdomain, served from memory when possible.
+
+    Unknown subdomains are cached briefly too, so probing traffic doesn't reach Mongo.
+    """
+    snapshot = _snapshots.get(subdomain, _MISSING)
+    if snapshot is not _MISSING:
+        return snapshot
+    snapshot = await portfolio_snapshots_col.find_one({"_id": subdomain})
+    if snapshot is None:
+        snapshot = await _backfill(subdomain)
+    _snapshots.set(subdomain, snapshot, ttl=None if snapshot else settings.PUBLIC_PORTFOLIO_NEGATIVE_TTL_SECONDS)
+    return snapshot
+
+
+async def _backfill(subdomain: str) -> dict | None:
+    """Snapshot a portfolio published before snapshots existed, or under a legacy mixed-case subdomain."""
+    doc = await portfolios_col.find_one(
+        {"subdomain": {"$regex": f"^{re.escape(subdomain)}$", "$options": "i"}, "is_published": True}
+    )
+    if doc is None:
+        return None
+    snapshot = _build(doc)
+    await portfolio_snapshots_col.replace_one({"_id": snapshot["_id"]}, snapshot, upsert=True)
+    return snapshot
+
+
+def _build(doc: dict) -> dict:
+    snapshot = build_snapshot(doc)
+    snapshot["_id"] = doc["subdomain"].lower()  # the public route looks subdomains up lowercased
+    snapshot["updated_at"] = datetime.now(timezone.utc)
+    return snapshot
+
+
+async def remove_snapshot(subdomain: str):
+    subdomain = subdomain.lower()
+    await portfolio_snapshots_col.delete_one({"_id": subdomain})
+    await cache_sync.publish("portfolio_snapshot", subdomain)
+
+
+async def sync_snapshot(doc: dict, previous_subdomain: str | None = None):
+    """Regenerate or drop the public snapshot of a portfolio after it was written."""
+    subdomain = doc.get("subdomain")
+    if previous_subdomain and previous_subdomain.lower() != (subdomain or "").lower():
+        await remove_snapshot(previous_subdomain)
+    if not subdomain:
+        return
+    if not doc.get("is_published"):
+        await remove_snapshot(subdomain)
+        return
+
+    snapshot = _build(doc)
+    await portfolio_snapshots_col.replace_one({"_id": snapshot["_id"]}, snapshot, upsert=True)
+    await cache_sync.publish("portfolio_snapshot", snapshot["_id"])
@@ -0,0 +1,99 @@
+"""Per-user career recommendations, stored alongside a content fingerprint.
+
+The fingerprint hashes the ids and ``updated_at`` of a user's resumes and
+portfolios, so any create, update or delete changes it. Writes schedule a
+debounced background refresh; until it lands, reads serve the stored, stale
+result rather than waiting on the LLM. Only users with nothing stored yet
+wait for a computation.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+from app.config import get_settings
+from app.database import resumes_col, portfolios_col, recommendations_col
+from app.services import llm_service, jobs
+from app.utils import metrics
+
+settings = get_settings()
+
+_FINGERPRINT_FIELDS = {"_id": 1, "updated_at": 1}
+
+
+def _fingerprint(resumes: list, portfolios: list) -> str:
+    parts = sorted(
+        f"{kind}:{doc['_id']}:{doc.get('updated_at')}"
+        for kind, docs in (("r", resumes), ("p", portfolios))
+        for doc in docs
+    )
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+async def current_fingerprint(user_id: str) -> str:
+    resumes = await resumes_col.find({"user_id": user_id}, projection=_FINGERPRINT_FIELDS).to_list()
+    portfolios = await portfolios_col.find({"user_id": user_id}, projection=_FINGERPRINT_FIELDS).to_list()
+    return _fingerprint(resumes, portfolios)
+
+
+async def compute(user_id: str) -> dict:
+    """Run the LLM analysis over the user's current documents and store the result."""
+    resumes = await resumes_col.find({"user_id": user_id}).to_list()
+    portfolios = await portfolios_col.find({"user_id": user_id}).to_list()
+
+    resume_data = [{"title": r["title"], "content": r.get("content", {})} for r in resumes]
+    portfolio_data = [{"title": p["title"], "config": p.get("config", {})} for p in portfolios]
+
+    result = await llm_service.get_recommendations(resume_data, portfolio_data)
+    # Fingerprint what was analysed, not what exists now: a write made meanwhile
+    # leaves the stored result stale and its own refresh will replace it.
+    await recommendations_col.replace_one(
+        {"_id": user_id},
+        {
+            "fingerprint": _fingerprint(resumes, portfolios),
+            "result": result,
+            "computed_at": datetime.now(timezone.utc),
+        },
+        upsert=True,
+    )
+    return result
+
+
+async def get(user_id: str, stale_ok: bool = True) -> dict:
+    """Stored recommendations, computed now only if there are none.
+
+    A stale result is served as is while a refresh is queued (one is queued
+    if missing); ``stale_ok=False`` recomputes it instead.
+    """
+    stored = await recommendations_col.find_one({"_id": user_id})
+    if stored and stored.get("fingerprint") == await current_fingerprint(user_id):
+        metrics.incr("recommendations_served_total", source="stored")
+        return stored["result"]
+    if stored and stale_ok:
+        metrics.incr("recommendations_served_total", source="stale")
+        if not await jobs.pending("recommendations.refresh", user_id):
+            await jobs.enqueue("recommendations.refresh", user_id, {}, dedupe=True)
+        return stored["result"]
+    metrics.incr("recommendations_served_total", source="computed")
+    return await compute(user_id)
+
+
+async def _refresh_job(job: dict) -> Optional[dict]:
+    user_id = job["user_id"]
+    stored = await recommendations_col.find_one({"_id": user_id}, projection={"fingerprint": 1})
+    if stored and stored.get("fingerprint") == await current_fingerprint(user_id):
+        return None
+    return await compute(user_id)
+
+
+jobs.register("recommendations.refresh", _refresh_job)
+
+
+async def schedule_refresh(user_id: str):
+    """Call after a resume or portfolio write. Users who never asked for recommendations are skipped."""
+    try:
+        if await recommendations_col.find_one({"_id": user_id}, projection={"_id": 1}):
+            await jobs.enqueue(
+                "recommendations.refresh", user_id, {},
+                delay=settings.RECOMMENDATIONS_REFRESH_DELAY_SECONDS, dedupe=True,
+            )
+    except Exception as e:
+        print(f"Warning: Could not schedule recommendations refresh: {e}")
@@ -0,0 +1,66 @@
+"""Resume downloads: rendering off the event loop, and a per-resume artifact cache.
+
+``resume_render`` does the work in a bounded process pool. Artifacts are
+cached per resume, each tagged with a hash of ``(content, template, format)``
+that doubles as the ETag: repeat downloads skip the pool, and a stale entry
+can never be served because its hash no longer matches. Updates and deletes also evict the
+resume's entries in every worker through ``cache_sync``.
+"""
+import hashlib
+import json
+from app.config import get_settings
+from app.services import cache_sync, resume_render
+from app.utils import metrics
+from app.utils.cache import TTLCache
+from app.utils.process_pool import BoundedProcessPool
+from app.utils.single_flight import SingleFlight
+
+settings = get_settings()
+
+FORMATS = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "md": "text/markdown; charset=utf-8",
+}
+
+# resume id -> {(template, format): (digest, bytes)}
+_cache = TTLCache(settings.EXPORT_CACHE_MAX_ENTRIES, settings.EXPORT_CACHE_TTL_SECONDS)
+cache_sync.register("resume_export", _cache.delete)
+
+_single_flight = SingleFlight()
+pool = BoundedProcessPool(
+    "export", settings.EXPORT_RENDER_WORKERS, settings.EXPORT_MAX_PENDING,
+    "Too many exports in progress, please retry shortly",
+)
+
+
+def digest(content: dict, template: str, fmt: str) -> str:
+    payload = json.dumps([content, template, fmt], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _render(content: dict, template: str, fmt: str) -> bytes:
+    with metrics.timed("resume_export_render_seconds", format=fmt):
+        return await pool.run(resume_render.render, content, template, fmt)
+
+
+async def export(resume_id: str, content: dict, template: str, fmt: str) -> tuple[bytes, str]:
+    """The rendered document and its digest, from cache when the content is unchanged."""
+    key = digest(content, template, fmt)
+    entry = _cache.get(resume_id)
+    cached = entry.get((template, fmt)) if entry else None
+    if cached and cached[0] == key:
+        metrics.incr("resume_export_cache_total", outcome="hit")
+        return cached[1], key
+
+    metrics.incr("resume_export_cache_total", outcome="miss")
+    data, _ = await _single_flight.do(key, lambda: _render(content, template, fmt))
+    entry = _cache.get(resume_id) or {}
+    entry[(template, fmt)] = (key, data)
+    _cache.set(resume_id, entry)
+    return data, key
+
+
+async def invalidate(resume_id: str):
+    """Call after a resume is updated or deleted."""
+    await cache_sync.publish("resume_export", resume_id)
@@ -0,0 +1,81 @@
+"""Resume uploads: spool to disk, parse in a bounded process pool, optionally tidy with the LLM.
+
+Extraction and segmentation (``document_text``, ``resume_parser``) are local
+and CPU-bound, so they run in worker processes on a temp-file copy of the
+upload; the event loop only copies bytes. Size is capped three times: the
+upload itself, the page count and the decompressed size of every part, so a
+small zip or Flate bomb can't grow into a large parse.
+"""
+import asyncio
+import os
+import tempfile
+from typing import BinaryIO
+import openai
+from app.config import get_settings
+from app.services import llm_limiter, llm_service, resume_parser
+from app.services.document_text import DocumentError
+from app.utils import metrics
+from app.utils.process_pool import BoundedProcessPool
+
+settings = get_settings()
+
+_CHUNK_BYTES = 64 * 1024
+
+pool = BoundedProcessPool(
+    "import", settings.IMPORT_PARSE_WORKERS, settings.IMPORT_MAX_PENDING,
+    "Too many imports in progress, please retry shortly",
+)
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def _spool(source: BinaryIO, max_bytes: int) -> str:
+    """Copy ``source`` into a temp file and return its path; the caller removes it."""
+    fd, path = tempfile.mkstemp(prefix="resume-import-")
+    try:
+        with os.fdopen(fd, "wb") as target:
+            size = 0
+            while chunk := source.read(_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+                target.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+async def parse_upload(source: BinaryIO, cleanup: bool = False) -> dict:
+    """``{"content", "kind", "warnings", "cleaned_up"}`` for an uploaded PDF or DOCX file.
+
+    Raises UploadTooLarge, DocumentError (unreadable or unsupported file) or
+    ValueError (pool busy).
+    """
+    path = await asyncio.to_thread(_spool, source, settings.IMPORT_MAX_UPLOAD_BYTES)
+    try:
+        with metrics.timed("resume_import_parse_seconds"):
+            result = await pool.run(
+                resume_parser.parse_file, path, settings.IMPORT_MAX_PAGES, settings.IMPORT_MAX_DECOMPRESSED_BYTES
+            )
+    except DocumentError:
+        metrics.incr("resume_import_total", outcome="unreadable")
+        raise
+    finally:
+        await asyncio.to_thread(os.unlink, path)
+
+    text = result.pop("text")
+    result["cleaned_up"] = False
+    if cleanup and text:
+        try:
+            result["content"] = await llm_service.clean_up_imported_resume(text, result["content"])
+            result["cleaned_up"] = True
+        except (ValueError, llm_limiter.LLMOverloadedError, openai.OpenAIError) as e:
+            # The heuristic split is still a usable draft; say why it wasn't improved.
+            metrics.incr("resume_import_cleanup_failed_total", error=type(e).__name__)
+            reason = str(e) if isinstance(e, ValueError) else "the AI provider is unavailable, try again later"
+            result["warnings"].append(f"AI clean-up unavailable: {reason}")
+    metrics.incr("resume_import_total", outcome="ok", kind=result["kind"])
+    return result
@@ -0,0 +1,204 @@
+"""Heuristic segmentation of extracted resume text into ``Resume.content``.
+
+Runs in the import process pool alongside ``document_text``, so apart from it this
+module imports nothing from the app. The output has the same shape the editor
+saves and ``resume_render`` exports: header fields, ``summary``,
+``experience`` (title, company, location, dates, bullets), ``education``
+(degree, school, year) and ``skills``. Anything the rules can't place is
+left out rather than guessed; the optional LLM pass can fill it in.
+"""
+import re
+import unicodedata
+from app.services import document_text
+
+_SECTIONS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "about", "about me",
+                "objective", "career objective", "overview"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience"),
+    "education": ("education", "academic background", "education and training", "qualifications"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies", "competencies",
+               "technologies", "tech stack", "tools", "skills and tools"),
+    # Recognised only so they end the previous section; their content is not imported.
+    "other": ("projects", "personal projects", "certifications", "certificates", "awards", "honors",
+              "languages", "interests", "hobbies", "publications", "volunteering", "volunteer experience",
+              "references", "courses", "achievements"),
+}
+_SECTION_BY_TITLE = {title: section for section, titles in _SECTIONS.items() for title in titles}
+
+_BULLET = re.compile(r"^\s*[•·▪◦●‣∙■□➢►\-*–]\s+")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"\+?\(?\d[\d\s().-]{6,}\d")
+_URL = re.compile(r"(?:https?://|www\.)\S+|\b(?:linkedin|github)\.com/\S*", re.I)
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+)?(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}}"
+_DATES = re.compile(rf"(?:{_DATE})(?:\s*(?:-|–|—|to)\s*(?:{_DATE}|present|current|now|today))?", re.I)
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+_SPLIT = re.compile(r"\s+[—–|-]\s+|\s*[|·•]\s*|\s+at\s+|\s+@\s+")
+_SKILL_SPLIT = re.compile(r"\s*(?:[,;|·•/]|\s-\s)\s*")
+_SCHOOL_WORDS = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic|universit\w+|hochschule)\b", re.I)
+_LIGATURES = str.maketrans({"ﬁ": "fi", "ﬂ": "fl", "ﬀ": "ff", "ﬃ": "ffi", "ﬄ": "ffl", " ": " ", "\t": " "})
+
+MAX_SKILLS = 50
+
+
+def parse_file(path: str, max_pages: int, max_bytes: int) -> dict:
+    """Extract and segment a PDF or DOCX file; the import pool's entry point."""
+    kind, text = document_text.extract_text(path, max_pages, max_bytes)
+    result = parse_text(text)
+    result["kind"] = kind
+    return result
+
+
+def _clean_lines(text: str) -> list[str]:
+    text = unicodedata.normalize("NFC", text.translate(_LIGATURES))
+    lines = []
+    for line in (re.sub(r"\s{2,}", " ", line).strip() for line in text.splitlines()):
+        if lines and _BULLET.match(lines[-1] + " ") and not _BULLET.sub("", lines[-1] + " "):
+            lines[-1] += " " + line  # a bullet glyph laid out apart from its text
+        else:
+            lines.append(line)
+    return lines
+
+
+def _section_of(line: str) -> str | None:
+    if len(line) > 40 or _BULLET.match(line):
+        return None
+    key = re.sub(r"[^a-z& ]", "", line.lower().replace("&", "and")).strip()
+    return _SECTION_BY_TITLE.get(re.sub(r"\s+", " ", key))
+
+
+def parse_text(text: str) -> dict:
+    """``{"content": ..., "text": ..., "warnings": [...]}`` for raw resume text."""
+    lines = _clean_lines(text)
+    sections: dict[str, list[str]] = {"header": []}
+    current = "header"
+    for line in lines:
+        section = _section_of(line)
+        if section:
+            current = section
+            sections.setdefault(section, [])
+        elif line:
+            sections.setdefault(current, []).append(line)
+
+    content = {
+        **_header(sections["header"]),
+        "summary": " ".join(sections.get("summary", [])),
+        "experience": _experience(sections.get("experience", [])),
+        "education": _education(sections.get("education", [])),
+        "skills": _skills(sections.get("skills", [])),
+    }
+    warnings = []
+    if not any(lines):
+        warnings.append("No text found in the document. Scanned PDFs need to be converted with OCR first.")
+    elif len(sections) == 1:
+        warnings.append("No resume sections were recognised; only the header was imported.")
+    return {"content": content, "text": "\n".join(line for line in lines if line), "warnings": warnings}
+
+
+def _header(lines: list[str]) -> dict:
+    header = {f: "" for f in ("firstName", "lastName", "title", "email", "phone", "location")}
+    for line in lines:
+        email, phone = _EMAIL.search(line), _PHONE.search(_EMAIL.sub("", line))
+        if email or phone or _URL.search(line):
+            header["email"] = header["email"] or (email.group() if email else "")
+            header["phone"] = header["phone"] or (phone.group().strip() if phone else "")
+            rest = _URL.sub("", _PHONE.sub("", _EMAIL.sub("", line)))
+            for part in filter(None, (p.strip(" ,") for p in _SPLIT.split(rest))):
+                if not header["title"] and "," not in part and not header["location"] and len(lines) < 3:
+                    header["title"] = part  # compact layout: "Title · email · phone"
+                elif not header["location"] and len(part.split()) <= 6:
+                    header["location"] = part
+        elif not header["firstName"] and not header["title"] and len(line.split()) <= 5:
+            first, _, last = line.partition(" ")
+            header["firstName"], header["lastName"] = first, last
+        elif not header["title"] and len(line) <= 80:
+            header["title"] = line
+        elif not header["location"] and len(line.split()) <= 6:
+            header["location"] = line
+    return header
+
+
+def _split_heading(line: str) -> tuple[str, str]:
+    parts = [p.strip(" ,") for p in _SPLIT.split(line) if p.strip(" ,")]
+    if len(parts) == 1 and ", " in line:
+        parts = [p.strip() for p in line.split(", ", 1)]
+    return (parts[0], ", ".join(parts[1:])) if parts else ("", "")
+
+
+def _experience(lines: list[str]) -> list[dict]:
+    jobs: list[dict] = []
+    last_was_bullet = False
+    for line in lines:
+        bullet = _BULLET.match(line)
+        if bullet:
+            if not jobs:
+                jobs.append({"title": "", "company": "", "location": "", "dates": "", "bullets": []})
+            jobs[-1]["bullets"].append(line[bullet.end():])
+            last_was_bullet = True
+            continue
+
+        dates = _DATES.search(line)
+        if last_was_bullet and jobs and not dates and (
+            line[0].islower() or (not jobs[-1]["bullets"][-1].endswith((".", "!", "?")) and not _SPLIT.search(line))
+        ):
+            jobs[-1]["bullets"][-1] += " " + line  # a wrapped bullet
+            continue
+        last_was_bullet = False
+
+        rest = (line[:dates.start()] + " " + line[dates.end():]).strip(" ,()|·–—-") if dates else line
+        job = jobs[-1] if jobs and not jobs[-1]["bullets"] else None
+        if job is None or (job["title"] and job["dates"] and rest):
+            title, company = _split_heading(rest)
+            jobs.append({"title": title, "company": company, "location": "", "dates": "", "bullets": []})
+            job = jobs[-1]
+        elif rest:
+            # A line between the heading and the bullets: company or location, then dates.
+            if not job["title"]:
+                job["title"], job["company"] = _split_heading(rest)
+            elif not job["company"] and not dates:
+                job["company"] = rest
+            else:
+                job["location"] = job["location"] or rest
+        if dates:
+            job["dates"] = job["dates"] or dates.group()
+    return jobs
+
+
+def _education(lines: list[str]) -> list[dict]:
+    schools: list[dict] = []
+    for line in lines:
+        line = _BULLET.sub("", line)
+        years = _YEAR.findall(line)
+        dates = _DATES.search(line)
+        rest = (line[:dates.start()] + " " + line[dates.end():]).strip(" ,()|·–—-") if dates else line
+        year = years[-1] if years else ""
+        last = schools[-1] if schools else None
+        if not rest and last is not None:
+            last["year"] = last["year"] or year
+            continue
+        parts = [p.strip(" ,") for p in re.split(r"\s+[—–|-]\s+|\s*[|·•]\s*|,\s+", rest) if p.strip(" ,")]
+        school = next((p for p in parts if _SCHOOL_WORDS.search(p)), "")
+        others = [p for p in parts if p != school]
+        if last is not None and not last["school"] and school and not others:
+            last["school"], last["year"] = school, last["year"] or year
+            continue
+        if last is not None and not last["degree"] and not school and others:
+            last["degree"], last["year"] = ", ".join(others), last["year"] or year
+            continue
+        schools.append({"degree": others[0] if others else "", "school": school or ", ".join(others[1:]), "year": year})
+    return schools
+
+
+def _skills(lines: list[str]) -> list[str]:
+    skills, seen = [], set()
+    for line in lines:
+        line = _BULLET.sub("", line)
+        if ":" in line:
+            line = line.split(":", 1)[1]  # "Languages: Python, Go"
+        for skill in _SKILL_SPLIT.split(line):
+            skill = skill.strip(" .")
+            if skill and len(skill) <= 40 and skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills[:MAX_SKILLS]
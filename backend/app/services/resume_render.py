@@ -0,0 +1,272 @@
+"""Resume documents: Markdown from a Jinja template, then DOCX or PDF laid out from it.
+
+Pure and CPU-bound, so ``render`` runs in resume_export's process pool; this
+module imports nothing from the app that would touch the database or network.
+Templates live in ``app/templates/resume/<name>.md.j2`` and only emit the
+Markdown subset ``blocks`` understands: ``#``/``##``/``###`` headings,
+``- `` bullets, ``*...*`` meta lines and plain paragraphs.
+
+PDFs use the standard Helvetica fonts, which only cover cp1252; content with
+other characters raises UnsupportedCharacters instead of printing ``?``.
+"""
+import io
+import re
+import zipfile
+import zlib
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader
+
+_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "resume"
+
+TEMPLATES = tuple(sorted(p.name[: -len(".md.j2")] for p in _TEMPLATE_DIR.glob("*.md.j2")))
+
+_MD_SPECIAL = re.compile(r"([\\`*_\[\]<>])")
+_CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_ESCAPED = re.compile(r"\\(.)")
+
+
+def _md(value) -> str:
+    """One line of user text, safe to drop into the Markdown templates."""
+    text = _MD_SPECIAL.sub(r"\\\1", " ".join(_CONTROL.sub("", str(value)).split()))
+    return "\\" + text if text[:1] in ("#", "-", "+") else text
+
+
+_env = Environment(
+    loader=FileSystemLoader(_TEMPLATE_DIR),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    autoescape=lambda name: bool(name) and name.endswith(".xml.j2"),
+)
+_env.filters["md"] = _md
+
+
+def _normalize(content: dict) -> dict:
+    """Coerce stored content (any shape the browser saved) into what templates expect."""
+
+    def text(value) -> str:
+        return "" if value is None else str(value).strip()
+
+    def strings(value) -> list[str]:
+        return [s for s in (text(v) for v in value) if s] if isinstance(value, list) else []
+
+    def records(value) -> list[dict]:
+        return [v for v in value if isinstance(v, dict)] if isinstance(value, list) else []
+
+    experience = [
+        {**{f: text(job.get(f)) for f in ("title", "company", "location", "dates")}, "bullets": strings(job.get("bullets"))}
+        for job in records(content.get("experience"))
+    ]
+    education = [{f: text(e.get(f)) for f in ("degree", "school", "year")} for e in records(content.get("education"))]
+    return {
+        **{f: text(content.get(f)) for f in ("firstName", "lastName", "title", "email", "phone", "location", "summary")},
+        # The builder starts with blank entries; they would render as bare "###" and "-" lines.
+        "experience": [job for job in experience if any(job.values())],
+        "education": [school for school in education if any(school.values())],
+        "skills": strings(content.get("skills")),
+    }
+
+
+def render_markdown(content: dict, template: str) -> str:
+    return _env.get_template(f"{template}.md.j2").render(r=_normalize(content or {}))
+
+
+_PREFIXES = (("### ", "subheading"), ("## ", "heading"), ("# ", "title"), ("- ", "bullet"))
+
+
+def blocks(markdown: str) -> list[tuple[str, str]]:
+    """``(kind, text)`` per non-empty line, with Markdown escapes removed."""
+    out = []
+    for line in markdown.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        for prefix, kind in _PREFIXES:
+            if line.startswith(prefix):
+                out.append((kind, _ESCAPED.sub(r"\1", line[len(prefix):])))
+                break
+        else:
+            if len(line) > 2 and line[0] == "*" and line[-1] == "*" and line[-2] != "\\":
+                out.append(("meta", _ESCAPED.sub(r"\1", line[1:-1])))
+            else:
+                out.append(("paragraph", _ESCAPED.sub(r"\1", line)))
+    return out
+
+
+# --- DOCX ----------------------------------------------------------------------
+
+_DOCX_STYLES = {"title": "Title", "heading": "Heading1", "subheading": "Heading2", "meta": "Subtitle", "paragraph": "Normal"}
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>"""
+
+_PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/><w:sz w:val="20"/></w:rPr></w:rPrDefault>
+<w:pPrDefault><w:pPr><w:spacing w:after="40" w:line="264" w:lineRule="auto"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/><w:rPr><w:b/><w:sz w:val="40"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Subtitle"><w:name w:val="Subtitle"/><w:basedOn w:val="Normal"/><w:rPr><w:i/><w:color w:val="666666"/><w:sz w:val="19"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/><w:pPr><w:keepNext/><w:spacing w:before="240" w:after="60"/><w:pBdr><w:bottom w:val="single" w:sz="4" w:space="1" w:color="999999"/></w:pBdr></w:pPr><w:rPr><w:b/><w:sz w:val="24"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/><w:pPr><w:keepNext/><w:spacing w:before="120" w:after="0"/></w:pPr><w:rPr><w:b/><w:sz w:val="21"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/><w:basedOn w:val="Normal"/><w:pPr><w:ind w:left="360" w:hanging="200"/></w:pPr></w:style>
+</w:styles>"""
+
+
+def to_docx(parsed: list[tuple[str, str]]) -> bytes:
+    document = _env.get_template("document.xml.j2").render(blocks=parsed, styles=_DOCX_STYLES)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        package.writestr("_rels/.rels", _PACKAGE_RELS)
+        package.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS)
+        package.writestr("word/document.xml", document)
+        package.writestr("word/styles.xml", _STYLES)
+    return buffer.getvalue()
+
+
+# --- PDF -----------------------------------------------------------------------
+
+class UnsupportedCharacters(ValueError):
+    """The content has characters the PDF's built-in fonts can't show; DOCX and Markdown can."""
+
+
+_PAGE_WIDTH, _PAGE_HEIGHT, _MARGIN = 595.28, 841.89, 50.0  # A4, points
+
+# Helvetica advance widths for ASCII 32-126, per 1000 units of font size.
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold", "F3": "Helvetica-Oblique"}
+
+# kind -> (font, size, leading, space before, indent)
+_PDF_STYLES = {
+    "title": ("F2", 20.0, 24.0, 0.0, 0.0),
+    "heading": ("F2", 12.0, 16.0, 12.0, 0.0),
+    "subheading": ("F2", 10.5, 14.0, 6.0, 0.0),
+    "meta": ("F3", 9.5, 12.0, 0.0, 0.0),
+    "paragraph": ("F1", 10.0, 13.5, 2.0, 0.0),
+    "bullet": ("F1", 10.0, 13.5, 1.0, 12.0),
+}
+
+
+def _text_width(text: str, font: str, size: float) -> float:
+    units = sum(_HELVETICA[ord(c) - 32] if 32 <= ord(c) <= 126 else 556 for c in text)
+    return units * size / 1000 * (1.07 if font == "F2" else 1.0)  # bold runs slightly wider
+
+
+def _wrap(text: str, font: str, size: float, width: float) -> list[str]:
+    lines, line = [], ""
+    for word in text.split(" "):
+        candidate = f"{line} {word}" if line else word
+        if line and _text_width(candidate, font, size) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    lines.append(line)
+    return lines
+
+
+def _check_encodable(parsed: list[tuple[str, str]]):
+    """Refuse rather than print ``?``: the standard fonts only cover WinAnsiEncoding (cp1252)."""
+    missing = []
+    for _, text in parsed:
+        for char in text:
+            if char not in missing and not char.encode("cp1252", "ignore"):
+                missing.append(char)
+    if missing:
+        raise UnsupportedCharacters(
+            f"PDF export doesn't support some characters in this resume ({' '.join(missing[:10])}). "
+            "Download it as DOCX or Markdown instead."
+        )
+
+
+def _pdf_string(text: str) -> bytes:
+    raw = text.encode("cp1252")  # WinAnsiEncoding
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _layout(parsed: list[tuple[str, str]]) -> list[list[bytes]]:
+    """Content stream operators per page."""
+    top, width = _PAGE_HEIGHT - _MARGIN, _PAGE_WIDTH - 2 * _MARGIN
+    pages: list[list[bytes]] = [[]]
+    y = top
+    for kind, text in parsed:
+        font, size, leading, before, indent = _PDF_STYLES[kind]
+        y -= before
+        for i, line in enumerate(_wrap(text, font, size, width - indent)):
+            if y - leading < _MARGIN:
+                pages.append([])
+                y = top
+            y -= leading
+            ops, baseline = pages[-1], y + (leading - size)
+            if kind == "bullet" and i == 0:
+                ops.append(b"BT /F1 %.1f Tf %.2f %.2f Td (\x95) Tj ET" % (size, _MARGIN + 2, baseline))
+            color = b"0.4 g " if kind == "meta" else b""
+            ops.append(color + b"BT /%s %.1f Tf %.2f %.2f Td %s Tj ET 0 g"
+                       % (font.encode(), size, _MARGIN + indent, baseline, _pdf_string(line)))
+        if kind == "heading":
+            pages[-1].append(b"0.6 G 0.5 w %.2f %.2f m %.2f %.2f l S 0 G"
+                             % (_MARGIN, y - 2, _PAGE_WIDTH - _MARGIN, y - 2))
+            y -= 4
+    return pages
+
+
+def to_pdf(parsed: list[tuple[str, str]]) -> bytes:
+    """Raises UnsupportedCharacters for text outside cp1252."""
+    _check_encodable(parsed)
+    objects: list[bytes] = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]
+    font_refs = []
+    for name, base_font in _FONTS.items():
+        objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base_font.encode())
+        font_refs.append(b"/%s %d 0 R" % (name.encode(), len(objects)))
+    resources = b"<< /Font << " + b" ".join(font_refs) + b" >> >>"
+
+    kids = []
+    for ops in _layout(parsed):
+        stream = zlib.compress(b"\n".join(ops))
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources %s /Contents %d 0 R >>"
+                       % (_PAGE_WIDTH, _PAGE_HEIGHT, resources, len(objects)))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % len(kids)
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def render(content: dict, template: str, fmt: str) -> bytes:
+    """The resume as ``md``, ``docx`` or ``pdf`` bytes."""
+    markdown = render_markdown(content, template)
+    if fmt == "md":
+        return markdown.encode("utf-8")
+    parsed = blocks(markdown)
+    return to_pdf(parsed) if fmt == "pdf" else to_docx(parsed)
@@ -0,0 +1,223 @@
+"""Per-user full-text search over resumes and case studies.
+
+Every document is split into passages (a bullet, a summary, a case study
+section) and their term frequencies are stored in ``search_index``, one
+entry per document, rewritten whenever the document is written. Queries run
+BM25 over an in-memory index of the user's passages, built from those
+entries on first use and cached per worker; ``cache_sync`` drops it in every
+worker after a write.
+
+Building the cached index also reconciles entries with the source documents'
+``updated_at``, so documents written before indexing existed, or changed by a
+path that only invalidates (autosave patches), are reindexed then.
+"""
+import heapq
+import math
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from bson import ObjectId
+from app.config import get_settings
+from app.database import case_studies_col, resumes_col, search_index_col
+from app.services import cache_sync
+from app.services.ats_matcher import tokenize
+from app.utils import metrics
+from app.utils.cache import TTLCache
+from app.utils.single_flight import SingleFlight
+
+settings = get_settings()
+
+# Bump when passages or tokens change shape; older entries are rebuilt on next use.
+INDEX_VERSION = 1
+
+# kind -> (collection, fields holding searchable text)
+SOURCES = {
+    "resume": (resumes_col, ("title", "content")),
+    "case_study": (case_studies_col, ("title", "inputs", "generated_content")),
+}
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_MAX_PASSAGE_CHARS = 2000
+_MAX_PASSAGES = 500
+_SHORT_ITEM_CHARS = 60  # lists of items this short (skills, tags) are indexed as one passage
+_PREFIX_MIN_CHARS = 3
+_PREFIX_EXPANSIONS = 10
+_SNIPPET_CHARS = 240
+
+_cache = TTLCache(settings.SEARCH_CACHE_MAX_USERS, settings.SEARCH_CACHE_TTL_SECONDS)
+cache_sync.register("search", _cache.delete)
+_single_flight = SingleFlight()
+
+
+def passages(value, path: str = "") -> list[tuple[str, str]]:
+    """``(path, text)`` for every text leaf of a document field, e.g. ``content.experience.0.bullets.2``."""
+    if isinstance(value, dict):
+        return [p for key, v in value.items() for p in passages(v, f"{path}.{key}" if path else str(key))]
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(v, str) and len(v) <= _SHORT_ITEM_CHARS for v in value):
+            return [(path, ", ".join(v.strip() for v in value if v.strip()))]
+        return [p for i, v in enumerate(value) for p in passages(v, f"{path}.{i}")]
+    if isinstance(value, str) and value.strip():
+        return [(path, value.strip()[:_MAX_PASSAGE_CHARS])]
+    return []
+
+
+def build_entry(kind: str, doc: dict) -> dict:
+    """The stored index entry for one source document."""
+    fields = SOURCES[kind][1]
+    items = [p for field in fields for p in passages(doc.get(field), field)][:_MAX_PASSAGES]
+    return {
+        "_id": f"{kind}:{doc['_id']}",
+        "user_id": doc["user_id"],
+        "kind": kind,
+        "doc_id": str(doc["_id"]),
+        "title": doc.get("title", ""),
+        "v": INDEX_VERSION,
+        "source_updated_at": doc.get("updated_at"),
+        "passages": [
+            {"path": path, "text": text, "terms": list(Counter(tokenize(text)).items())}
+            for path, text in items
+        ],
+        "indexed_at": datetime.now(timezone.utc),
+    }
+
+
+async def index(kind: str, doc: dict):
+    """Store the entry for a created or updated document and drop the user's cached index."""
+    entry = build_entry(kind, doc)
+    await search_index_col.replace_one({"_id": entry["_id"]}, entry, upsert=True)
+    await cache_sync.publish("search", doc["user_id"])
+
+
+async def remove(kind: str, doc_id: str, user_id: str):
+    await search_index_col.delete_one({"_id": f"{kind}:{doc_id}", "user_id": user_id})
+    await cache_sync.publish("search", user_id)
+
+
+async def invalidate(user_id: str):
+    """For writes that don't have the whole document at hand; it is reindexed on the next search."""
+    await cache_sync.publish("search", user_id)
+
+
+class UserIndex:
+    """BM25 over one user's passages."""
+
+    def __init__(self, entries: list[dict]):
+        self.passages: list[tuple[dict, dict]] = []  # (entry, passage)
+        self.lengths: list[int] = []
+        self.postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        for entry in entries:
+            for passage in entry["passages"]:
+                pid = len(self.passages)
+                self.passages.append((entry, passage))
+                self.lengths.append(sum(tf for _, tf in passage["terms"]))
+                for term, tf in passage["terms"]:
+                    self.postings[term].append((pid, tf))
+        self.vocabulary = sorted(self.postings)
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def _expand(self, term: str) -> list[str]:
+        """The term itself if indexed, else indexed words it starts (search-as-you-type)."""
+        if term in self.postings or len(term) < _PREFIX_MIN_CHARS:
+            return [term]
+        start = bisect_left(self.vocabulary, term)
+        matches = []
+        for word in self.vocabulary[start:start + _PREFIX_EXPANSIONS]:
+            if not word.startswith(term):
+                break
+            matches.append(word)
+        return matches
+
+    def search(self, query: str, limit: int, kind: str | None = None) -> list[tuple[float, int]]:
+        terms = tokenize(query)
+        if terms:
+            terms = list(dict.fromkeys(terms[:-1] + self._expand(terms[-1])))
+        n = len(self.passages)
+        scores: dict[int, float] = defaultdict(float)
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for pid, tf in postings:
+                norm = 1 - _BM25_B + _BM25_B * self.lengths[pid] / self.avg_length
+                scores[pid] += idf * tf * (_BM25_K1 + 1) / (tf + _BM25_K1 * norm)
+        if kind:
+            scores = {pid: s for pid, s in scores.items() if self.passages[pid][0]["kind"] == kind}
+        return heapq.nlargest(limit, ((s, pid) for pid, s in scores.items()))
+
+
+async def _reconcile(user_id: str) -> list[dict]:
+    """The user's entries, after rebuilding stale or missing ones and dropping orphans."""
+    current: dict[str, object] = {}
+    for kind, (col, _) in SOURCES.items():
+        async for doc in col.find({"user_id": user_id}, projection={"updated_at": 1}):
+            current[f"{kind}:{doc['_id']}"] = doc.get("updated_at")
+
+    entries, orphans = {}, []
+    async for entry in search_index_col.find({"user_id": user_id}):
+        if entry["_id"] not in current:
+            orphans.append(entry["_id"])
+        elif entry.get("v") == INDEX_VERSION and entry.get("source_updated_at") == current[entry["_id"]]:
+            entries[entry["_id"]] = entry
+
+    stale = [key for key in current if key not in entries]
+    for kind, (col, fields) in SOURCES.items():
+        ids = [ObjectId(key.split(":", 1)[1]) for key in stale if key.startswith(f"{kind}:")]
+        if not ids:
+            continue
+        async for doc in col.find({"_id": {"$in": ids}, "user_id": user_id}, projection=["user_id", "updated_at", *fields]):
+            entry = build_entry(kind, doc)
+            await search_index_col.replace_one({"_id": entry["_id"]}, entry, upsert=True)
+            entries[entry["_id"]] = entry
+    if orphans:
+        await search_index_col.delete_many({"_id": {"$in": orphans}})
+    metrics.incr("search_reindexed_documents_total", len(stale))
+    return list(entries.values())
+
+
+async def user_index(user_id: str) -> UserIndex:
+    cached = _cache.get(user_id)
+    if cached is not None:
+        metrics.incr("search_index_cache_total", outcome="hit")
+        return cached
+    metrics.incr("search_index_cache_total", outcome="miss")
+
+    async def build() -> UserIndex:
+        built = UserIndex(await _reconcile(user_id))
+        _cache.set(user_id, built)
+        return built
+
+    built, _ = await _single_flight.do(user_id, build)
+    return built
+
+
+def _snippet(text: str, terms: set[str]) -> str:
+    if len(text) <= _SNIPPET_CHARS:
+        return text
+    lowered = text.lower()
+    hits = [i for i in (lowered.find(t) for t in terms) if i >= 0]
+    start = max(0, min(hits) - _SNIPPET_CHARS // 4) if hits else 0
+    start = text.rfind(" ", 0, start) + 1 if start else 0
+    snippet = text[start:start + _SNIPPET_CHARS].rsplit(" ", 1)[0]
+    return ("…" if start else "") + snippet + "…"
+
+
+async def search(user_id: str, query: str, limit: int, kind: str | None = None) -> list[dict]:
+    with metrics.timed("search_query_seconds", phase="search"):
+        idx = await user_index(user_id)
+        hits = idx.search(query, limit, kind)
+    terms = set(tokenize(query))
+    results = []
+    for score, pid in hits:
+        entry, passage = idx.passages[pid]
+        results.append({
+            "kind": entry["kind"],
+            "id": entry["doc_id"],
+            "title": entry["title"],
+            "path": passage["path"],
+            "snippet": _snippet(passage["text"], terms),
+            "score": round(score, 4),
+        })
+    return results
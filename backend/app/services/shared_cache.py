@@ -0,0 +1,59 @@
+"""Key-value tier shared by every worker, behind the in-process caches.
+
+In-process caches (``app.utils.cache.TTLCache``) are per worker. A cache that
+is worth sharing asks ``store(namespace)`` for a second tier and checks it on
+a local miss. Stores are pluggable: ``mongo`` is built in, and another backend
+(Redis, memcached, ...) only needs ``register_backend`` and an object with
+async ``get``/``set``/``delete``. SHARED_CACHE_BACKEND picks one.
+
+Caches that must not serve stale data across workers (users, public
+portfolios) stay local and rely on ``cache_sync`` invalidation instead.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional, Protocol
+from app.config import get_settings
+from app.database import LazyCollection
+
+settings = get_settings()
+
+
+class Store(Protocol):
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    async def set(self, key: str, value: Any, ttl: float): ...
+
+    async def delete(self, key: str): ...
+
+
+class MongoStore:
+    """Entries in the ``<namespace>_cache`` collection, expired by a TTL index on ``expires_at``."""
+
+    def __init__(self, namespace: str):
+        self.col = LazyCollection(f"{namespace}_cache")
+
+    async def get(self, key: str) -> Optional[Any]:
+        doc = await self.col.find_one({"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}})
+        return None if doc is None else doc["value"]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        await self.col.update_one({"_id": key}, {"$set": {"value": value, "expires_at": expires_at}}, upsert=True)
+
+    async def delete(self, key: str):
+        await self.col.delete_one({"_id": key})
+
+
+_backends: dict[str, Callable[[str], Store]] = {"mongo": MongoStore}
+
+
+def register_backend(name: str, factory: Callable[[str], Store]):
+    """Make ``factory(namespace)`` available as SHARED_CACHE_BACKEND=``name``."""
+    _backends[name] = factory
+
+
+def store(namespace: str) -> Store:
+    try:
+        factory = _backends[settings.SHARED_CACHE_BACKEND]
+    except KeyError:
+        raise ValueError(f"Unknown shared cache backend: {settings.SHARED_CACHE_BACKEND}")
+    return factory(namespace)
@@ -0,0 +1,141 @@
+import bisect
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+# In-process counters and gauges, keyed by (name, sorted label pairs).
+_counters: dict[tuple, float] = defaultdict(float)
+_gauges: set[str] = set()
+
+# Histogram bucket upper bounds in seconds; wide enough for LLM calls.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (name, labels) -> [per-bucket counts..., +Inf count, sum]
+_histograms: dict[tuple, list[float]] = {}
+
+# Callbacks run at scrape time to refresh gauges that are cheap to read but not event-driven.
+_collectors: list[Callable[[], None]] = []
+
+# Per-request phase durations for the Server-Timing header; None outside a request.
+_request_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def incr(name: str, amount: float = 1, **labels):
+    _counters[_key(name, labels)] += amount
+
+
+def set_gauge(name: str, value: float, **labels):
+    """Overwrite a point-in-time value such as a queue depth."""
+    _gauges.add(name)
+    _counters[_key(name, labels)] = value
+
+
+def observe(name: str, value: float, **labels):
+    """Record a sample in the ``name`` histogram (exported with ``_bucket``/``_sum``/``_count``)."""
+    key = _key(name, labels)
+    hist = _histograms.get(key)
+    if hist is None:
+        hist = _histograms[key] = [0.0] * (len(BUCKETS) + 2)
+    hist[bisect.bisect_left(BUCKETS, value)] += 1
+    hist[-1] += value
+
+
+def get(name: str, **labels) -> float:
+    key = _key(name, labels)
+    if name.endswith(("_sum", "_count")):
+        base, _, part = name.rpartition("_")
+        hist = _histograms.get(_key(base, labels))
+        if hist is not None:
+            return hist[-1] if part == "sum" else sum(hist[:-1])
+    return _counters.get(key, 0)
+
+
+def register_collector(fn: Callable[[], None]):
+    _collectors.append(fn)
+
+
+def _series(name: str, labels) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def snapshot() -> dict[str, float]:
+    """Flatten counters and histogram sums/counts into ``name{label="value"}`` keys."""
+    out = {_series(name, labels): value for (name, labels), value in _counters.items()}
+    for (name, labels), hist in _histograms.items():
+        out[_series(f"{name}_sum", labels)] = hist[-1]
+        out[_series(f"{name}_count", labels)] = sum(hist[:-1])
+    return out
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    for collect in _collectors:
+        try:
+            collect()
+        except Exception as e:
+            print(f"Warning: Metrics collector failed: {e}")
+
+    lines = []
+    by_name: dict[str, list] = defaultdict(list)
+    for (name, labels), value in sorted(_counters.items()):
+        by_name[name].append((labels, value))
+    for name, series in by_name.items():
+        lines.append(f"# TYPE {name} {'gauge' if name in _gauges else 'counter'}")
+        lines.extend(f"{_series(name, labels)} {value:g}" for labels, value in series)
+
+    by_name = defaultdict(list)
+    for (name, labels), hist in sorted(_histograms.items()):
+        by_name[name].append((labels, hist))
+    for name, series in by_name.items():
+        lines.append(f"# TYPE {name} histogram")
+        for labels, hist in series:
+            cumulative = 0.0
+            for bound, count in zip(BUCKETS + (float("inf"),), hist[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{_series(name + '_bucket', labels + (('le', le),))} {cumulative:g}")
+            lines.append(f"{_series(name + '_sum', labels)} {hist[-1]:g}")
+            lines.append(f"{_series(name + '_count', labels)} {cumulative:g}")
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def request_timings():
+    """Collect ``add_timing`` durations for the current request."""
+    token = _request_timings.set({})
+    try:
+        yield _request_timings.get()
+    finally:
+        _request_timings.reset(token)
+
+
+def add_timing(phase: str, seconds: float):
+    """Attribute time to a phase (db, llm, ...) of the current request, if any."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(name: str, phase: Optional[str] = None, **labels):
+    """Observe the block's duration in ``name`` and, optionally, a Server-Timing phase."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        observe(name, elapsed, **labels)
+        if phase:
+            add_timing(phase, elapsed)
@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Response
+
+# Keyset pagination over (updated_at, _id), newest first. Backed by the
+# (user_id, updated_at, _id) compound indexes created in ensure_indexes.
+SORT = [("updated_at", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: dict) -> str:
+    raw = json.dumps([doc["updated_at"].isoformat(), str(doc["_id"])])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Turn a cursor into the query clause selecting documents after it."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, oid = json.loads(base64.urlsafe_b64decode(padded))
+        updated_at, oid = datetime.fromisoformat(updated_at), ObjectId(oid)
+    except (ValueError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"$or": [{"updated_at": {"$lt": updated_at}}, {"updated_at": updated_at, "_id": {"$lt": oid}}]}
+
+
+async def find_page(
+    collection,
+    query: dict,
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    exclude: tuple[str, ...] = (),
+) -> list[dict]:
+    """Fetch documents newest-first, optionally one keyset page at a time.
+
+    When ``limit`` is given and more documents remain, the cursor for the next
+    page is returned in the ``X-Next-Cursor`` response header. ``exclude``
+    fields are left out of the projection (summary views).
+    """
+    if cursor:
+        query = {"$and": [query, decode_cursor(cursor)]}
+    projection = {field: 0 for field in exclude} or None
+    find = collection.find(query, projection).sort(SORT)
+    if limit:
+        find = find.limit(limit + 1)
+    docs = await find.to_list()
+    if limit and len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1])
+    return docs
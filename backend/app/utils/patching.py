@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+class DocumentPatch(BaseModel):
+    """Field-level update: dotted paths (``content.experience.0.bullets.2``) to set or unset.
+
+    ``version`` is the version the client last saw; the write is rejected with
+    409 if the document changed since. Omit it to write unconditionally.
+    """
+
+    set: Dict[str, object] = {}
+    unset: List[str] = []
+    version: Optional[int] = None
+
+
+def _check_path(path: str, allowed_roots: Dict[str, type]):
+    parts = path.split(".")
+    if any(not p or p.startswith("$") for p in parts) or parts[0] not in allowed_roots:
+        raise HTTPException(status_code=400, detail=f"Invalid patch path: {path}")
+
+
+def build_update(patch: DocumentPatch, allowed_roots: Dict[str, type]) -> dict:
+    """Validate a patch and turn it into a Mongo update document (without timestamps).
+
+    ``allowed_roots`` maps each patchable top-level field to its type. A root can
+    be replaced as a whole only with a value of that type, and never unset: the
+    readers expect those fields to be present.
+    """
+    paths = list(patch.set) + patch.unset
+    if not paths:
+        raise HTTPException(status_code=400, detail="Patch is empty")
+    for path in paths:
+        _check_path(path, allowed_roots)
+    for path in patch.unset:
+        if path in allowed_roots:
+            raise HTTPException(status_code=400, detail=f"Cannot unset {path}")
+    for path, value in patch.set.items():
+        if path in allowed_roots and not isinstance(value, allowed_roots[path]):
+            raise HTTPException(status_code=400, detail=f"{path} must be a {allowed_roots[path].__name__}")
+    # Mongo rejects overlapping paths in one update (e.g. ``content`` and ``content.skills``).
+    ordered = sorted(paths)
+    for a, b in zip(ordered, ordered[1:]):
+        if a == b or b.startswith(a + "."):
+            raise HTTPException(status_code=400, detail=f"Conflicting patch paths: {a}, {b}")
+
+    update = {"$inc": {"version": 1}}
+    if patch.set:
+        update["$set"] = dict(patch.set)
+    if patch.unset:
+        update["$unset"] = {path: "" for path in patch.unset}
+    return update
+
+
+def version_filter(version: Optional[int]) -> dict:
+    if version is None:
+        return {}
+    # Documents created before versioning have no version field; treat them as 0.
+    return {"version": {"$in": [0, None]}} if version == 0 else {"version": version}
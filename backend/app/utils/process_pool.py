@@ -0,0 +1,55 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+from app.utils import metrics
+
+
+class BoundedProcessPool:
+    """A lazily started process pool for CPU-bound work, with a cap on queued calls.
+
+    Children are spawned, not forked, so they never inherit the server's
+    sockets, threads or event loop; keep the functions they run in modules that
+    import nothing heavy. Calls beyond ``max_pending`` fail fast with
+    ValueError, which routers turn into 503. ``workers=0`` runs calls in a
+    thread instead (handy in development and tests).
+    """
+
+    def __init__(self, name: str, workers: int, max_pending: int, busy_message: str):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.busy_message = busy_message
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+        metrics.register_collector(self._collect)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        if self.pending >= self.max_pending:
+            raise ValueError(self.busy_message)
+        self.pending += 1
+        try:
+            if self.workers <= 0:
+                return await asyncio.to_thread(fn, *args)
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            self._executor = None  # a child died; the next call starts a fresh pool
+            raise ValueError(f"The {self.name} workers restarted, please retry")
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _collect(self):
+        metrics.set_gauge("threadpool_size", self.workers, pool=self.name)
+        metrics.set_gauge("threadpool_busy", min(self.pending, self.workers), pool=self.name)
+        metrics.set_gauge("threadpool_waiting", max(0, self.pending - self.workers), pool=self.name)
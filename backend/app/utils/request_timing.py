@@ -0,0 +1,46 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils import metrics
+
+
+class TimingMiddleware:
+    """Time every HTTP request per route and report phases in a Server-Timing header.
+
+    Plain ASGI rather than BaseHTTPMiddleware so streamed (SSE) responses pass
+    through untouched. The header is written when the response starts, so for a
+    stream it covers the time to first byte; the histogram covers the full body.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        with metrics.request_timings() as timings:
+            async def send_with_timing(message: Message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    parts = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in timings.items()]
+                    parts.append(f"app;dur={(time.perf_counter() - started) * 1000:.1f}")
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"server-timing", ", ".join(parts).encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = scope.get("route")
+                metrics.observe(
+                    "http_request_duration_seconds",
+                    time.perf_counter() - started,
+                    method=scope["method"],
+                    route=getattr(route, "path", "unmatched"),
+                    status=status,
+                )
@@ -1,3 +1,6 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 import bcrypt
 from jose import JWTError, jwt
@@ -5,20 +8,75 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.config import get_settings
 from app.database import users_col
+from app.services import cache_sync
+from app.utils import metrics
+from app.utils.cache import TTLCache
 
 settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# token -> user id (skips jwt.decode) and user id -> user document (skips the users lookup)
+_token_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+_user_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+cache_sync.register("user", _user_cache.delete)
+
+
+# bcrypt releases the GIL, so a small dedicated thread pool keeps hashing off the
+# event loop without competing with the default threadpool used by Starlette.
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_pending = 0
+
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """True when a hash was made with a different work factor than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def _run_hashing(fn, *args):
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(status_code=503, detail="Too many concurrent sign-ins, please retry shortly")
+    _hash_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+def _collect_hash_pool():
+    metrics.set_gauge("threadpool_size", settings.PASSWORD_HASH_WORKERS, pool="bcrypt")
+    metrics.set_gauge("threadpool_busy", min(_hash_pending, settings.PASSWORD_HASH_WORKERS), pool="bcrypt")
+    metrics.set_gauge("threadpool_waiting", max(0, _hash_pending - settings.PASSWORD_HASH_WORKERS), pool="bcrypt")
+
+
+metrics.register_collector(_collect_hash_pool)
+
+
+def shutdown_hash_executor():
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -38,17 +96,33 @@ def decode_access_token(token: str) -> dict:
         )
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
-    payload = decode_access_token(token)
-    user_id: str = payload.get("sub")
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
+    user_id = _token_cache.get(token)
     if user_id is None:
-        raise HTTPException(status_code=401, detail="Invalid token payload")
+        payload = decode_access_token(token)
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Invalid token payload")
+        # Never keep a token cached past its own expiry.
+        _token_cache.set(token, user_id, ttl=min(settings.AUTH_CACHE_TTL_SECONDS, payload["exp"] - time.time()))
+
+    user = _user_cache.get(user_id)
+    if user is not None:
+        metrics.incr("auth_user_lookups_saved_total")
+        return dict(user)
 
     from bson import ObjectId
-    user = users_col.find_one({"_id": ObjectId(user_id)})
+    user = await users_col.find_one({"_id": ObjectId(user_id)})
+    metrics.incr("auth_user_lookups_total")
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
 
     # Convert _id to string for JSON serialization
     user["id"] = str(user["_id"])
-    return user
+    _user_cache.set(user_id, user)
+    return dict(user)
+
+
+async def invalidate_user(user_id: str):
+    """Drop a cached user document in every worker; call after updating or deleting a user."""
+    await cache_sync.publish("user", user_id)
@@ -0,0 +1,43 @@
+import json
+import time
+from typing import AsyncIterator, Awaitable, Callable
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def stream_tokens(
+    chunks: AsyncIterator[str],
+    started: float,
+    on_complete: Callable[[str], Awaitable[dict]] | None = None,
+) -> StreamingResponse:
+    """Forward LLM text deltas as ``token`` events, then a final ``done`` event.
+
+    ``started`` is the ``time.perf_counter()`` at which the request began, so the
+    ``ttft_ms`` reported in ``done`` covers everything before the first token.
+    ``on_complete`` receives the full text and returns the ``done`` payload.
+    """
+
+    async def events():
+        ttft_ms = None
+        parts = []
+        try:
+            async for text in chunks:
+                if ttft_ms is None:
+                    ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+                parts.append(text)
+                yield sse_event("token", {"text": text})
+            full_text = "".join(parts)
+            payload = await on_complete(full_text) if on_complete else {"text": full_text}
+            yield sse_event("done", {**payload, "ttft_ms": ttft_ms})
+        except Exception as e:
+            print(f"❌ Stream failed: {e}")
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
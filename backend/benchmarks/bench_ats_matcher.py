@@ -0,0 +1,68 @@
+"""Latency of the local ATS matcher (single and batch ranking), and optionally
+its agreement with the LLM.
+
+Run from ``backend/``:
+    python -m benchmarks.bench_ats_matcher --pairs 200
+    python -m benchmarks.bench_ats_matcher --pairs 10 --llm   # needs GROQ_API_KEY
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.services import ats_matcher
+from benchmarks.fixtures import sample_job_description, sample_resume
+
+
+def _canonical(skills: list[str]) -> set[str]:
+    found = set()
+    for skill in skills:
+        found.update(ats_matcher.extract_skills(ats_matcher._raw_tokens(skill)) or {skill.lower()})
+    return found
+
+
+async def main(pairs: int, compare_llm: bool):
+    cases = [(sample_job_description(i), sample_resume(i)) for i in range(pairs)]
+
+    local_ms, local_results = [], []
+    for jd, resume in cases:
+        start = time.perf_counter()
+        local_results.append(ats_matcher.analyze(jd, resume))
+        local_ms.append((time.perf_counter() - start) * 1000)
+    print(f"local matcher   {pairs} pairs   mean {statistics.mean(local_ms):.3f} ms   "
+          f"max {max(local_ms):.3f} ms")
+
+    jds = [jd for jd, _ in cases]
+    start = time.perf_counter()
+    ats_matcher.rank_job_descriptions(cases[0][1], jds)
+    print(f"batch ranking   1 resume x {len(jds)} JDs   {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if not compare_llm:
+        return
+
+    from app.services import llm_service
+
+    llm_service.open_client()
+    llm_ms, score_diffs, jaccards = [], [], []
+    try:
+        for (jd, resume), local in zip(cases, local_results):
+            start = time.perf_counter()
+            remote = await llm_service.analyze_jd_match(jd, resume)
+            llm_ms.append((time.perf_counter() - start) * 1000)
+            score_diffs.append(abs(local["match_score"] - int(remote.get("match_score", 0))))
+            a, b = _canonical(local["matched_skills"]), _canonical(remote.get("matched_skills", []))
+            jaccards.append(len(a & b) / len(a | b) if a | b else 1.0)
+    finally:
+        await llm_service.close_client()
+
+    print(f"llm analysis    {pairs} pairs   mean {statistics.mean(llm_ms):.1f} ms")
+    print(f"agreement       mean |score diff| {statistics.mean(score_diffs):.1f}   "
+          f"mean matched-skill Jaccard {statistics.mean(jaccards):.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--llm", action="store_true", help="also call the configured LLM and compare")
+    args = parser.parse_args()
+    asyncio.run(main(args.pairs, args.llm))
@@ -0,0 +1,86 @@
+"""Dashboard list load for a power user: full lists vs. paginated summary pages.
+
+Needs a reachable MongoDB (MONGODB_URI, default localhost). Seeds a throwaway
+database, ``portfolifyai_bench`` unless MONGODB_DB_NAME is set, with one user
+owning ``--docs`` resumes, portfolios and case studies, then times the list
+endpoints in-process.
+
+Run from ``backend/``:  python -m benchmarks.bench_list_endpoints --docs 2000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("MONGODB_DB_NAME", "portfolifyai_bench")
+
+import httpx  # noqa: E402  (settings must see MONGODB_DB_NAME first)
+
+from benchmarks.fixtures import sample_resume  # noqa: E402
+
+
+async def _seed(docs: int) -> str:
+    from app.database import case_studies_col, ensure_indexes, portfolios_col, resumes_col, users_col
+
+    await users_col.delete_many({"email": "bench@example.com"})
+    user = await users_col.insert_one({"email": "bench@example.com", "full_name": "Bench", "created_at": datetime.now(timezone.utc)})
+    user_id = str(user.inserted_id)
+    for col in (resumes_col, portfolios_col, case_studies_col):
+        await col.delete_many({"user_id": user_id})
+
+    base = datetime.now(timezone.utc)
+    for start in range(0, docs, 500):
+        batch = range(start, min(start + 500, docs))
+        stamps = [base - timedelta(minutes=i) for i in batch]
+        await resumes_col.insert_many([
+            {"user_id": user_id, "title": f"Resume {i}", "content": sample_resume(i), "created_at": t, "updated_at": t}
+            for i, t in zip(batch, stamps)
+        ])
+        await portfolios_col.insert_many([
+            {"user_id": user_id, "title": f"Portfolio {i}", "config": {"headline": "x" * 400, "projects": [{"name": f"P{j}", "tech": "React"} for j in range(20)]},
+             "subdomain": None, "is_published": False, "created_at": t, "updated_at": t}
+            for i, t in zip(batch, stamps)
+        ])
+        await case_studies_col.insert_many([
+            {"user_id": user_id, "title": f"Case study {i}", "inputs": {"problem": "y" * 500},
+             "generated_content": {"executive_summary": "z" * 2000}, "created_at": t, "updated_at": t}
+            for i, t in zip(batch, stamps)
+        ])
+    await ensure_indexes()
+    return user_id
+
+
+async def _time(client: httpx.AsyncClient, url: str, headers: dict, runs: int) -> tuple[float, int]:
+    samples, size = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        size = len(response.content)
+    return statistics.median(samples), size
+
+
+async def main(docs: int, runs: int):
+    from app.main import app
+    from app.utils.security import create_access_token
+
+    user_id = await _seed(docs)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+    transport = httpx.ASGITransport(app=app)
+    print(f"user with {docs} resumes / portfolios / case studies, median of {runs} runs")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for resource in ("resumes", "portfolios", "case-studies"):
+            full_ms, full_bytes = await _time(client, f"/api/{resource}", headers, runs)
+            page_ms, page_bytes = await _time(client, f"/api/{resource}?view=summary&limit=20", headers, runs)
+            print(f"{resource:<13} full {full_ms:8.1f} ms {full_bytes / 1024:9.1f} KiB   "
+                  f"summary page {page_ms:6.1f} ms {page_bytes / 1024:6.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.runs))
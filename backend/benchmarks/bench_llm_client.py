@@ -0,0 +1,67 @@
+"""Per-call latency of a fresh AsyncOpenAI client vs the shared pooled client.
+
+Run from ``backend/``:  python -m benchmarks.bench_llm_client --calls 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.stub_llm import StubServer
+
+
+def _report(label: str, samples: list[float]):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(samples):7.2f} ms   p50 {statistics.median(samples):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+async def _time_calls(make_call, calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await make_call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main(calls: int, port: int):
+    with StubServer(port=port) as stub:
+        os.environ["GROQ_API_KEY"] = "stub"
+        os.environ["GROQ_BASE_URL"] = stub.base_url
+        os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"  # measure the client, not the rate limiter
+        os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+
+        from openai import AsyncOpenAI
+        from app.services import llm_service
+
+        async def per_call_client():
+            client = AsyncOpenAI(api_key="stub", base_url=stub.base_url)
+            try:
+                await client.chat.completions.create(
+                    model="llama-3.3-70b-versatile",
+                    messages=[{"role": "user", "content": "bench"}],
+                )
+            finally:
+                await client.close()
+
+        llm_service.open_client()
+        try:
+            await llm_service.generate_text("warm-up")
+            before = await _time_calls(per_call_client, calls)
+            after = await _time_calls(lambda: llm_service.generate_text("bench"), calls)
+        finally:
+            await llm_service.close_client()
+
+    print(f"{calls} sequential calls against stub at {stub.base_url}")
+    _report("client per call", before)
+    _report("shared pooled client", after)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.port))
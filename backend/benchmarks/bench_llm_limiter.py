@@ -0,0 +1,93 @@
+"""A burst of LLM calls against a stub that enforces a quota (429 + Retry-After).
+
+Compares the raw SDK (no retries), the SDK's built-in retries, and
+generate_text behind llm_limiter, then checks that interactive calls jump
+ahead of queued background work.
+
+Run from ``backend/``:
+    python -m benchmarks.bench_llm_limiter --calls 60 --rpm 120 --stub-concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.stub_llm import StubServer
+
+
+async def _burst(make_call, calls: int) -> tuple[int, float]:
+    async def one():
+        try:
+            await make_call()
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(calls)))
+    return sum(results), time.perf_counter() - start
+
+
+async def main(calls: int, rpm: int, stub_concurrency: int, latency_ms: float, port: int):
+    with StubServer(latency_ms=latency_ms, port=port, rpm=rpm, max_concurrency=stub_concurrency) as stub:
+        os.environ["GROQ_API_KEY"] = "stub"
+        os.environ["GROQ_BASE_URL"] = stub.base_url
+        os.environ["LLM_REQUESTS_PER_MINUTE"] = str(rpm)
+        os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+        os.environ["LLM_CACHE_ENABLED"] = "false"
+
+        from openai import AsyncOpenAI
+        from app.services import llm_limiter, llm_service
+
+        def sdk_call(client):
+            return lambda: client.chat.completions.create(
+                model="llama-3.3-70b-versatile", messages=[{"role": "user", "content": "bench"}]
+            )
+
+        print(f"{calls} concurrent calls; stub allows {rpm} rpm, {stub_concurrency} in flight, {latency_ms:.0f} ms each")
+        for label, retries in (("sdk, no retries", 0), ("sdk, max_retries=2", 2)):
+            stub.app.state.recent.clear()
+            stub.app.state.rejected = 0
+            client = AsyncOpenAI(api_key="stub", base_url=stub.base_url, max_retries=retries)
+            ok, elapsed = await _burst(sdk_call(client), calls)
+            await client.close()
+            print(f"{label:<20} ok {ok:3d}/{calls}   429s {stub.app.state.rejected:4d}   {elapsed:6.2f} s")
+
+        stub.app.state.recent.clear()
+        stub.app.state.rejected = 0
+        llm_service.open_client()
+        counter = iter(range(10**9))
+        ok, elapsed = await _burst(lambda: llm_service.generate_text(f"bench {next(counter)}"), calls)
+        print(f"{'llm_limiter':<20} ok {ok:3d}/{calls}   429s {stub.app.state.rejected:4d}   {elapsed:6.2f} s")
+
+        # Priority: interactive calls issued behind a queue of background work.
+        stub.app.state.recent.clear()
+        await asyncio.sleep(1.0)  # let the stub's concurrency window drain
+        limiter = llm_limiter.default_limiter
+        limiter.requests.level, limiter.limit, limiter.paused_until = limiter.requests.capacity, 4.0, 0.0
+
+        async def timed(priority: str, i: int) -> float:
+            start = time.perf_counter()
+            with llm_limiter.priority(priority):
+                await llm_service.generate_text(f"{priority} {i}")
+            return time.perf_counter() - start
+
+        background = [asyncio.create_task(timed("background", i)) for i in range(calls)]
+        await asyncio.sleep(0.05)
+        interactive = await asyncio.gather(*(timed("interactive", i) for i in range(5)))
+        background_s = await asyncio.gather(*background)
+        await llm_service.close_client()
+        print(f"priority            interactive mean {statistics.mean(interactive):.2f} s   "
+              f"background mean {statistics.mean(background_s):.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--rpm", type=int, default=120)
+    parser.add_argument("--stub-concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.rpm, args.stub_concurrency, args.latency_ms, args.port))
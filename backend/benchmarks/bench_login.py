@@ -0,0 +1,57 @@
+"""Login burst: password verification throughput and event-loop stall.
+
+Compares bcrypt run inline on the event loop (the old behaviour) with the
+dedicated hashing executor in app.utils.security. A ticker coroutine measures
+the worst event-loop stall, i.e. how long other requests would have waited.
+
+Run from ``backend/``:  python -m benchmarks.bench_login --logins 40 --rounds 12
+"""
+import argparse
+import asyncio
+import os
+import time
+
+
+async def _ticker(stop: asyncio.Event, lags: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append((time.perf_counter() - start - 0.005) * 1000)
+
+
+async def _burst(verify, logins: int, hashed: str) -> tuple[float, float]:
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(0.02)
+    start = time.perf_counter()
+    await asyncio.gather(*(verify("correct horse battery staple", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return logins / elapsed, max(lags)
+
+
+async def main(logins: int, rounds: int, workers: int):
+    os.environ["BCRYPT_ROUNDS"] = str(rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(workers)
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = str(logins)
+    from app.utils import security
+
+    hashed = security.hash_password("correct horse battery staple")
+
+    async def inline(password, hashed_password):
+        return security.verify_password(password, hashed_password)
+
+    for label, verify in [("inline on event loop", inline), (f"executor ({workers} threads)", security.verify_password_async)]:
+        rate, worst_lag = await _burst(verify, logins, hashed)
+        print(f"{label:<24} {rate:7.1f} logins/s   worst loop stall {worst_lag:8.1f} ms")
+    security.shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds, args.workers))
@@ -0,0 +1,34 @@
+"""Estimated prompt tokens for resume payloads: indented JSON vs. prompt_format.
+
+Run from ``backend/``:
+    python -m benchmarks.bench_prompt_format --resumes 200
+"""
+import argparse
+import json
+import statistics
+import time
+
+from app.services import prompt_format
+from benchmarks.fixtures import sample_resume
+
+
+def main(resumes: int):
+    before, after, render_ms = [], [], []
+    for i in range(resumes):
+        content = sample_resume(i)
+        before.append(prompt_format.estimate_tokens(json.dumps(content, indent=2)))
+        start = time.perf_counter()
+        rendered = prompt_format.render_resume(content)
+        render_ms.append((time.perf_counter() - start) * 1000)
+        after.append(prompt_format.estimate_tokens(rendered))
+
+    saved = 1 - sum(after) / sum(before)
+    print(f"json indent=2   mean {statistics.mean(before):.0f} tokens   max {max(before)}")
+    print(f"prompt_format   mean {statistics.mean(after):.0f} tokens   max {max(after)}   ({saved:.0%} fewer)")
+    print(f"render time     mean {statistics.mean(render_ms):.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=200)
+    main(parser.parse_args().resumes)
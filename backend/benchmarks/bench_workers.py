@@ -0,0 +1,96 @@
+"""Throughput vs. gunicorn worker count, using the loadtest scenarios.
+
+For each worker count, starts ``gunicorn -c gunicorn.conf.py`` with
+WEB_CONCURRENCY set, against the LLM stub and the MongoDB at MONGODB_URI
+(database ``portfolifyai_bench`` unless MONGODB_DB_NAME is set). It then runs
+the loadtest scenarios over HTTP and reports total RPS and p95 per scenario.
+Needs a reachable MongoDB, since workers do not share the in-memory one.
+
+Run from ``backend/``:
+    python -m benchmarks.bench_workers --workers 1 2 4 --users 32 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks import loadtest
+from benchmarks.stub_llm import StubServer
+
+
+async def _wait_ready(url: str, proc: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+            try:
+                if (await client.get(f"{url}/metrics")).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready")
+
+
+async def _measure(url: str, args) -> dict[str, tuple[float, float]]:
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=httpx.Limits(max_connections=args.users * 4)) as client:
+        users = await loadtest.seed(client, args.users, args.docs)
+        totals = {}
+        for name in args.scenarios:
+            endpoints = await loadtest.run_scenario(client, name, users, args.duration)
+            rps = sum(s["rps"] for s in endpoints.values())
+            p95 = max(s["p95_ms"] for s in endpoints.values())
+            totals[name] = (rps, p95)
+    return totals
+
+
+async def main(args):
+    results = {}
+    with StubServer(latency_ms=args.llm_latency_ms, port=args.stub_port) as stub:
+        for workers in args.workers:
+            env = {
+                **os.environ,
+                "WEB_CONCURRENCY": str(workers),
+                "PORT": str(args.port),
+                "MONGODB_DB_NAME": os.environ.get("MONGODB_DB_NAME", "portfolifyai_bench"),
+                "GROQ_API_KEY": "stub",
+                "GROQ_BASE_URL": stub.base_url,
+                "LLM_REQUESTS_PER_MINUTE": "0",
+                "LLM_TOKENS_PER_MINUTE": "0",
+                "BCRYPT_ROUNDS": str(args.bcrypt_rounds),
+            }
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py"],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            url = f"http://127.0.0.1:{args.port}"
+            try:
+                await _wait_ready(url, proc)
+                results[workers] = await _measure(url, args)
+            finally:
+                proc.terminate()
+                proc.wait()
+
+    print(f"{args.users} users, {args.duration:.0f} s per scenario, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7}  " + "  ".join(f"{name + ' rps':>14} {'p95 ms':>8}" for name in args.scenarios))
+    for workers, totals in results.items():
+        print(f"{workers:>7}  " + "  ".join(f"{totals[n][0]:14.1f} {totals[n][1]:8.1f}" for n in args.scenarios))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--scenarios", nargs="+", choices=loadtest.SCENARIOS, default=["dashboard", "autosave", "login"])
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--docs", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--stub-port", type=int, default=8768)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,63 @@
+"""Deterministic synthetic resumes and job descriptions for benchmarks."""
+import random
+
+ROLES = [
+    ("Backend Engineer", ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "AWS", "Redis", "Kafka", "CI/CD"]),
+    ("Frontend Engineer", ["TypeScript", "React", "Next.js", "Tailwind CSS", "Redux", "Jest", "Accessibility", "Figma"]),
+    ("Data Engineer", ["Python", "SQL", "Spark", "Airflow", "dbt", "Snowflake", "Kafka", "AWS", "ETL"]),
+    ("ML Engineer", ["Python", "PyTorch", "TensorFlow", "Machine Learning", "NLP", "Docker", "GCP", "LLMs"]),
+    ("DevOps Engineer", ["Terraform", "Kubernetes", "Helm", "AWS", "Prometheus", "Grafana", "Linux", "GitHub Actions"]),
+    ("Full Stack Developer", ["JavaScript", "Node.js", "Express", "React", "MongoDB", "GraphQL", "Docker", "Git"]),
+]
+EXTRA = ["Go", "Java", "Azure", "Elasticsearch", "RabbitMQ", "gRPC", "Microservices", "Agile", "System Design",
+         "Mentoring", "Leadership", "Communication", "Unit Testing", "OAuth", "Vue", "Django", "MySQL"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Shipped", "Automated", "Scaled", "Refactored"]
+OBJECTS = ["a payments service", "the search pipeline", "internal tooling", "the onboarding flow",
+           "a real-time analytics dashboard", "the deployment pipeline", "our public API", "a recommendation engine"]
+
+
+def _bullet(rng: random.Random, skills: list[str]) -> str:
+    return (f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} and {rng.choice(skills)}, "
+            f"improving throughput by {rng.randint(10, 80)}% for {rng.randint(2, 50)}k users")
+
+
+def sample_resume(seed: int) -> dict:
+    rng = random.Random(seed)
+    title, core = rng.choice(ROLES)
+    skills = rng.sample(core, k=rng.randint(4, len(core))) + rng.sample(EXTRA, k=3)
+    return {
+        "firstName": "Sam",
+        "lastName": f"Candidate{seed}",
+        "title": title,
+        "email": f"sam{seed}@example.com",
+        "phone": "",
+        "location": "Remote",
+        "summary": f"{title} with {rng.randint(2, 12)} years of experience shipping production systems.",
+        "experience": [
+            {
+                "title": title,
+                "company": f"Company {seed}-{i}",
+                "location": "",
+                "dates": f"{2015 + i} - {2017 + i}",
+                "bullets": [_bullet(rng, skills) for _ in range(rng.randint(3, 6))],
+            }
+            for i in range(rng.randint(1, 4))
+        ],
+        "education": [{"degree": "B.S. Computer Science", "school": "State University", "year": "2014"}],
+        "skills": skills,
+    }
+
+
+def sample_job_description(seed: int) -> str:
+    rng = random.Random(10_000 + seed)
+    title, core = rng.choice(ROLES)
+    required = rng.sample(core, k=min(6, len(core)))
+    nice = rng.sample(EXTRA, k=3)
+    return (
+        f"Senior {title}\n\n"
+        f"We are looking for a {title} to join our platform team. You will design, build and operate services "
+        f"used by millions of customers and mentor other engineers.\n\n"
+        f"Requirements:\n" + "\n".join(f"- {rng.randint(2, 6)}+ years with {s}" for s in required) +
+        "\n\nNice to have:\n" + "\n".join(f"- {s}" for s in nice) +
+        "\n\nStrong communication skills and experience working with cross-functional stakeholders."
+    )
@@ -0,0 +1,274 @@
+"""Scripted load scenarios against the whole API, with latency percentiles and RPS per endpoint.
+
+By default the app runs in-process behind ``httpx.ASGITransport``, with its
+lifespan (indexes, LLM client, job workers) started as in production. Mongo is
+the mongomock fixture in ``memory_mongo.py`` (``--mongo memory``) or whatever
+MONGODB_URI points at (``--mongo uri``; the database defaults to
+``portfolifyai_bench`` and is not cleaned up). LLM calls go to ``stub_llm``,
+configured with ``--llm-latency-ms`` and ``--token-ms``.
+
+With ``--url`` the scenarios drive an already running server instead; start it
+against the stub and a throwaway database.
+
+Each run seeds ``--users`` accounts through the API, each owning ``--docs``
+resumes, portfolios and case studies, then runs every scenario for
+``--duration`` seconds with one closed-loop client per user:
+
+    dashboard   GET /me, the three summary lists and stored recommendations
+    autosave    PATCH of the open resume, carrying the version like the editor
+    jd-burst    POST /api/jd-analyzer/analyze (hybrid: local matcher + LLM suggestions)
+    login       POST /api/auth/login (bcrypt on the hashing executor)
+
+Run from ``backend/``:
+    python -m benchmarks.loadtest --users 20 --duration 10 --save baseline.json
+    python -m benchmarks.loadtest --users 20 --duration 10 --compare baseline.json
+    python -m benchmarks.loadtest --scenario autosave --mongo uri
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import time
+from collections import defaultdict
+from itertools import count
+
+import httpx
+
+from benchmarks.fixtures import sample_job_description, sample_resume
+from benchmarks.stub_llm import StubServer
+
+PASSWORD = "correct horse battery staple"
+SCENARIOS = ("dashboard", "autosave", "jd-burst", "login")
+
+
+class Recorder:
+    """Latencies and failures per endpoint label for one scenario."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.samples[label].append(time.perf_counter() - start)
+            self.errors[label] += 1
+            raise
+        self.samples[label].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+    def stats(self, elapsed: float) -> dict[str, dict]:
+        return {label: _summarize(samples, self.errors[label], elapsed) for label, samples in self.samples.items()}
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    return ordered[max(0, min(len(ordered) - 1, round(q * len(ordered)) - 1))]
+
+
+def _summarize(samples: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": len(ordered) / elapsed,
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+# --- Seeding -----------------------------------------------------------------
+
+def _portfolio_config(seed: int) -> dict:
+    resume = sample_resume(seed)
+    return {
+        "headline": resume["summary"],
+        "about": " ".join(b for job in resume["experience"] for b in job["bullets"]),
+        "skills": resume["skills"],
+        "projects": [{"name": f"Project {seed}-{i}", "tech": ", ".join(resume["skills"][:3])} for i in range(6)],
+    }
+
+
+async def _seed_user(client: httpx.AsyncClient, run_id: str, index: int, docs: int) -> dict:
+    email = f"load-{run_id}-{index}@example.com"
+    response = await client.post("/api/auth/signup", json={"email": email, "full_name": f"Load {index}", "password": PASSWORD})
+    response.raise_for_status()
+    user = {"email": email, "headers": {"Authorization": f"Bearer {response.json()['access_token']}"}, "resumes": []}
+
+    for i in range(docs):
+        seed = index * 1000 + i
+        response = await client.post("/api/resumes", headers=user["headers"],
+                                     json={"title": f"Resume {i}", "content": sample_resume(seed)})
+        response.raise_for_status()
+        user["resumes"].append(response.json())
+        await client.post("/api/portfolios", headers=user["headers"],
+                          json={"title": f"Portfolio {i}", "config": _portfolio_config(seed)})
+        await client.post("/api/case-studies", headers=user["headers"],
+                          json={"title": f"Case study {i}", "inputs": {"problem": sample_job_description(seed)}})
+    # Store recommendations, as a returning user would have them.
+    await client.get("/api/recommendations", headers=user["headers"])
+    return user
+
+
+async def seed(client: httpx.AsyncClient, users: int, docs: int) -> list[dict]:
+    run_id = f"{int(time.time())}"
+    gate = asyncio.Semaphore(4)
+
+    async def one(index: int) -> dict:
+        async with gate:
+            return await _seed_user(client, run_id, index, docs)
+
+    return await asyncio.gather(*(one(i) for i in range(users)))
+
+
+# --- Scenarios -----------------------------------------------------------------
+
+async def dashboard(client: httpx.AsyncClient, rec: Recorder, user: dict):
+    headers = user["headers"]
+    await rec.request(client, "GET /api/auth/me", "GET", "/api/auth/me", headers=headers)
+    await asyncio.gather(
+        rec.request(client, "GET /api/resumes?view=summary", "GET", "/api/resumes?view=summary&limit=20", headers=headers),
+        rec.request(client, "GET /api/portfolios?view=summary", "GET", "/api/portfolios?view=summary&limit=20", headers=headers),
+        rec.request(client, "GET /api/case-studies?view=summary", "GET", "/api/case-studies?view=summary&limit=20", headers=headers),
+    )
+    await rec.request(client, "GET /api/recommendations", "GET", "/api/recommendations", headers=headers)
+
+
+_edits = count()
+
+
+async def autosave(client: httpx.AsyncClient, rec: Recorder, user: dict):
+    resume = user["resumes"][0]
+    edit = next(_edits)
+    body = {"set": {"content.summary": f"Edited summary, revision {edit}."}, "version": resume["version"]}
+    response = await rec.request(client, "PATCH /api/resumes/{id}", "PATCH", f"/api/resumes/{resume['id']}",
+                                 headers=user["headers"], json=body)
+    if response.status_code == 200:
+        resume["version"] = response.json()["version"]
+    elif response.status_code == 409:
+        resume["version"] = response.json()["detail"]["version"]
+
+
+_jds = count()
+
+
+async def jd_burst(client: httpx.AsyncClient, rec: Recorder, user: dict):
+    body = {"job_description": sample_job_description(next(_jds)), "resume_id": user["resumes"][0]["id"], "mode": "hybrid"}
+    await rec.request(client, "POST /api/jd-analyzer/analyze", "POST", "/api/jd-analyzer/analyze",
+                      headers=user["headers"], json=body)
+
+
+async def login(client: httpx.AsyncClient, rec: Recorder, user: dict):
+    await rec.request(client, "POST /api/auth/login", "POST", "/api/auth/login",
+                      json={"email": user["email"], "password": PASSWORD})
+
+
+STEPS = {"dashboard": dashboard, "autosave": autosave, "jd-burst": jd_burst, "login": login}
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, users: list[dict], duration: float) -> dict[str, dict]:
+    rec, step = Recorder(), STEPS[name]
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user(user: dict):
+        while time.perf_counter() < deadline:
+            with contextlib.suppress(httpx.HTTPError):
+                await step(client, rec, user)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(u) for u in users))
+    return rec.stats(time.perf_counter() - start)
+
+
+# --- Reporting -------------------------------------------------------------------
+
+def report(results: dict[str, dict[str, dict]], baseline: dict):
+    print(f"{'endpoint':<36} {'reqs':>6} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for scenario, endpoints in results.items():
+        print(f"[{scenario}]")
+        for label, s in endpoints.items():
+            print(f"{label:<36} {s['requests']:6d} {s['errors']:5d} {s['rps']:8.1f} "
+                  f"{s['p50_ms']:8.1f} {s['p95_ms']:8.1f} {s['p99_ms']:8.1f} {s['max_ms']:8.1f}")
+            before = baseline.get(scenario, {}).get(label)
+            if before:
+                print(f"{'  vs baseline':<36} {'':6} {'':5} {_delta(s['rps'], before['rps']):>8} "
+                      f"{_delta(s['p50_ms'], before['p50_ms']):>8} {_delta(s['p95_ms'], before['p95_ms']):>8} "
+                      f"{_delta(s['p99_ms'], before['p99_ms']):>8}")
+
+
+def _delta(now: float, before: float) -> str:
+    return f"{(now - before) / before:+.0%}" if before else "n/a"
+
+
+# --- Setup -----------------------------------------------------------------------
+
+@contextlib.asynccontextmanager
+async def in_process_client(args):
+    with StubServer(latency_ms=args.llm_latency_ms, token_ms=args.token_ms, port=args.stub_port) as stub:
+        os.environ.setdefault("MONGODB_DB_NAME", "portfolifyai_bench")
+        os.environ["GROQ_API_KEY"] = "stub"
+        os.environ["GROQ_BASE_URL"] = stub.base_url
+        os.environ["LLM_REQUESTS_PER_MINUTE"] = str(args.llm_rpm)
+        os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+        if args.mongo == "memory":
+            from benchmarks import memory_mongo
+            memory_mongo.install()
+        from app.main import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                yield client
+
+
+async def main(args):
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    baseline = json.load(open(args.compare)) if args.compare else {}
+
+    if args.url:
+        session = httpx.AsyncClient(base_url=args.url, timeout=60,
+                                    limits=httpx.Limits(max_connections=args.users * 4))
+    else:
+        session = in_process_client(args)
+
+    async with session as client:
+        start = time.perf_counter()
+        users = await seed(client, args.users, args.docs)
+        print(f"seeded {args.users} users x {args.docs} resumes/portfolios/case studies "
+              f"in {time.perf_counter() - start:.1f} s; {args.duration:.0f} s per scenario")
+        results = {}
+        for name in scenarios:
+            results[name] = await run_scenario(client, name, users, args.duration)
+
+    report(results, baseline)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"saved results to {args.save}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=("all",) + SCENARIOS, default="all")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--docs", type=int, default=5, help="resumes, portfolios and case studies per user")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--mongo", choices=("memory", "uri"), default="memory")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=0.0, help="stub generation time per word")
+    parser.add_argument("--llm-rpm", type=int, default=0, help="client-side LLM quota; 0 measures the app alone")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--stub-port", type=int, default=8767)
+    parser.add_argument("--save", help="write results as JSON, e.g. a baseline")
+    parser.add_argument("--compare", help="baseline JSON from --save to diff against")
+    asyncio.run(main(parser.parse_args()))
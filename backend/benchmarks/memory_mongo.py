@@ -0,0 +1,96 @@
+"""In-memory MongoDB for benchmarks, built on mongomock.
+
+``install()`` makes ``app.database`` hand out async wrappers over one mongomock
+database instead of a real client. Call it before the app first touches a
+collection.
+
+mongomock answers in microseconds and has no network hop, so absolute
+numbers are optimistic. Use it to compare the app against itself, and a real
+mongod (``--mongo uri``) when database cost matters.
+"""
+import os
+
+import mongomock
+
+
+class AsyncCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._iter = None
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, count: int):
+        self._cursor = self._cursor.skip(count)
+        return self
+
+    def limit(self, count: int):
+        self._cursor = self._cursor.limit(count)
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self._cursor)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length=None):
+        docs = list(self._cursor)
+        return docs if length is None else docs[:length]
+
+
+class AsyncCollection:
+    """The subset of pymongo's AsyncCollection the app uses, answered synchronously."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.name = collection.name
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+        if not callable(method):
+            return method
+
+        async def call(*args, **kwargs):
+            kwargs.pop("session", None)
+            return method(*args, **kwargs)
+
+        return call
+
+
+class AsyncDatabase:
+    def __init__(self, database):
+        self._database = database
+
+    def __getitem__(self, name: str) -> AsyncCollection:
+        return AsyncCollection(self._database[name])
+
+    async def command(self, *args, **kwargs):
+        return {"ok": 1.0}
+
+
+class AsyncClient:
+    def __init__(self):
+        self._client = mongomock.MongoClient()
+
+    def __getitem__(self, name: str) -> AsyncDatabase:
+        return AsyncDatabase(self._client[name])
+
+    async def close(self):
+        pass
+
+
+def install() -> AsyncDatabase:
+    import app.database as database
+
+    database._client, database._client_pid = AsyncClient(), os.getpid()
+    return database.get_db()
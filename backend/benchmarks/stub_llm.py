@@ -0,0 +1,143 @@
+"""Local OpenAI-compatible stub server for benchmarks.
+
+Serves ``POST /v1/chat/completions`` with a canned reply after a configurable
+delay, so client-side overhead can be measured without touching Groq. Streaming
+requests (``stream: true``) emit one chunk per word, ``token_ms`` apart; other
+requests wait ``token_ms`` per word before answering, as if generating. JSON
+mode requests get ``JSON_REPLY``, which fits the JD analysis and recommendations
+schemas.
+
+``rpm`` and ``max_concurrency`` emulate provider quotas: requests over either
+get a 429 with Retry-After, like Groq does.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+REPLY = "Led migration of 12 services to Kubernetes, cutting deploy time by 40%."
+JSON_REPLY = json.dumps({
+    "match_score": 72,
+    "matched_skills": ["Python", "Docker", "AWS"],
+    "missing_skills": ["Kubernetes", "Terraform"],
+    "suggestions": [
+        {"title": "Add Kubernetes", "description": "Mention the clusters you operated and their scale."},
+        {"title": "Quantify impact", "description": "Lead bullets with the metric you moved."},
+    ],
+    "competitiveness_score": 64,
+    "action_items": [{"title": "Publish a portfolio", "description": "Link two case studies.", "priority": "high"}],
+    "interview_probability_boost": "+12%",
+})
+
+
+def _stream_chunks(model: str, token_ms: float):
+    async def chunks():
+        for i, word in enumerate(REPLY.split(" ")):
+            if token_ms:
+                await asyncio.sleep(token_ms / 1000)
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return chunks()
+
+
+def _rate_limited(retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+        headers={"retry-after": f"{retry_after:.2f}"},
+    )
+
+
+def create_app(latency_ms: float = 0.0, token_ms: float = 0.0, rpm: int = 0, max_concurrency: int = 0) -> FastAPI:
+    app = FastAPI()
+    app.state.in_flight = 0
+    app.state.recent = deque()  # request timestamps within the last minute
+    app.state.rejected = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        now = time.monotonic()
+        recent = app.state.recent
+        while recent and now - recent[0] > 60:
+            recent.popleft()
+        if rpm and len(recent) >= rpm:
+            app.state.rejected += 1
+            return _rate_limited(60 - (now - recent[0]))
+        if max_concurrency and app.state.in_flight >= max_concurrency:
+            app.state.rejected += 1
+            return _rate_limited(1.0)
+        recent.append(now)
+        app.state.in_flight += 1
+        try:
+            if latency_ms:
+                await asyncio.sleep(latency_ms / 1000)
+        finally:
+            app.state.in_flight -= 1
+        if body.get("stream"):
+            return StreamingResponse(_stream_chunks(body.get("model", "stub"), token_ms), media_type="text/event-stream")
+        json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+        reply = JSON_REPLY if json_mode else REPLY
+        if token_ms:
+            await asyncio.sleep(len(reply.split()) * token_ms / 1000)
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}
+            ],
+            "usage": {"prompt_tokens": 50, "completion_tokens": 20, "total_tokens": 70},
+        }
+
+    return app
+
+
+class StubServer:
+    """Run the stub app on a background thread; use as a context manager."""
+
+    def __init__(self, latency_ms: float = 0.0, port: int = 8765, token_ms: float = 0.0,
+                 rpm: int = 0, max_concurrency: int = 0):
+        self.port = port
+        self.base_url = f"http://127.0.0.1:{port}/v1"
+        self.app = create_app(latency_ms, token_ms, rpm, max_concurrency)
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self._server.should_exit = True
+        self._thread.join()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--token-ms", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0)
+    parser.add_argument("--max-concurrency", type=int, default=0)
+    args = parser.parse_args()
+    app = create_app(args.latency_ms, args.token_ms, args.rpm, args.max_concurrency)
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
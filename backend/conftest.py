@@ -0,0 +1 @@
+# Lets `pytest` run from backend/ and import the ``app`` package without installing it.
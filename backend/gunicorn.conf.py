@@ -0,0 +1,47 @@
+"""Gunicorn settings for running several Uvicorn workers per instance.
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+WEB_CONCURRENCY sets the worker count (default 1). Indexes are created once
+here, in the master before any worker starts, and workers skip the per-boot
+check. Every worker opens its own MongoDB pool (MONGODB_MAX_POOL_SIZE each) and
+gets its share of the LLM quotas, so size both for the whole instance.
+
+With more than one worker, SHARED_CACHE_INVALIDATION is switched on: each
+worker keeps its own auth, portfolio, export and search caches, and without it
+a write in one worker leaves the others serving stale entries until they expire.
+"""
+import asyncio
+import os
+
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+timeout = 120
+graceful_timeout = 30
+
+
+def on_starting(server):
+    from app.config import get_settings
+    from app.database import close_client, create_indexes
+
+    async def ensure_indexes():
+        try:
+            await create_indexes()
+            server.log.info("MongoDB indexes ensured")
+        except Exception as e:
+            server.log.warning(f"Could not create indexes: {e}")
+        finally:
+            await close_client()
+
+    settings = get_settings()
+    if workers > 1:
+        # Before create_indexes, which adds the TTL index on the invalidation log when this is on.
+        os.environ["SHARED_CACHE_INVALIDATION"] = "true"
+        settings.SHARED_CACHE_INVALIDATION = True
+    if settings.ENSURE_INDEXES_ON_STARTUP:
+        asyncio.run(ensure_indexes())
+    # Workers inherit both: the environment when they import the app after the
+    # fork, the cached settings when it was preloaded.
+    os.environ["ENSURE_INDEXES_ON_STARTUP"] = "false"
+    settings.ENSURE_INDEXES_ON_STARTUP = False
@@ -0,0 +1,57 @@
+import pytest
+from pydantic import ValidationError
+from app.routers.jd_analyzer import JDBatchRequest
+from app.services import ats_matcher
+
+JD = """Senior Backend Engineer
+We need strong Python and PostgreSQL experience. You will build REST APIs with FastAPI,
+run services on Kubernetes and AWS, and stream events through Kafka. Python is essential."""
+
+STRONG = {
+    "title": "Backend Engineer",
+    "skills": ["Python", "FastAPI", "Postgres", "Kubernetes", "AWS", "Kafka"],
+    "experience": [{"title": "Engineer", "bullets": ["Built RESTful APIs in Python serving 2M requests a day"]}],
+}
+WEAK = {"title": "Designer", "skills": ["Figma", "Sketch"], "experience": [{"bullets": ["Designed onboarding flows"]}]}
+
+
+def test_extracts_canonical_skills_through_aliases():
+    skills = ats_matcher.extract_skills(ats_matcher._raw_tokens("Postgres, k8s and ReactJS; node.js or golang"))
+    assert {"PostgreSQL", "React", "Node.js", "Go"} <= set(skills)
+
+
+def test_everyday_words_only_match_case_sensitive_skills_when_capitalized():
+    assert "Go" not in ats_matcher.extract_skills(ats_matcher._raw_tokens("ready to go live"))
+    assert "Go" in ats_matcher.extract_skills(ats_matcher._raw_tokens("services written in Go"))
+
+
+def test_matched_and_missing_skills_follow_jd_prominence():
+    result = ats_matcher.analyze(JD, {"skills": ["Kafka"]})
+    assert result["matched_skills"] == ["Kafka"]
+    assert result["missing_skills"][0] == "Python"  # mentioned twice in the JD
+    assert "Kafka" not in result["missing_skills"]
+
+
+def test_scores_are_bounded_and_ordered():
+    strong, weak = ats_matcher.analyze(JD, STRONG), ats_matcher.analyze(JD, WEAK)
+    assert 0 <= weak["match_score"] < strong["match_score"] <= 100
+    assert strong["missing_skills"] == []
+
+
+def test_empty_inputs_score_zero():
+    assert ats_matcher.analyze("", {})["match_score"] == 0
+    assert ats_matcher.analyze(JD, {})["match_score"] == 0
+
+
+def test_rankings_keep_original_indexes_best_first():
+    ranked = ats_matcher.rank_resumes(JD, [WEAK, STRONG])
+    assert [r["index"] for r in ranked] == [1, 0]
+    ranked = ats_matcher.rank_job_descriptions(STRONG, ["Figma designer", JD])
+    assert [r["index"] for r in ranked] == [1, 0]
+
+
+def test_batch_request_rejects_negative_suggestion_count():
+    # A negative k used to slice suggestions from the end and bypass JD_BATCH_MAX_SUGGESTIONS.
+    with pytest.raises(ValidationError):
+        JDBatchRequest(resume_id="x", job_descriptions=[JD], top_k_suggestions=-3)
+    assert JDBatchRequest(resume_id="x", job_descriptions=[JD]).top_k_suggestions == 0
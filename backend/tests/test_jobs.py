@@ -0,0 +1,42 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from app.services import cache_sync, jobs, llm_service
+
+mongomock = pytest.importorskip("mongomock")
+from benchmarks.memory_mongo import AsyncCollection  # noqa: E402
+
+
+@pytest.fixture
+def jobs_col(monkeypatch):
+    collection = mongomock.MongoClient().db.jobs
+    monkeypatch.setattr(jobs, "jobs_col", AsyncCollection(collection))
+    monkeypatch.setattr(jobs.settings, "JOB_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(jobs, "_handlers", dict(jobs._handlers))
+    return collection
+
+
+def _run_failing(jobs_col, error: Exception, attempts: int = 1) -> dict:
+    async def handler(job):
+        raise error
+
+    jobs.register("test.failing", handler)
+    now = datetime.now(timezone.utc)
+    job = {"kind": "test.failing", "user_id": "u", "payload": {}, "status": "running", "attempts": attempts,
+           "created_at": now, "run_at": now, "started_at": now, "worker": cache_sync.WORKER_ID}
+    job["_id"] = jobs_col.insert_one(job).inserted_id
+    asyncio.run(jobs._run(job))
+    return jobs_col.find_one({"_id": job["_id"]})
+
+
+def test_malformed_llm_reply_is_retried(jobs_col):
+    assert _run_failing(jobs_col, llm_service.LLMOutputError("bad reply"))["status"] == "queued"
+
+
+def test_other_value_errors_fail_at_once(jobs_col):
+    assert _run_failing(jobs_col, ValueError("no API key"))["status"] == "failed"
+
+
+def test_transient_errors_fail_after_the_last_attempt(jobs_col):
+    assert _run_failing(jobs_col, RuntimeError("boom"))["status"] == "queued"
+    assert _run_failing(jobs_col, llm_service.LLMOutputError("bad reply"), attempts=2)["status"] == "failed"
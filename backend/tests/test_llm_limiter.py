@@ -0,0 +1,161 @@
+import asyncio
+import httpx
+import openai
+import pytest
+from app.services import llm_limiter
+from app.services.llm_limiter import Limiter, LLMOverloadedError, TokenBucket
+
+
+def _rate_limit_error() -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://llm.test/v1/chat/completions")
+    return openai.RateLimitError("slow down", response=httpx.Response(429, request=request), body=None)
+
+
+def test_waiters_are_granted_by_priority_then_arrival():
+    async def scenario():
+        limiter = Limiter(0, 0, max_concurrency=1)
+        held = await limiter.acquire(1, "interactive")
+        order = []
+
+        async def wait(name, priority):
+            permit = await limiter.acquire(1, priority)
+            order.append(name)
+            limiter.release(permit, "ok")
+
+        tasks = [
+            asyncio.create_task(wait("background", "background")),
+            asyncio.create_task(wait("batch", "batch")),
+            asyncio.create_task(wait("interactive-1", "interactive")),
+            asyncio.create_task(wait("interactive-2", "interactive")),
+        ]
+        await asyncio.sleep(0)
+        limiter.release(held, "ok")
+        await asyncio.gather(*tasks)
+        return order, limiter.in_flight
+
+    order, in_flight = asyncio.run(scenario())
+    assert order == ["interactive-1", "interactive-2", "batch", "background"]
+    assert in_flight == 0
+
+
+def test_acquire_times_out_without_leaking_a_slot():
+    async def scenario():
+        limiter = Limiter(0, 0, max_concurrency=1)
+        held = await limiter.acquire(1, "interactive")
+        with pytest.raises(LLMOverloadedError):
+            await limiter.acquire(1, "interactive", timeout=0.01)
+        limiter.release(held, "ok")
+        again = await asyncio.wait_for(limiter.acquire(1, "interactive"), 1)
+        limiter.release(again, "ok")
+        return limiter.in_flight
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_cancelled_waiter_is_skipped():
+    async def scenario():
+        limiter = Limiter(0, 0, max_concurrency=1)
+        held = await limiter.acquire(1, "interactive")
+        waiter = asyncio.create_task(limiter.acquire(1, "interactive"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release(held, "ok")
+        return limiter.in_flight, len(limiter._waiters)
+
+    assert asyncio.run(scenario()) == (0, 0)
+
+
+def test_overload_halves_the_concurrency_limit_and_success_grows_it():
+    async def scenario():
+        limiter = Limiter(0, 0, max_concurrency=8)
+        permit = await limiter.acquire(1, "interactive")
+        limiter.release(permit, "overloaded")
+        after_overload = limiter.limit
+        permit = await limiter.acquire(1, "interactive")
+        limiter.release(permit, "ok")
+        return after_overload, limiter.limit
+
+    after_overload, after_ok = asyncio.run(scenario())
+    assert after_overload == 4
+    assert 4 < after_ok <= 8
+
+
+def test_token_bucket_waits_for_refill_and_accepts_refunds():
+    bucket = TokenBucket(60)  # one per second
+    assert bucket.wait_time(60) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1, abs=0.05)
+    bucket.take(-30)
+    assert bucket.wait_time(30) == 0
+    assert TokenBucket(0).wait_time(10**9) == 0
+
+
+def test_per_worker_splits_quotas(monkeypatch):
+    monkeypatch.setattr(llm_limiter.settings, "WEB_CONCURRENCY", 4)
+    assert llm_limiter.per_worker(100) == 25
+    assert llm_limiter.per_worker(2) == 1
+    assert llm_limiter.per_worker(0) == 0
+
+
+def test_admit_times_out_interactive_callers(monkeypatch):
+    monkeypatch.setattr(llm_limiter.settings, "LLM_QUEUE_TIMEOUT_SECONDS", 0.01)
+
+    async def scenario():
+        limiter = Limiter(0, 0, max_concurrency=1)
+        held = await limiter.acquire(1, "interactive")
+
+        async def request():
+            return "reply"
+
+        try:
+            await llm_limiter.admit(request, 1, limiter)
+        finally:
+            limiter.release(held, "ok")
+
+    with pytest.raises(LLMOverloadedError):
+        asyncio.run(scenario())
+
+
+def test_admit_retries_rate_limits_then_succeeds(monkeypatch):
+    monkeypatch.setattr(llm_limiter.settings, "LLM_RETRY_BASE_SECONDS", 0.0)
+    calls = []
+
+    async def request():
+        calls.append(1)
+        if len(calls) == 1:
+            raise _rate_limit_error()
+        return "reply"
+
+    async def scenario():
+        limiter = Limiter(0, 0, max_concurrency=4)
+        result, permit = await llm_limiter.admit(request, 1, limiter)
+        llm_limiter.finish(permit)
+        return result, limiter
+
+    result, limiter = asyncio.run(scenario())
+    assert result == "reply" and len(calls) == 2
+    assert limiter.in_flight == 0 and limiter.limit < 4
+
+
+def test_admit_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(llm_limiter.settings, "LLM_RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(llm_limiter.settings, "LLM_MAX_RETRIES", 1)
+
+    async def request():
+        raise _rate_limit_error()
+
+    with pytest.raises(LLMOverloadedError):
+        asyncio.run(llm_limiter.admit(request, 1, Limiter(0, 0, max_concurrency=4)))
+
+
+def test_admit_does_not_retry_other_errors():
+    calls = []
+
+    async def request():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(llm_limiter.admit(request, 1, Limiter(0, 0, max_concurrency=4)))
+    assert len(calls) == 1
@@ -0,0 +1,47 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException, Response
+from app.utils.pagination import decode_cursor, encode_cursor, find_page
+
+
+def test_cursor_round_trip():
+    doc = {"_id": ObjectId(), "updated_at": datetime(2026, 1, 2, 3, 4, 5, 678000)}
+    clause = decode_cursor(encode_cursor(doc))
+    assert clause == {"$or": [
+        {"updated_at": {"$lt": doc["updated_at"]}},
+        {"updated_at": doc["updated_at"], "_id": {"$lt": doc["_id"]}},
+    ]}
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm9wZQ", encode_cursor({"_id": "x" * 24, "updated_at": datetime.now()})])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_pages_cover_every_document_once_newest_first():
+    mongomock = pytest.importorskip("mongomock")
+    from benchmarks.memory_mongo import AsyncCollection
+
+    collection = AsyncCollection(mongomock.MongoClient().db.docs)
+    base = datetime(2026, 1, 1)
+    # Ties on updated_at are broken by _id, so they must not be skipped or repeated across pages.
+    docs = [{"_id": ObjectId(), "user_id": "u", "updated_at": base + timedelta(minutes=i // 2)} for i in range(7)]
+    collection._collection.insert_many([dict(d) for d in docs] + [{"_id": ObjectId(), "user_id": "other", "updated_at": base}])
+
+    async def all_pages():
+        seen, cursor = [], None
+        while True:
+            response = Response()
+            page = await find_page(collection, {"user_id": "u"}, response, limit=2, cursor=cursor)
+            seen.extend(page)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return seen
+
+    seen = asyncio.run(all_pages())
+    expected = sorted(docs, key=lambda d: (d["updated_at"], d["_id"]), reverse=True)
+    assert [d["_id"] for d in seen] == [d["_id"] for d in expected]
@@ -0,0 +1,74 @@
+import pytest
+from fastapi import HTTPException
+from app.utils.patching import DocumentPatch, build_update, version_filter
+
+ROOTS = {"title": str, "content": dict}
+
+
+def test_set_and_unset_become_one_update_with_a_version_bump():
+    patch = DocumentPatch(set={"content.experience.0.bullets.2": "Cut costs", "title": "CV"}, unset=["content.skills"])
+    assert build_update(patch, ROOTS) == {
+        "$inc": {"version": 1},
+        "$set": {"content.experience.0.bullets.2": "Cut costs", "title": "CV"},
+        "$unset": {"content.skills": ""},
+    }
+
+
+@pytest.mark.parametrize("path", [
+    "user_id",              # outside the allowed roots
+    "version",
+    "content..summary",     # empty segment
+    "content.$where",       # operator injection
+    "$set",
+    "",
+])
+def test_invalid_paths_are_rejected(path):
+    with pytest.raises(HTTPException) as exc:
+        build_update(DocumentPatch(set={path: 1}), ROOTS)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("patch", [
+    DocumentPatch(set={"content": {}, "content.skills": []}),
+    DocumentPatch(set={"content.summary": "a"}, unset=["content.summary"]),
+    DocumentPatch(set={"content.experience.0": {}}, unset=["content.experience.0.bullets"]),
+])
+def test_overlapping_paths_are_rejected(patch):
+    with pytest.raises(HTTPException) as exc:
+        build_update(patch, ROOTS)
+    assert "Conflicting" in exc.value.detail
+
+
+@pytest.mark.parametrize("patch", [
+    DocumentPatch(unset=["title"]),
+    DocumentPatch(unset=["content"]),
+    DocumentPatch(set={"content": "oops"}),
+    DocumentPatch(set={"content": None}),
+    DocumentPatch(set={"title": ["CV"]}),
+])
+def test_roots_cannot_be_removed_or_replaced_with_the_wrong_type(patch):
+    with pytest.raises(HTTPException) as exc:
+        build_update(patch, ROOTS)
+    assert exc.value.status_code == 400
+
+
+def test_roots_can_be_replaced_with_the_right_type():
+    update = build_update(DocumentPatch(set={"title": "CV", "content": {"summary": "Hi"}}), ROOTS)
+    assert update["$set"] == {"title": "CV", "content": {"summary": "Hi"}}
+
+
+def test_sibling_paths_sharing_a_prefix_are_not_conflicts():
+    update = build_update(DocumentPatch(set={"content.skill": 1, "content.skills": 2}), ROOTS)
+    assert set(update["$set"]) == {"content.skill", "content.skills"}
+
+
+def test_empty_patch_is_rejected():
+    with pytest.raises(HTTPException):
+        build_update(DocumentPatch(), ROOTS)
+
+
+def test_version_filter():
+    assert version_filter(None) == {}
+    assert version_filter(3) == {"version": 3}
+    # Documents from before versioning have no field and count as version 0.
+    assert version_filter(0) == {"version": {"$in": [0, None]}}
@@ -0,0 +1,45 @@
+import asyncio
+import pytest
+from bson import ObjectId
+from app.services import public_portfolios
+
+mongomock = pytest.importorskip("mongomock")
+from benchmarks.memory_mongo import AsyncCollection  # noqa: E402
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock.MongoClient().db
+    monkeypatch.setattr(public_portfolios, "portfolios_col", AsyncCollection(database.portfolios))
+    monkeypatch.setattr(public_portfolios, "portfolio_snapshots_col", AsyncCollection(database.portfolio_snapshots))
+    monkeypatch.setattr(public_portfolios, "_snapshots", public_portfolios.TTLCache(100, 60))
+    return database
+
+
+def _portfolio(subdomain: str, published: bool = True) -> dict:
+    return {"_id": ObjectId(), "user_id": "u", "title": "Mine", "subdomain": subdomain, "is_published": published,
+            "config": {"headline": "Hello"}}
+
+
+def test_published_portfolio_without_snapshot_is_backfilled(db):
+    db.portfolios.insert_one(_portfolio("jane"))
+    snapshot = asyncio.run(public_portfolios.get_snapshot("jane"))
+    assert snapshot and "Hello" in snapshot["html"]
+    assert db.portfolio_snapshots.find_one({"_id": "jane"})["etag"] == snapshot["etag"]
+
+
+def test_legacy_mixed_case_subdomain_is_found_and_keyed_lowercase(db):
+    doc = _portfolio("JaneDoe")
+    db.portfolios.insert_one(doc)
+    assert asyncio.run(public_portfolios.get_snapshot("janedoe"))["portfolio_id"] == str(doc["_id"])
+    assert db.portfolio_snapshots.find_one({"_id": "janedoe"})
+
+    asyncio.run(public_portfolios.sync_snapshot({**doc, "is_published": False}))
+    assert db.portfolio_snapshots.count_documents({}) == 0
+
+
+def test_unpublished_and_unknown_subdomains_stay_missing(db):
+    db.portfolios.insert_many([_portfolio("draft", published=False), _portfolio("jane")])
+    assert asyncio.run(public_portfolios.get_snapshot("draft")) is None
+    assert asyncio.run(public_portfolios.get_snapshot("j.*")) is None  # not a pattern
+    assert db.portfolio_snapshots.count_documents({}) == 0
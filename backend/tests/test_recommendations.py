@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from bson import ObjectId
+from app.services import jobs, llm_service, recommendations
+
+mongomock = pytest.importorskip("mongomock")
+from benchmarks.memory_mongo import AsyncCollection  # noqa: E402
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock.MongoClient().db
+    for module, name in ((recommendations, "resumes_col"), (recommendations, "portfolios_col"),
+                         (recommendations, "recommendations_col"), (jobs, "jobs_col")):
+        monkeypatch.setattr(module, name, AsyncCollection(database[name[:-4]]))
+    calls = []
+
+    async def fake_recommendations(resumes, portfolios):
+        calls.append(resumes)
+        return {"run": len(calls)}
+
+    monkeypatch.setattr(llm_service, "get_recommendations", fake_recommendations)
+    database.calls = calls
+    return database
+
+
+def _edit(db, resume_id, minute: int):
+    updated_at = datetime(2026, 1, 1, 0, minute, tzinfo=timezone.utc)
+    db.resumes.update_one({"_id": resume_id}, {"$set": {"user_id": "u", "title": "CV", "updated_at": updated_at}}, upsert=True)
+
+
+def test_first_read_computes_then_serves_stored(db):
+    _edit(db, ObjectId(), 0)
+    assert asyncio.run(recommendations.get("u")) == {"run": 1}
+    assert asyncio.run(recommendations.get("u")) == {"run": 1}
+    assert len(db.calls) == 1
+
+
+def test_stale_read_serves_stored_result_and_queues_one_refresh(db):
+    resume_id = ObjectId()
+    _edit(db, resume_id, 0)
+    asyncio.run(recommendations.get("u"))
+    _edit(db, resume_id, 1)
+
+    assert asyncio.run(recommendations.get("u")) == {"run": 1}
+    assert asyncio.run(recommendations.get("u")) == {"run": 1}
+    assert len(db.calls) == 1
+    queued = list(db.jobs.find({"kind": "recommendations.refresh", "user_id": "u", "status": "queued"}))
+    assert len(queued) == 1
+
+    assert asyncio.run(recommendations._refresh_job(queued[0])) == {"run": 2}
+    assert asyncio.run(recommendations.get("u")) == {"run": 2}
+
+
+def test_explicit_job_recomputes_a_stale_result(db):
+    resume_id = ObjectId()
+    _edit(db, resume_id, 0)
+    asyncio.run(recommendations.get("u"))
+    _edit(db, resume_id, 1)
+    assert asyncio.run(recommendations.get("u", stale_ok=False)) == {"run": 2}
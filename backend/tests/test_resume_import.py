@@ -0,0 +1,157 @@
+import io
+import zipfile
+import zlib
+import pypdf
+import pytest
+from app.services import document_text, resume_parser, resume_render
+
+RESUME = {
+    "firstName": "Ann", "lastName": "Lee", "title": "Senior Engineer",
+    "email": "ann@x.io", "phone": "+1 555 123 4567", "location": "Berlin, Germany",
+    "summary": "Builds things (fast) & well.",
+    "experience": [
+        {"title": "Staff Engineer", "company": "Acme", "location": "Remote", "dates": "Jan 2020 - Present",
+         "bullets": ["Led migration of 40 services to Kubernetes, cutting costs 30%.", "Mentored 5 engineers"]},
+        {"title": "Engineer", "company": "Foo Corp", "location": "", "dates": "2016 - 2019",
+         "bullets": ["Built Kafka pipelines"]},
+    ],
+    "education": [{"degree": "BSc Computer Science", "school": "TU Berlin", "year": "2016"}],
+    "skills": ["Python", "Go", "Kafka"],
+}
+
+
+def _exported(template: str) -> dict:
+    """What survives an export: the compact template drops the summary and job locations."""
+    if template == "classic":
+        return RESUME
+    return {**RESUME, "summary": "", "experience": [{**job, "location": ""} for job in RESUME["experience"]]}
+
+
+def _write(tmp_path, data: bytes, name: str = "upload") -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("fmt", ["pdf", "docx"])
+@pytest.mark.parametrize("template", resume_render.TEMPLATES)
+def test_exported_resume_imports_back(tmp_path, template, fmt):
+    path = _write(tmp_path, resume_render.render(RESUME, template, fmt))
+    result = resume_parser.parse_file(path, max_pages=10, max_bytes=10 ** 7)
+    assert result["kind"] == fmt and result["warnings"] == []
+    assert result["content"] == _exported(template)
+
+
+def test_parse_text_heuristics():
+    text = "\n".join([
+        "Jane Doe",
+        "Data Engineer",
+        "jane@example.com | +44 20 7946 0958 | London",
+        "",
+        "Work Experience",
+        "Senior Data Engineer — Initech, 2019 – present",
+        "• Built the ingestion platform serving",
+        "  forty internal teams",
+        "• Cut warehouse spend by 25%.",
+        "EDUCATION",
+        "University of Leeds",
+        "MSc Data Science, 2018",
+        "Technical Skills",
+        "Languages: Python, SQL; Scala",
+        "Tools: Airflow / dbt, python",
+        "Interests",
+        "Climbing",
+    ])
+    content = resume_parser.parse_text(text)["content"]
+    assert (content["firstName"], content["lastName"], content["title"]) == ("Jane", "Doe", "Data Engineer")
+    assert (content["email"], content["phone"], content["location"]) == ("jane@example.com", "+44 20 7946 0958", "London")
+    assert content["experience"] == [{
+        "title": "Senior Data Engineer", "company": "Initech", "location": "", "dates": "2019 – present",
+        "bullets": ["Built the ingestion platform serving forty internal teams", "Cut warehouse spend by 25%."],
+    }]
+    assert content["education"] == [{"degree": "MSc Data Science", "school": "University of Leeds", "year": "2018"}]
+    assert content["skills"] == ["Python", "SQL", "Scala", "Airflow", "dbt"]
+
+
+def test_parse_text_warnings():
+    assert resume_parser.parse_text("")["warnings"]
+    assert resume_parser.parse_text("Jane Doe\nEngineer")["warnings"]
+
+
+def test_sniff():
+    assert document_text.sniff(b"\n%PDF-1.7") == "pdf"
+    assert document_text.sniff(b"PK\x03\x04rest") == "docx"
+    assert document_text.sniff(b"plain text") is None
+
+
+def test_unsupported_file_type(tmp_path):
+    with pytest.raises(document_text.UnsupportedDocument):
+        document_text.extract_text(_write(tmp_path, b"just some text"), 10, 10 ** 7)
+
+
+@pytest.mark.parametrize("data", [
+    b"%PDF-1.4\n%garbage\n1 0 obj << /Type /Catalog",
+    b"%PDF-1.4\n" + bytes(range(256)) * 4,
+    b"PK\x03\x04not really a zip",
+])
+def test_malformed_files_raise_document_error(tmp_path, data):
+    with pytest.raises(document_text.DocumentError):
+        document_text.extract_text(_write(tmp_path, data), 10, 10 ** 7)
+
+
+def test_docx_without_document_part(tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as package:
+        package.writestr("word/other.xml", "<x/>")
+    with pytest.raises(document_text.DocumentError):
+        document_text.extract_text(_write(tmp_path, buffer.getvalue()), 10, 10 ** 7)
+
+
+def test_docx_decompressed_size_cap(tmp_path):
+    path = _write(tmp_path, resume_render.render(RESUME, "classic", "docx"))
+    with pytest.raises(document_text.DocumentError, match="too large"):
+        document_text.extract_text(path, 10, 100)
+
+
+def _pdf(*objects: bytes) -> bytes:
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def test_pdf_stream_inflation_cap(tmp_path):
+    stream = zlib.compress(b"BT (x) Tj ET\n" * 100_000)
+    pdf = _pdf(
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R >>",
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    )
+    path = _write(tmp_path, pdf)
+    document_text.pdf_text(path, 10, 10 ** 7)  # reads fine under the default cap
+    with pytest.raises(document_text.DocumentError, match="too large"):
+        document_text.pdf_text(path, 10, 10_000)
+
+
+def test_pdf_page_limit(tmp_path):
+    two_pages = {**RESUME, "experience": RESUME["experience"] * 30}
+    path = _write(tmp_path, resume_render.render(two_pages, "classic", "pdf"))
+    assert "Skills" in document_text.pdf_text(path, 10, 10 ** 7)
+    assert "Skills" not in document_text.pdf_text(path, 1, 10 ** 7)
+
+
+def test_encrypted_pdf_is_rejected(tmp_path):
+    writer = pypdf.PdfWriter()
+    writer.add_blank_page(612, 792)
+    writer.encrypt("secret", algorithm="RC4-128")
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    with pytest.raises(document_text.DocumentError, match="Encrypted"):
+        document_text.extract_text(_write(tmp_path, buffer.getvalue()), 10, 10 ** 7)
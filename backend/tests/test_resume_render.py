@@ -0,0 +1,96 @@
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+import pytest
+from app.services import resume_render
+
+RESUME = {
+    "firstName": "Jane", "lastName": "Doe", "title": "Backend Engineer",
+    "email": "jane@example.com", "phone": "+1 555 123 4567", "location": "Berlin",
+    "summary": "# not a heading, *not* emphasis & <not> markup",
+    "experience": [{
+        "title": "Staff Engineer", "company": "Acme", "dates": "2020 - Present",
+        "bullets": ["One", "Two", "Three", "Four"],
+    }],
+    "education": [{"degree": "BSc", "school": "TU Berlin", "year": "2014"}],
+    "skills": ["Python", "Go"],
+}
+
+# ResumeBuilder's initial state: one blank experience and one blank education entry.
+BLANK_DRAFT = {
+    "firstName": "Jane", "lastName": "", "title": "", "email": "", "phone": "", "location": "", "summary": "",
+    "experience": [{"title": "", "company": "", "location": "", "dates": "", "bullets": [""]}],
+    "education": [{"degree": "", "school": "", "year": ""}],
+    "skills": [],
+}
+
+
+@pytest.mark.parametrize("template", resume_render.TEMPLATES)
+def test_blank_draft_entries_render_nothing(template):
+    parsed = resume_render.blocks(resume_render.render_markdown(BLANK_DRAFT, template))
+    assert parsed == [("title", "Jane")]
+
+
+@pytest.mark.parametrize("template", resume_render.TEMPLATES)
+def test_entry_without_heading_fields_gets_no_empty_heading(template):
+    content = {"experience": [{"bullets": ["Shipped it"]}], "education": [{"year": "2014"}]}
+    markdown = resume_render.render_markdown(content, template)
+    assert not re.search(r"^#+\s*$", markdown, re.M)
+    assert ("bullet", "Shipped it") in resume_render.blocks(markdown)
+
+
+def test_user_text_cannot_inject_markdown_structure():
+    parsed = resume_render.blocks(resume_render.render_markdown(RESUME, "classic"))
+    assert ("paragraph", RESUME["summary"]) in parsed
+    assert [kind for kind, _ in parsed].count("title") == 1
+
+
+def test_compact_template_keeps_three_bullets():
+    parsed = resume_render.blocks(resume_render.render_markdown(RESUME, "compact"))
+    assert [text for kind, text in parsed if kind == "bullet" and text in ("One", "Two", "Three", "Four")] == ["One", "Two", "Three"]
+
+
+def test_odd_content_shapes_are_tolerated():
+    content = {"firstName": None, "experience": "oops", "education": [None, {"school": 3}], "skills": [1, "", None]}
+    parsed = resume_render.blocks(resume_render.render_markdown(content, "classic"))
+    assert ("subheading", "3") in parsed and ("paragraph", "1") in parsed
+
+
+def test_docx_is_a_valid_package_with_escaped_text():
+    data = resume_render.render(RESUME, "classic", "docx")
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        assert {"[Content_Types].xml", "word/document.xml", "word/styles.xml"} <= set(package.namelist())
+        root = ElementTree.fromstring(package.read("word/document.xml"))
+    texts = [el.text for el in root.iter() if el.tag.endswith("}t")]
+    assert RESUME["summary"] in texts
+
+
+def test_pdf_structure_and_cross_reference_offsets():
+    data = resume_render.render(RESUME, "classic", "pdf")
+    assert data.startswith(b"%PDF-") and data.rstrip().endswith(b"%%EOF")
+    startxref = int(re.search(rb"startxref\s+(\d+)", data).group(1))
+    assert data[startxref:startxref + 4] == b"xref"
+    count = int(re.match(rb"xref\s+0 (\d+)", data[startxref:]).group(1))
+    offsets = re.findall(rb"(\d{10}) 00000 n", data[startxref:])
+    assert len(offsets) == count - 1
+    for number, offset in enumerate(offsets, start=1):
+        assert data[int(offset):].startswith(b"%d 0 obj" % number)
+
+
+def test_pdf_refuses_characters_its_fonts_cannot_show():
+    content = {"firstName": "李", "lastName": "Nguyễn", "summary": "Moved 2019 → 2021"}
+    with pytest.raises(resume_render.UnsupportedCharacters) as exc:
+        resume_render.render(content, "classic", "pdf")
+    assert all(char in str(exc.value) for char in "李ễ→")
+    assert "Nguyễn".encode() in resume_render.render(content, "classic", "md")
+
+
+def test_pdf_keeps_cp1252_punctuation():
+    content = {"firstName": "José", "summary": "“Quoted” — €5…"}
+    assert resume_render.render(content, "classic", "pdf").startswith(b"%PDF-")
+
+
+def test_markdown_export_is_utf8():
+    content = {**RESUME, "summary": "Zürich — naïve café"}
+    assert "Zürich — naïve café".encode() in resume_render.render(content, "classic", "md")